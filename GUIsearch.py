@@ -1,108 +1,77 @@
 import os
-import json
 import streamlit as st # type: ignore
-import pandas as pd
-from search_engine.preprocessing import preprocess
+from search_engine.query import parse_query
+from search_engine.snippets import generate_snippet
 from search_engine.vsm import VSMEngine
 from search_engine.bm25 import BM25Engine
+from search_engine.storage import load_or_build_index
+from search_engine.cache import QueryCache
+from search_engine.instrumentation import Trace
+from search_engine.documents import open_documents, is_document_file
 
 # Modifikasi st.session_state agar sinkron dengan search2.py
-if 'raw_docs' not in st.session_state:
-    st.session_state.raw_docs = []
-    st.session_state.doc_names = []
-    st.session_state.doc_ids = [] 
-    st.session_state.doc_lookup = {}  
+if 'documents' not in st.session_state:
+    st.session_state.documents = None
     st.session_state.engine = None
     st.session_state.current_engine_key = None
     st.session_state.current_file = None
 
 # --- Cache untuk performa ---
+# Koleksi dokumen dibuka sekali per file. File JSONL tidak dimuat ke memori; teks dokumen
+# dibaca dari file saat dibutuhkan untuk preview.
 @st.cache_resource
-def load_engine(engine_type, docs, k=1.5, b=0.75):
+def load_documents(file_path):
+    return open_documents(file_path)
+
+# Index korpus dibuka dari disk (atau dibangun jika usang) sekali per file dokumen
+# dan dipakai bersama oleh VSM dan BM25. Jika perlu dibangun ulang, teks dokumen
+# dialirkan langsung dari file ke index builder.
+@st.cache_resource
+def load_index(file_path):
+    return load_or_build_index(file_path)
+
+# Engine dibuat sekali per model dan file. Parameter k dan b BM25 diberikan per kueri,
+# sehingga mengubahnya tidak membuat engine atau index baru.
+@st.cache_resource
+def load_engine(engine_type, file_path):
     if engine_type == "BM25":
-        return BM25Engine(docs, k, b)
+        return BM25Engine(load_index(file_path))
     elif engine_type == "VSM":
-        return VSMEngine(docs)
+        return VSMEngine(load_index(file_path))
     return None
 
+# Cache hasil pencarian dipakai bersama oleh semua sesi. Entri otomatis tidak berlaku
+# jika engine dengan index lain (file dokumen lain) dipakai atau index berubah.
+@st.cache_resource
+def get_query_cache():
+    return QueryCache()
+
 # --- FUngsi untuk fetch file di data ---
 def get_document_files():
     """Mendapatkan daftar file dokumen yang valid"""
-    return [f for f in os.listdir('data') if f.startswith('documents') and f.endswith('.json')]
+    return sorted(f for f in os.listdir('data') if is_document_file(f))
 
-# --- Salinan fungsi memuat dokumen dari search2.py ---
-def load_documents_from_json(file_path):
+# --- Fungsi memuat koleksi dokumen (JSON atau JSONL) ---
+def load_documents_from_file(file_path):
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            docs = json.load(f)
-            
-        raw_texts = [doc["text"] for doc in docs]
-        doc_ids = [doc["doc_id"] for doc in docs]
-        doc_lookup = {doc["doc_id"]: doc["text"] for doc in docs}
+        documents = load_documents(file_path)
         
-        if not raw_texts:
-            st.sidebar.warning("Tidak ada dokumen yang ditemukan dalam file JSON atau format tidak sesuai.")
-            return [], [], [], {}
+        if not len(documents):
+            st.sidebar.warning("Tidak ada dokumen yang ditemukan dalam file atau format tidak sesuai.")
+            return None
             
-        return raw_texts, doc_ids, doc_ids, doc_lookup  
+        return documents
         
     except FileNotFoundError:
-        st.sidebar.error(f"File JSON tidak ditemukan di: {file_path}")
-        return [], [], [], {}
-    except json.JSONDecodeError:
-        st.sidebar.error(f"Gagal membaca file JSON. Pastikan formatnya benar: {file_path}")
-        return [], [], [], {}
+        st.sidebar.error(f"File dokumen tidak ditemukan di: {file_path}")
+        return None
+    except ValueError:
+        # json.JSONDecodeError adalah turunan ValueError.
+        st.sidebar.error(f"Gagal membaca file dokumen. Pastikan formatnya benar: {file_path}")
+        return None
     except Exception as e:
-        st.sidebar.error(f"Terjadi kesalahan saat memuat JSON: {e}")
-        return [], [], [], {}
-
-# Salinan kode dari search.py
-def generate_snippet(query, doc_text, max_length=150):
-    """
-    Membuat cuplikan (snippet) dari teks dokumen yang relevan dengan query.
-    Fungsi ini mencari kemunculan kata kunci dari query di dalam dokumen dan
-    mengambil teks di sekitarnya untuk ditampilkan sebagai ringkasan.
-    """
-
-    # 1. Preprocess query untuk mendapatkan token-token penting dan menyimpannya dalam `set` untuk pencarian cepat.
-    # Jika query kosong setelah diproses, kembalikan saja awal dokumen sebagai snippet.
-    query_tokens = set(preprocess(query))
-    if not query_tokens:
-        return doc_text[:max_length] + "..."
-
-    # 2. Pecah teks dokumen menjadi daftar kata-kata.
-    words = doc_text.split()
-    # Inisialisasi list untuk menyimpan posisi (indeks) di mana kata dari query ditemukan.
-    match_positions = []
-
-    # 3. Cari posisi kata dari query di dalam dokumen.
-    for i, word in enumerate(words):
-        # Setiap kata dari dokumen juga di-preprocess agar formatnya sama dengan token query (lowercase, stemmed).
-        processed_word_tokens = preprocess(word)
-        # Periksa apakah ada irisan (intersection) antara token query dengan token dari kata dokumen saat ini.
-        if query_tokens.intersection(processed_word_tokens):
-            match_positions.append(i)
-
-    # 4. Jika tidak ada kata yang cocok sama sekali, ambil 20 kata pertama sebagai snippet.
-    if not match_positions:
-        return " ".join(words[:20]) + ("..." if len(words) > 20 else "")
-
-    # 5. Jika ada kata yang cocok, ambil cuplikan di sekitar posisi *pertama* yang cocok.
-    # Tentukan titik awal snippet, mundur 10 kata dari posisi kata pertama yang cocok.
-    start = max(0, match_positions[0] - 10)
-    # Tentukan titik akhir snippet, maju 25 kata dari titik awal untuk memberikan konteks.
-    end = start + 25
-    snippet = " ".join(words[start:end])
-
-    # 6. Tambahkan elipsis (...) untuk menandakan bahwa snippet adalah potongan teks.
-    # Tambahkan di awal jika snippet tidak dimulai dari kata pertama dokumen.
-    if start > 0:
-        snippet = "... " + snippet
-    # Tambahkan di akhir jika snippet tidak berakhir di kata terakhir dokumen.
-    if end < len(words):
-        snippet = snippet + " ..."
-        
-    return snippet
+        st.sidebar.error(f"Terjadi kesalahan saat memuat dokumen: {e}")
+        return None
 
 # --- UI Streamlit ---
 st.set_page_config(layout="wide")
@@ -149,42 +118,49 @@ selected_file = st.sidebar.selectbox(
 # Proses dokumen pilihan pengguna
 if st.sidebar.button("Muat Dokumen"):
     file_path = os.path.join('data', selected_file)
-    with st.spinner("Memuat dan memproses dokumen dari JSON..."):
-        st.session_state.raw_docs, st.session_state.doc_ids, st.session_state.doc_names, st.session_state.doc_lookup = load_documents_from_json(file_path)
-        if st.session_state.raw_docs:
-            st.sidebar.success(f"{len(st.session_state.raw_docs)} dokumen berhasil dimuat!")
+    with st.spinner("Memuat dan memproses dokumen..."):
+        st.session_state.documents = load_documents_from_file(file_path)
+        if st.session_state.documents:
+            st.sidebar.success(f"{len(st.session_state.documents)} dokumen berhasil dimuat!")
             st.session_state.engine = None
             st.session_state.current_engine_key = None
             st.session_state.current_file = selected_file
 
-if st.session_state.raw_docs:
+if st.session_state.documents:
     # Log banyak dokumen dan pilihan dokumen
     st.sidebar.header("Pengaturan Model Pencarian")
-    st.sidebar.write(f"Jumlah dokumen: {len(st.session_state.raw_docs)}")
+    st.sidebar.write(f"Jumlah dokumen: {len(st.session_state.documents)}")
     st.sidebar.write(f"File aktif: {st.session_state.current_file}")
 
     # Buat pilihan model
     model_choice = st.sidebar.selectbox("Pilih Model:", ["VSM", "BM25"])
-    k_param = 1.5
-    b_param = 0.75
-
-    engine_key = f"{model_choice}_{k_param}_{b_param}" if model_choice == "BM25" else model_choice
+    # Parameter BM25 dikirim bersama setiap kueri (tanpa membangun ulang engine/index).
+    search_options = {}
+    if model_choice == "BM25":
+        k_param = st.sidebar.slider("Parameter k (BM25):", min_value=0.0, max_value=3.0, value=1.5, step=0.1)
+        b_param = st.sidebar.slider("Parameter b (BM25):", min_value=0.0, max_value=1.0, value=0.75, step=0.05)
+        search_options = {"k": k_param, "b": b_param}
+
+    engine_key = model_choice
     
     if st.session_state.current_engine_key != engine_key or st.session_state.engine is None:
         with st.spinner(f"Menginisialisasi engine {model_choice}..."):
-            st.session_state.engine = load_engine(model_choice, st.session_state.raw_docs, k_param, b_param)
+            file_path = os.path.join('data', st.session_state.current_file)
+            st.session_state.engine = load_engine(model_choice, file_path)
             st.session_state.current_engine_key = engine_key
             if st.session_state.engine:
                 st.sidebar.success(f"Engine {model_choice} siap!")
             else:
                 st.sidebar.error(f"Gagal menginisialisasi engine {model_choice}.")
 
-    top_k_max_val = len(st.session_state.raw_docs)
+    top_k_max_val = len(st.session_state.documents)
     top_k_default_val = min(5, top_k_max_val) if top_k_max_val > 0 else 1
     top_k = st.sidebar.number_input("Jumlah hasil teratas (Top-K):", 
                                   min_value=1, 
                                   max_value=top_k_max_val if top_k_max_val > 0 else 1, 
                                   value=top_k_default_val)
+    # Instrumentasi: waktu per tahap dan penghitung pencarian terakhir ditampilkan di sidebar.
+    tracing = st.sidebar.checkbox("Instrumentasi", value=False)
 
     st.subheader("Masukkan Kueri Pencarian :")
     query = st.text_input(label="Query", label_visibility="collapsed")
@@ -196,19 +172,22 @@ if st.session_state.raw_docs:
         elif not st.session_state.engine:
             st.error("Engine belum siap. Silakan muat dokumen terlebih dahulu.")
         else:
+            trace = Trace() if tracing else None
             with st.spinner("Mencari..."):
-                ranked_ids, scores = st.session_state.engine.search(query, top_k=top_k)
+                result = get_query_cache().search(st.session_state.engine, query, top_k=top_k, trace=trace,
+                                                  **search_options)
                 
             st.subheader(f"Hasil Pencarian untuk: '{query}'")
-            if not ranked_ids or all(scores[i] == 0 for i in ranked_ids):
+            if not result.hits or all(score == 0 for _, score in result.hits):
                 st.write("Tidak ada dokumen yang relevan ditemukan.")
             else:
                 results_data = []
-                for rank, doc_id in enumerate(ranked_ids):
-                    doc_name = st.session_state.doc_ids[doc_id]
-                    score_value = scores[doc_id]
-                    full_text = st.session_state.doc_lookup[doc_name]
-                    preview_text = generate_snippet(query, full_text)
+                query_tokens = parse_query(query).tokens
+                for rank, (doc_id, score_value) in enumerate(result.hits):
+                    doc_name = st.session_state.documents.doc_ids[doc_id]
+                    full_text = st.session_state.documents.text(doc_id)
+                    preview_text = generate_snippet(st.session_state.engine.index, doc_id, full_text, query_tokens,
+                                                   trace=trace)
                     results_data.append({
                         "Peringkat": rank + 1,
                         "Doc_ID": doc_name,
@@ -217,6 +196,8 @@ if st.session_state.raw_docs:
                     })
                 
                 if results_data:
+                    # Pandas diimpor hanya saat tabel hasil ditampilkan.
+                    import pandas as pd
                     df_to_display = pd.DataFrame(results_data)
                     st.dataframe(
                         df_to_display,
@@ -229,5 +210,19 @@ if st.session_state.raw_docs:
                         hide_index=True,
                         use_container_width=True
                     )
+
+            if trace is not None:
+                st.sidebar.subheader("Instrumentasi")
+                st.sidebar.json(trace.report())
+                with open("result_log.txt", "a", encoding="utf-8") as f:
+                    f.write(f"Query: {query} (Engine: {model_choice}, GUI)\nTrace: {trace.format()}\n")
+                    f.write("-" * 20 + "\n\n")
+
+    # Statistik cache hasil pencarian
+    cache_info = get_query_cache().info()
+    st.sidebar.caption(
+        f"Cache query: {cache_info['hits']} hit / {cache_info['misses']} miss "
+        f"(hit rate {cache_info['hit_rate']:.0%}, {cache_info['currsize']}/{cache_info['maxsize']} entri)"
+    )
 else:
     st.info("Untuk memulai pencarian, silahkan pilih dan muat dokumen di Side Bar.")
\ No newline at end of file
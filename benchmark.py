@@ -0,0 +1,342 @@
+# --- Penjelasan Umum ---
+# Skrip ini adalah benchmark kecepatan (bukan efektivitas) untuk mini search engine dan
+# berjalan tanpa input interaktif. Berbeda dengan main.py yang mengukur Precision/Recall/F1,
+# skrip ini mengukur:
+# 1. Waktu membangun index (CorpusIndex) dan puncak pemakaian memori selama pembangunan, serta
+#    ukuran postings per posting (byte) untuk postings biasa dan terkompresi.
+# 2. Waktu inisialisasi setiap engine di atas index yang sama.
+# 3. Latensi per query (p50/p95/p99 dan rata-rata) serta throughput (query per detik),
+#    baik query satu per satu (`search`) maupun sekaligus (`search_many`).
+# 4. Waktu impor paket di proses Python baru (cold start CLI), dibandingkan dengan anggaran
+#    waktu impor, serta pemeriksaan bahwa pustaka berat (NLTK, matplotlib, pandas) tidak ikut
+#    terimpor saat start-up.
+# Pengukuran dilakukan untuk setiap engine pada query set Cranfield (Library) dan documentsNew.
+# Hasil ditulis sebagai JSON. Mode perbandingan membandingkan hasil dengan baseline yang
+# disimpan sebelumnya dan menandai regresi yang melebihi ambang batas.
+#
+# Penggunaan:
+#   python benchmark.py --output baseline.json                 (simpan baseline)
+#   python benchmark.py --output after.json --compare baseline.json
+#   python benchmark.py --compare baseline.json after.json     (bandingkan dua file tanpa menjalankan ulang)
+#   python benchmark.py --import-only                           (hanya pemeriksaan waktu impor)
+
+# --- Impor Pustaka ---
+import os
+import sys
+import json
+import time
+import math
+import argparse
+import platform
+import subprocess
+import tracemalloc
+from search_engine.index import CorpusIndex
+from search_engine.vsm import VSMEngine
+from search_engine.bm25 import BM25Engine
+from search_engine.compression import postings_nbytes
+
+# --- Konfigurasi ---
+# Dataset: nama -> (file dokumen, file ground truth yang berisi query set).
+DATASETS = {
+    "Library": ("data/documentsLibrary.json", "data/ground_truthLibrary.json"),
+    "New": ("data/documentsNew.json", "data/ground_truthNew.json"),
+}
+# Varian engine yang bisa diukur: nama -> (fungsi pembuat engine dari index, opsi search).
+ENGINES = {
+    "vsm": (lambda index: VSMEngine(index), {}),
+    "bm25": (lambda index: BM25Engine(index), {}),
+    "vsm-numpy": (lambda index: VSMEngine(index, backend="numpy"), {}),
+    "bm25-numpy": (lambda index: BM25Engine(index, backend="numpy"), {}),
+    "bm25-impact": (lambda index: BM25Engine(index, impacts=True), {}),
+    "bm25-maxscore": (lambda index: BM25Engine(index), {"pruning": True}),
+}
+# Akhiran nama engine untuk menjalankan varian yang sama di atas index dengan postings terkompresi,
+# misalnya "bm25-compressed" atau "bm25-maxscore-compressed".
+COMPRESSED_SUFFIX = "-compressed"
+DEFAULT_ENGINES = ["vsm", "bm25", "bm25-compressed"]
+# Persentil latensi yang dilaporkan.
+PERCENTILES = (50, 95, 99)
+# Ambang regresi default: metrik dianggap regresi jika memburuk lebih dari 10%.
+DEFAULT_THRESHOLD = 0.10
+# Metrik yang lebih besar lebih baik (throughput); metrik lain (waktu, memori) lebih kecil lebih baik.
+HIGHER_IS_BETTER = ("qps",)
+# Selisih absolut minimum agar sebuah perubahan bisa dianggap regresi (per akhiran nama metrik),
+# supaya fluktuasi kecil pada metrik yang sangat kecil (misalnya latensi 0.04 ms) tidak ditandai.
+NOISE_FLOOR = {"_ms": 0.05, "seconds": 0.005, "_mb": 0.5}
+# Modul yang diimpor skrip CLI (main.py, search.py, server.py) saat start-up.
+IMPORT_MODULES = ("search_engine.vsm", "search_engine.bm25", "search_engine.storage", "search_engine.cache",
+                  "search_engine.snippets", "search_engine.evaluation", "search_engine.service")
+# Pustaka berat yang hanya boleh diimpor secara lazy pada jalur yang membutuhkannya.
+LAZY_MODULES = ("nltk", "matplotlib", "pandas")
+# Anggaran waktu impor paket (milidetik) dan jumlah proses yang diukur (diambil yang tercepat).
+IMPORT_BUDGET_MS = 300
+IMPORT_RUNS = 5
+
+
+def percentile(sorted_values, p):
+    # Persentil dengan metode nearest-rank dari daftar yang sudah terurut.
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(p / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def measure_build(texts, memory=True):
+    """
+    Mengukur waktu pembangunan CorpusIndex dan (opsional) puncak memori selama pembangunan.
+    Memori diukur pada pembangunan terpisah karena tracemalloc memperlambat eksekusi.
+    Index dengan postings terkompresi juga dibangun untuk membandingkan ukuran postings.
+
+    Returns:
+        tuple: (CorpusIndex, CorpusIndex terkompresi, dict metrik build).
+    """
+    started = time.perf_counter()
+    index = CorpusIndex(texts)
+    metrics = {"seconds": time.perf_counter() - started, "documents": index.N,
+               "terms": len(index.doc_freqs), "postings": sum(len(p) for p in index.postings.values())}
+    started = time.perf_counter()
+    compressed = CorpusIndex(texts, compress=True)
+    metrics["compressed_seconds"] = time.perf_counter() - started
+    # Byte per posting: memori postings (termasuk objek list/tuple/int atau buffer terkompresi)
+    # dan, untuk postings terkompresi, isi buffer data + skip pointer saja.
+    n_postings = max(1, metrics["postings"])
+    metrics["bytes_per_posting"] = postings_nbytes(index.postings) / n_postings
+    metrics["compressed_bytes_per_posting"] = postings_nbytes(compressed.postings) / n_postings
+    metrics["compressed_payload_bytes_per_posting"] = sum(p.nbytes for p in compressed.postings.values()) / n_postings
+    # Forward index (pasangan term_id/tf dan posisi token) per dokumen.
+    metrics["forward_bytes_per_doc"] = index.term_freqs.nbytes / max(1, index.N)
+    if memory:
+        tracemalloc.start()
+        CorpusIndex(texts)
+        metrics["peak_mb"] = tracemalloc.get_traced_memory()[1] / 1e6
+        tracemalloc.stop()
+    return index, compressed, metrics
+
+
+def measure_import(runs=IMPORT_RUNS):
+    """
+    Mengukur waktu impor paket di proses Python baru, seperti saat skrip CLI dijalankan.
+    Setiap proses hanya mengukur impor `IMPORT_MODULES` (tanpa waktu start-up interpreter).
+
+    Args:
+        runs (int): Jumlah proses yang diukur; nilai tercepat dilaporkan.
+
+    Returns:
+        dict: 'import_ms' dan 'eager_modules' (pustaka `LAZY_MODULES` yang ikut terimpor).
+    """
+    code = "\n".join([
+        "import sys, json, time",
+        "started = time.perf_counter()",
+        *(f"import {module}" for module in IMPORT_MODULES),
+        "elapsed = time.perf_counter() - started",
+        f"print(json.dumps([elapsed, [m for m in {LAZY_MODULES!r} if m in sys.modules]]))",
+    ])
+    root = os.path.dirname(os.path.abspath(__file__))
+    timings, eager = [], []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True,
+                                text=True, check=True).stdout
+        elapsed, eager = json.loads(output.strip().splitlines()[-1])
+        timings.append(elapsed)
+    return {"import_ms": min(timings) * 1000, "eager_modules": eager}
+
+
+def check_import_budget(startup, budget_ms=IMPORT_BUDGET_MS):
+    """
+    Menampilkan hasil `measure_import` dan memeriksanya terhadap anggaran waktu impor.
+
+    Returns:
+        bool: True jika waktu impor melebihi anggaran atau ada pustaka berat yang ikut terimpor.
+    """
+    over = startup["import_ms"] > budget_ms
+    print(f"[start-up] impor paket: {startup['import_ms']:.1f} ms (anggaran {budget_ms:.0f} ms)"
+          + (" MELEBIHI ANGGARAN" if over else ""), file=sys.stderr)
+    if startup["eager_modules"]:
+        print(f"[start-up] pustaka berat ikut terimpor: {', '.join(startup['eager_modules'])}", file=sys.stderr)
+    return over or bool(startup["eager_modules"])
+
+
+def measure_queries(engine, queries, top_k, repeat, options):
+    """
+    Mengukur latensi per query dan throughput sebuah engine.
+
+    Args:
+        engine (object): Engine yang diukur.
+        queries (list): Query set.
+        top_k (int): Jumlah dokumen teratas per query.
+        repeat (int): Jumlah putaran pengukuran atas seluruh query set.
+        options (dict): Opsi tambahan untuk `engine.search`.
+
+    Returns:
+        dict: Latensi (milidetik) per persentil, rata-rata, throughput `search`, dan throughput `search_many`.
+    """
+    # Pemanasan: mengisi cache stemming dan struktur lazy sebelum diukur.
+    for query in queries:
+        engine.search(query, top_k=top_k, **options)
+
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for query in queries:
+            t0 = time.perf_counter()
+            engine.search(query, top_k=top_k, **options)
+            latencies.append(time.perf_counter() - t0)
+    total = time.perf_counter() - started
+    latencies.sort()
+
+    metrics = {f"p{p}_ms": percentile(latencies, p) * 1000 for p in PERCENTILES}
+    metrics["mean_ms"] = sum(latencies) / len(latencies) * 1000 if latencies else 0.0
+    metrics["qps"] = len(latencies) / total if total else 0.0
+    if not options:
+        started = time.perf_counter()
+        for _ in range(repeat):
+            engine.search_many(queries, top_k=top_k)
+        total = time.perf_counter() - started
+        metrics["batch_qps"] = repeat * len(queries) / total if total else 0.0
+    return metrics
+
+
+def run_benchmark(dataset_names, engine_names, top_k, repeat, memory):
+    # Menjalankan seluruh pengukuran dan mengembalikan hasil dalam bentuk dict siap-JSON.
+    results = {"startup": measure_import()}
+    for name in dataset_names:
+        doc_path, gt_path = DATASETS[name]
+        with open(doc_path, encoding="utf-8") as f:
+            texts = [doc["text"] for doc in json.load(f)]
+        with open(gt_path, encoding="utf-8") as f:
+            queries = list(json.load(f))
+
+        index, compressed, build = measure_build(texts, memory)
+        print(f"[{name}] build: {build['seconds']:.3f} s"
+              + (f", peak {build['peak_mb']:.1f} MB" if "peak_mb" in build else "")
+              + f", postings {build['bytes_per_posting']:.1f} B/posting"
+              + f" (terkompresi {build['compressed_bytes_per_posting']:.1f},"
+              + f" isi buffer {build['compressed_payload_bytes_per_posting']:.1f})"
+              + f", forward index {build['forward_bytes_per_doc']:.0f} B/dokumen", file=sys.stderr)
+        engines = {}
+        for engine_name in engine_names:
+            # Varian "-compressed" memakai engine yang sama di atas index terkompresi.
+            base_name = engine_name.removesuffix(COMPRESSED_SUFFIX)
+            make, options = ENGINES[base_name]
+            started = time.perf_counter()
+            engine = make(compressed if base_name != engine_name else index)
+            init_seconds = time.perf_counter() - started
+            metrics = measure_queries(engine, queries, top_k, repeat, options)
+            metrics["init_seconds"] = init_seconds
+            engines[engine_name] = metrics
+            print(f"[{name}] {engine_name}: p50 {metrics['p50_ms']:.3f} ms, p95 {metrics['p95_ms']:.3f} ms, "
+                  f"p99 {metrics['p99_ms']:.3f} ms, {metrics['qps']:.0f} q/s", file=sys.stderr)
+        results[name] = {"queries": len(queries), "build": build, "engines": engines}
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "top_k": top_k,
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def flatten(results, prefix=""):
+    # Meratakan dict hasil bertingkat menjadi {"Library.engines.bm25.p95_ms": nilai}.
+    flat = {}
+    for key, value in results.items():
+        path = f"{prefix}.{key}" if prefix else key
+        if isinstance(value, dict):
+            flat.update(flatten(value, path))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[path] = value
+    return flat
+
+
+def compare(baseline, current, threshold=DEFAULT_THRESHOLD):
+    """
+    Membandingkan hasil benchmark dengan baseline dan menandai regresi.
+
+    Args:
+        baseline (dict): Hasil benchmark baseline.
+        current (dict): Hasil benchmark yang dibandingkan.
+        threshold (float): Perubahan relatif (misalnya 0.10 = 10%) yang dianggap regresi.
+
+    Returns:
+        list: Daftar (metrik, nilai baseline, nilai sekarang, perubahan relatif, regresi?).
+    """
+    base, cur = flatten(baseline["results"]), flatten(current["results"])
+    rows = []
+    for path in sorted(base.keys() & cur.keys()):
+        # Jumlah dokumen/query/term adalah deskripsi data, bukan metrik kinerja.
+        metric = path.rsplit(".", 1)[-1]
+        if metric in ("queries", "documents", "terms", "postings"):
+            continue
+        old, new = base[path], cur[path]
+        change = (new - old) / old if old else 0.0
+        worse = -change if metric.endswith(HIGHER_IS_BETTER) else change
+        floor = next((value for suffix, value in NOISE_FLOOR.items() if metric.endswith(suffix)), 0)
+        rows.append((path, old, new, change, worse > threshold and abs(new - old) > floor))
+    return rows
+
+
+def print_comparison(rows, threshold):
+    # Menampilkan tabel perbandingan; regresi ditandai dengan "REGRESI".
+    print(f"{'Metrik':<44} | {'Baseline':>12} | {'Sekarang':>12} | {'Perubahan':>9} |")
+    for path, old, new, change, regressed in rows:
+        flag = "REGRESI" if regressed else ""
+        print(f"{path:<44} | {old:>12.4f} | {new:>12.4f} | {change:>+8.1%} | {flag}")
+    regressions = sum(1 for row in rows if row[4])
+    print(f"\n{regressions} regresi (ambang {threshold:.0%}) dari {len(rows)} metrik.")
+    return regressions
+
+
+# --- Program Utama ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark kecepatan indexing dan query.")
+    parser.add_argument("--output", help="File JSON untuk menyimpan hasil benchmark.")
+    parser.add_argument("--compare", nargs="+", metavar="FILE",
+                        help="Baseline JSON (dan opsional file hasil kedua untuk dibandingkan tanpa menjalankan ulang).")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Ambang regresi relatif (default 0.10 = 10%%).")
+    parser.add_argument("--datasets", default=",".join(DATASETS), help="Dataset, dipisah koma.")
+    parser.add_argument("--engines", default=",".join(DEFAULT_ENGINES),
+                        help=f"Engine, dipisah koma. Pilihan: {', '.join(ENGINES)} "
+                             f"(tambahkan '{COMPRESSED_SUFFIX}' untuk index terkompresi).")
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=3, help="Jumlah putaran atas seluruh query set.")
+    parser.add_argument("--no-memory", action="store_true", help="Lewati pengukuran puncak memori.")
+    parser.add_argument("--import-budget", type=float, default=IMPORT_BUDGET_MS,
+                        help=f"Anggaran waktu impor paket dalam milidetik (default {IMPORT_BUDGET_MS}).")
+    parser.add_argument("--import-only", action="store_true", help="Hanya jalankan pemeriksaan waktu impor.")
+    args = parser.parse_args()
+
+    if args.import_only:
+        sys.exit(1 if check_import_budget(measure_import(), args.import_budget) else 0)
+
+    over_budget = False
+    if args.compare and len(args.compare) == 2:
+        # Mode perbandingan dua file yang sudah ada.
+        with open(args.compare[0]) as f:
+            baseline = json.load(f)
+        with open(args.compare[1]) as f:
+            current = json.load(f)
+    else:
+        current = run_benchmark(args.datasets.split(","), args.engines.split(","),
+                                args.top_k, args.repeat, not args.no_memory)
+        over_budget = check_import_budget(current["results"]["startup"], args.import_budget)
+        if args.output:
+            with open(args.output, "w") as f:
+                json.dump(current, f, indent=2)
+            print(f"> Hasil disimpan ke {args.output}", file=sys.stderr)
+        else:
+            print(json.dumps(current, indent=2))
+        baseline = None
+        if args.compare:
+            with open(args.compare[0]) as f:
+                baseline = json.load(f)
+
+    regressions = 0
+    if baseline is not None:
+        regressions = print_comparison(compare(baseline, current, args.threshold), args.threshold)
+    # Kode keluar 1 jika ada regresi atau waktu impor melebihi anggaran, agar bisa dipakai di skrip/CI.
+    sys.exit(1 if regressions or over_budget else 0)
@@ -1,13 +1,14 @@
 # --- Penjelasan Umum ---
 # Skrip ini bertanggung jawab untuk mengunduh dan memproses dataset standar dalam Information Retrieval,
 # yaitu "Cranfield". Pustaka `ir_datasets` digunakan untuk mempermudah akses ke dataset ini.
-# Hasilnya adalah dua file JSON: satu berisi koleksi dokumen dan satu lagi berisi
+# Hasilnya adalah koleksi dokumen (dalam format JSON dan JSONL) serta satu file JSON berisi
 # query beserta daftar dokumen yang relevan (ground truth), yang akan digunakan untuk
 # evaluasi mesin pencari.
 
 # --- Impor Pustaka ---
 import json  # Pustaka untuk bekerja dengan data format JSON (menyimpan hasil ke file).
 import ir_datasets  # Pustaka khusus untuk mengakses dataset standar dalam riset Information Retrieval.
+from search_engine.documents import write_jsonl  # Menulis dokumen ke file JSONL secara streaming.
 
 # --- Memuat Dataset ---
 # Memuat dataset "cranfield" menggunakan pustaka ir_datasets.
@@ -18,6 +19,16 @@ dataset = ir_datasets.load("cranfield")
 # Bagian ini bertujuan untuk mengambil semua dokumen dari dataset Cranfield
 # dan menyimpannya dalam format yang terstruktur.
 
+# Format JSONL: satu dokumen JSON per baris. Dokumen ditulis langsung dari iterator
+# dataset satu per satu, tanpa menampung seluruh koleksi di memori. File ini bisa
+# dibaca secara streaming oleh index builder (lihat search_engine/documents.py).
+write_jsonl(
+    ({"doc_id": doc.doc_id, "text": doc.text} for doc in dataset.docs_iter()),
+    "data/documentsLibrary.jsonl",
+)
+
+# Format JSON (satu list berisi semua dokumen) tetap dibuat agar kompatibel dengan versi lama.
+
 # Menggunakan list comprehension untuk membuat daftar (list) dari semua dokumen.
 # Setiap elemen dalam daftar adalah sebuah dictionary yang berisi 'doc_id' dan 'text'.
 documents = [
@@ -0,0 +1,76 @@
+# --- Penjelasan Umum ---
+# Skrip ini mengukur deviasi peringkat yang muncul akibat kuantisasi index impact BM25.
+# Index impact menyimpan kontribusi BM25 final per posting; kontribusi tersebut bisa
+# dikuantisasi ke 8 atau 16 bit untuk menghemat memori. Skrip ini membandingkan hasil
+# setiap lebar bit dengan BM25 tanpa kuantisasi pada ground truth Cranfield:
+# 1. Persentase query dengan top-k yang identik dan rata-rata irisan top-k.
+# 2. Selisih Precision, Recall, dan F1-score terhadap ground truth.
+# 3. Galat skor relatif maksimum dan ukuran buffer postings.
+#
+# Penggunaan: python impact_report.py [documents.json ground_truth.json] [top_k]
+
+# --- Impor Pustaka ---
+import sys
+import json
+from search_engine.bm25 import BM25Engine
+from search_engine.index import CorpusIndex
+from search_engine.evaluation import precision_recall_f1
+from search_engine.preprocessing import preprocess
+
+# --- Argumen ---
+args = sys.argv[1:]
+top_k = int(args.pop()) if len(args) in (1, 3) else 10
+doc_path, gt_path = args if args else ("data/documentsLibrary.json", "data/ground_truthLibrary.json")
+
+# --- Load Data ---
+with open(doc_path) as f:
+    docs = json.load(f)
+with open(gt_path) as f:
+    ground_truth = json.load(f)
+doc_ids = [doc["doc_id"] for doc in docs]
+corpus_index = CorpusIndex([doc["text"] for doc in docs])
+
+
+def run_queries(engine):
+    # Menjalankan seluruh query ground truth dan mengembalikan hits top-k per query.
+    return [engine.search(query, top_k=top_k).hits for query in ground_truth]
+
+
+def average_metrics(runs):
+    # Rata-rata Precision, Recall, dan F1-score terhadap ground truth.
+    totals = [0.0, 0.0, 0.0]
+    for hits, relevant in zip(runs, ground_truth.values()):
+        metrics = precision_recall_f1([doc_ids[i] for i, _ in hits], relevant)
+        totals = [t + m for t, m in zip(totals, metrics)]
+    return [t / len(runs) for t in totals]
+
+
+# --- Referensi: BM25 impact tanpa kuantisasi (identik dengan BM25 biasa) ---
+exact_engine = BM25Engine(corpus_index, impacts=True)
+exact_runs = run_queries(exact_engine)
+exact_metrics = average_metrics(exact_runs)
+
+print(f"Deviasi peringkat BM25 impact terkuantisasi ({len(ground_truth)} query, top-{top_k})\n")
+print(f"{'Bit':>8} | {'Byte':>10} | {'Top-k identik':>13} | {'Irisan top-k':>12} | {'Galat skor':>10} | {'dP':>7} | {'dR':>7} | {'dF1':>7}")
+print(f"{'float64':>8} | {exact_engine.impact_index.nbytes():>10} | {100.0:>12.1f}% | {1.0:>12.3f} | {0.0:>10.2e} | "
+      f"{0.0:>7.4f} | {0.0:>7.4f} | {0.0:>7.4f}")
+
+for bits in (16, 8):
+    engine = BM25Engine(corpus_index, impacts=True, impact_bits=bits)
+    runs = run_queries(engine)
+    identical = sum(1 for a, b in zip(exact_runs, runs) if [i for i, _ in a] == [i for i, _ in b])
+    overlap = sum(len({i for i, _ in a} & {i for i, _ in b}) / max(1, len(a)) for a, b in zip(exact_runs, runs))
+    # Galat skor relatif: skor terkuantisasi dibandingkan skor eksak untuk dokumen yang sama.
+    max_error = 0.0
+    for query, hits in zip(ground_truth, runs):
+        exact_scores = exact_engine.accumulate(preprocess(query))
+        for doc_idx, score in hits:
+            reference = exact_scores.get(doc_idx, 0)
+            if reference:
+                max_error = max(max_error, abs(score - reference) / reference)
+    metrics = average_metrics(runs)
+    deltas = [m - e for m, e in zip(metrics, exact_metrics)]
+    print(f"{bits:>8} | {engine.impact_index.nbytes():>10} | {100 * identical / len(runs):>12.1f}% | "
+          f"{overlap / len(runs):>12.3f} | {max_error:>10.2e} | {deltas[0]:>+7.4f} | {deltas[1]:>+7.4f} | {deltas[2]:>+7.4f}")
+
+print(f"\nReferensi float64 → Precision: {exact_metrics[0]:.4f}, Recall: {exact_metrics[1]:.4f}, F1-score: {exact_metrics[2]:.4f}")
@@ -10,15 +10,19 @@
 #    c. Menghitung metrik evaluasi: Precision, Recall, dan F1-score.
 # 4. Menghitung dan menampilkan rata-rata dari semua metrik untuk memberikan kesimpulan
 #    model mana yang berkinerja lebih baik secara keseluruhan pada dataset ini.
-# 5. Secara opsional, menampilkan visualisasi perbandingan dalam bentuk diagram batang.
+# 5. Menampilkan laporan efektivitas lengkap (P@k, R@k, nDCG@k untuk beberapa cutoff, MAP,
+#    dan MRR) dari peringkat yang sama, serta menyimpan peringkatnya sebagai run file TREC.
+# 6. Secara opsional, menampilkan visualisasi perbandingan dalam bentuk diagram batang.
 
 # --- Impor Pustaka ---
 import os
 import json  # Untuk memuat data dari file JSON.
 from search_engine.vsm import VSMEngine  # Mengimpor kelas mesin pencari VSM.
 from search_engine.bm25 import BM25Engine  # Mengimpor kelas mesin pencari BM25.
+from search_engine.storage import load_or_build_index  # Membuka index dari disk (atau membangunnya jika usang).
+from search_engine.documents import open_documents  # Membaca koleksi dokumen (JSON atau JSONL).
 from search_engine.evaluation import precision_recall_f1  # Mengimpor fungsi untuk menghitung metrik evaluasi.
-import matplotlib.pyplot as plt  # Pustaka untuk membuat plot/grafik visualisasi, bersifat opsional.
+from search_engine.evaluation import evaluate_run, write_trec_run, DEFAULT_CUTOFFS  # Evaluasi multi-cutoff dan run file TREC.
 
 def select_file_pair():
     """
@@ -50,27 +54,28 @@ def select_file_pair():
 doc_path, gt_path = select_file_pair()
 
 # --- LOAD DATA ---
-with open(doc_path) as f:
-    docs = json.load(f)
+# Jika tersedia versi JSONL dari file dokumen (hasil extract_cranfield.py), versi itu yang
+# dipakai: dokumen dibaca secara streaming tanpa memuat seluruh koleksi ke memori.
+if os.path.exists(doc_path + "l"):
+    doc_path = doc_path + "l"
+documents = open_documents(doc_path)
 
 with open(gt_path) as f:
     ground_truth = json.load(f)
 
 # --- Persiapan Data ---
-# Mengekstrak hanya teks mentah dari setiap objek dokumen ke dalam list `raw_texts`.
-# List ini akan menjadi input untuk mesin pencari.
-raw_texts = [doc["text"] for doc in docs]
-
-# Mengekstrak ID dokumen ke dalam list `doc_ids`. Urutannya sama dengan `raw_texts`.
+# ID dokumen dalam urutan yang sama dengan indeks dokumen di index.
 # Ini penting untuk mengubah hasil pencarian (yang berupa indeks) kembali menjadi ID dokumen.
-doc_ids = [doc["doc_id"] for doc in docs]
+doc_ids = documents.doc_ids
 
 # --- Inisialisasi Mesin Pencari ---
-# Membuat instance dari VSMEngine. Proses ini akan mencakup preprocessing dan indexing seluruh dokumen.
-vsm_engine = VSMEngine(raw_texts)
+# Index korpus dibuka dari disk (mmap). Preprocessing dan indexing seluruh dokumen hanya
+# dilakukan jika index belum ada atau file dokumen/analyzer sudah berubah.
+corpus_index = load_or_build_index(doc_path, documents.iter_texts())
 
-# Membuat instance dari BM25Engine. Proses ini juga mencakup preprocessing dan indexing.
-bm25_engine = BM25Engine(raw_texts)
+# Membuat instance dari VSMEngine dan BM25Engine di atas index yang sama.
+vsm_engine = VSMEngine(corpus_index)
+bm25_engine = BM25Engine(corpus_index)
 
 print("Evaluasi Mini Search Engine dengan VSM dan BM25\n")
 
@@ -80,20 +85,33 @@ print("Evaluasi Mini Search Engine dengan VSM dan BM25\n")
 vsm_metrics = {'precision': [], 'recall': [], 'f1': []}
 bm25_metrics = {'precision': [], 'recall': [], 'f1': []}
 
+# --- Pencarian Batch ---
+# Seluruh query dijalankan sekaligus dengan `search_many`. Hasilnya identik dengan memanggil
+# `search` satu per satu, tetapi postings setiap term unik dibaca sekali untuk semua query
+# yang memuatnya (BM25 juga menghitung kontribusi setiap term sekali untuk seluruh batch).
+# Setiap query dicari sekali sedalam EVAL_DEPTH; semua cutoff (termasuk top 5 untuk
+# Precision/Recall/F1 di bawah) dihitung dari peringkat yang sama tanpa pencarian ulang.
+TOP_K = 5
+EVAL_DEPTH = max(DEFAULT_CUTOFFS)
+queries = list(ground_truth)
+vsm_results = vsm_engine.search_many(queries, top_k=EVAL_DEPTH)
+bm25_results = bm25_engine.search_many(queries, top_k=EVAL_DEPTH)
+
 # --- Loop Evaluasi Utama ---
 # Iterasi melalui setiap pasangan (query, daftar_dokumen_relevan) dalam ground_truth.
-for query, relevant_docs in ground_truth.items():
-    # --- Pencarian dengan VSM ---
-    # Menjalankan pencarian. `vsm_engine.search` mengembalikan indeks dokumen yang diperingkat.
+for (query, relevant_docs), vsm_result, bm25_result in zip(ground_truth.items(), vsm_results, bm25_results):
+    # --- Hasil VSM ---
+    # Setiap hasil berisi indeks dokumen yang diperingkat.
     # Skor mentah (variabel kedua, `_`) tidak digunakan dalam evaluasi ini.
-    vsm_indices, _ = vsm_engine.search(query)
+    vsm_indices, _ = vsm_result
     # Mengubah hasil indeks menjadi ID dokumen yang sebenarnya menggunakan `doc_ids`.
-    vsm_doc_ids = [doc_ids[i] for i in vsm_indices]
+    # Hanya TOP_K teratas yang dinilai dengan Precision/Recall/F1.
+    vsm_doc_ids = [doc_ids[i] for i in vsm_indices[:TOP_K]]
 
-    # --- Pencarian dengan BM25 ---
+    # --- Hasil BM25 ---
     # Proses yang sama diulang untuk mesin pencari BM25.
-    bm25_indices, _ = bm25_engine.search(query)
-    bm25_doc_ids = [doc_ids[i] for i in bm25_indices]
+    bm25_indices, _ = bm25_result
+    bm25_doc_ids = [doc_ids[i] for i in bm25_indices[:TOP_K]]
 
     # --- Perhitungan Metrik ---
     # Menghitung Precision, Recall, dan F1-score untuk VSM dengan membandingkan hasil prediksi (`vsm_doc_ids`)
@@ -137,10 +155,38 @@ elif bm25_avg['f1'] > vsm_avg['f1']:
 else:
     print("VSM dan BM25 memiliki performa seimbang.")
 
+# --- Laporan Efektivitas Multi-Cutoff ---
+# Run (peringkat per query) dibentuk dari hasil pencarian di atas. ID query adalah nomor urut
+# query di ground truth, karena teks query mengandung spasi yang tidak valid di run file TREC.
+qids = [str(n) for n in range(1, len(queries) + 1)]
+qrels = dict(zip(qids, ground_truth.values()))
+runs = {
+    "vsm": {qid: [(doc_ids[i], score) for i, score in result.hits] for qid, result in zip(qids, vsm_results)},
+    "bm25": {qid: [(doc_ids[i], score) for i, score in result.hits] for qid, result in zip(qids, bm25_results)},
+}
+reports = {name: evaluate_run(run, qrels)[0] for name, run in runs.items()}
+
+print(f"\nLaporan Efektivitas (kedalaman {EVAL_DEPTH}):")
+print(f"  {'Metrik':<10} {'VSM':>8} {'BM25':>8}")
+for metric in reports["vsm"]:
+    print(f"  {metric:<10} {reports['vsm'][metric]:>8.4f} {reports['bm25'][metric]:>8.4f}")
+
+# Run disimpan sebagai file TREC agar laporan dengan cutoff/metrik lain bisa dihitung ulang
+# dengan `evaluate_run(read_trec_run(path), qrels)` tanpa menjalankan pencarian lagi.
+os.makedirs("runs", exist_ok=True)
+dataset = os.path.splitext(os.path.basename(doc_path))[0]
+for name, run in runs.items():
+    run_path = os.path.join("runs", f"{dataset}-{name}.run")
+    write_trec_run(run, run_path, tag=name)
+    print(f"> Run {name.upper()} disimpan ke {run_path}")
+
 # --- Visualisasi (Opsional) ---
 # Bagian ini akan membuat diagram batang jika pustaka matplotlib terinstal.
 # Jika tidak, ia akan mencetak pesan dan melanjutkan tanpa error.
+# matplotlib baru diimpor di sini agar tidak memperlambat start-up sebelum plot dibutuhkan.
 try:
+    import matplotlib.pyplot as plt  # Pustaka untuk membuat plot/grafik visualisasi, bersifat opsional.
+
     # Menyiapkan data dan label untuk plot.
     metrics = ['Precision', 'Recall', 'F1-score']
     vsm_values = [vsm_avg['precision'], vsm_avg['recall'], vsm_avg['f1']]
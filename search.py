@@ -7,19 +7,24 @@
 #    dari dokumen yang disesuaikan dengan query.
 # 4. Menyimpan riwayat pencarian ke dalam file log.
 # 5. Beralih antar model pencarian atau keluar dari program.
+# 6. Menyalakan instrumentasi ('/trace') untuk melihat waktu per tahap pencarian.
 
 # --- Impor Pustaka ---
 import os # Untuk membaca data dari folder 'data'
-import json  # Untuk memuat data dokumen dari file.
+from search_engine.documents import open_documents, is_document_file  # Membaca koleksi dokumen (JSON atau JSONL).
 from search_engine.vsm import VSMEngine  # Mengimpor kelas mesin pencari VSM.
 from search_engine.bm25 import BM25Engine  # Mengimpor kelas mesin pencari BM25.
-from search_engine.preprocessing import preprocess  # Mengimpor fungsi preprocessing untuk membersihkan query dan teks snippet.
+from search_engine.storage import load_or_build_index  # Membuka index dari disk (atau membangunnya jika usang).
+from search_engine.cache import QueryCache  # Cache LRU untuk hasil pencarian yang berulang.
+from search_engine.query import parse_query  # Memisahkan token kueri dari operator frasa/NEAR.
+from search_engine.snippets import generate_snippet  # Membuat snippet dari index posisional.
+from search_engine.instrumentation import Trace  # Waktu per tahap dan penghitung pencarian (opsional).
 
 # --- Persiapan Data untuk Pencarian ---
 # --- Fungsi Pemuatan Dokumen ---
 def select_file_data():
-    # Hanya ambil file yang dimulai dengan 'documents' dan berakhiran '.json'
-    files = [f for f in os.listdir('data') if f.startswith('documents') and f.endswith('.json')]
+    # Hanya ambil file yang dimulai dengan 'documents' dan berakhiran '.json' atau '.jsonl'
+    files = sorted(f for f in os.listdir('data') if is_document_file(f))
     if not files:
         print("Tidak ada file dokumen yang valid di folder 'data'.")
         exit()
@@ -43,73 +48,31 @@ def select_file_data():
 
 # --- Panggil fungsi fetch dokumen ---
 selected_path = select_file_data()
-# --- Masukan data pilihan pengguna ke docs ---
-with open(selected_path, 'r') as f:
-    docs = json.load(f)
-
-# --- Persiapan Data untuk Pencarian ---
-# Mengekstrak teks mentah dari setiap dokumen untuk diindeks oleh mesin pencari.
-raw_texts = [doc["text"] for doc in docs]
-# Menyimpan ID dokumen dalam urutan yang sama untuk referensi nanti.
-doc_ids = [doc["doc_id"] for doc in docs]
-# Membuat 'lookup table' (seperti kamus) untuk mendapatkan teks asli dokumen dengan cepat menggunakan doc_id.
-# Ini sangat efisien untuk mengambil teks saat akan membuat snippet.
-doc_lookup = {doc["doc_id"]: doc["text"] for doc in docs}
+# --- Masukan data pilihan pengguna ke documents ---
+# File JSONL tidak dimuat ke memori: hanya doc_id dan posisi setiap dokumen di file yang dicatat,
+# dan teks asli dibaca dari file saat dibutuhkan untuk snippet. File JSON dimuat utuh (sekali).
+documents = open_documents(selected_path)
+# ID dokumen dalam urutan yang sama dengan indeks dokumen di index, untuk referensi nanti.
+doc_ids = documents.doc_ids
 
 # --- Inisialisasi Mesin Pencari ---
 # Membuat instance dari VSMEngine dan BM25Engine.
-# Pada tahap ini, seluruh dokumen dalam `raw_texts` akan di-preprocess dan di-indeks.
-# Proses ini hanya dilakukan sekali di awal untuk efisiensi.
-vsm_engine = VSMEngine(raw_texts)
-bm25_engine = BM25Engine(raw_texts)
-
-# --- Fungsi Pembuatan Snippet ---
-def generate_snippet(query, doc_text, max_length=150):
-    """
-    Membuat cuplikan (snippet) dari teks dokumen yang relevan dengan query.
-    Fungsi ini mencari kemunculan kata kunci dari query di dalam dokumen dan
-    mengambil teks di sekitarnya untuk ditampilkan sebagai ringkasan.
-    """
-
-    # 1. Preprocess query untuk mendapatkan token-token penting dan menyimpannya dalam `set` untuk pencarian cepat.
-    # Jika query kosong setelah diproses, kembalikan saja awal dokumen sebagai snippet.
-    query_tokens = set(preprocess(query))
-    if not query_tokens:
-        return doc_text[:max_length] + "..."
-
-    # 2. Pecah teks dokumen menjadi daftar kata-kata.
-    words = doc_text.split()
-    # Inisialisasi list untuk menyimpan posisi (indeks) di mana kata dari query ditemukan.
-    match_positions = []
-
-    # 3. Cari posisi kata dari query di dalam dokumen.
-    for i, word in enumerate(words):
-        # Setiap kata dari dokumen juga di-preprocess agar formatnya sama dengan token query (lowercase, stemmed).
-        processed_word_tokens = preprocess(word)
-        # Periksa apakah ada irisan (intersection) antara token query dengan token dari kata dokumen saat ini.
-        if query_tokens.intersection(processed_word_tokens):
-            match_positions.append(i)
-
-    # 4. Jika tidak ada kata yang cocok sama sekali, ambil 20 kata pertama sebagai snippet.
-    if not match_positions:
-        return " ".join(words[:20]) + ("..." if len(words) > 20 else "")
-
-    # 5. Jika ada kata yang cocok, ambil cuplikan di sekitar posisi *pertama* yang cocok.
-    # Tentukan titik awal snippet, mundur 10 kata dari posisi kata pertama yang cocok.
-    start = max(0, match_positions[0] - 10)
-    # Tentukan titik akhir snippet, maju 25 kata dari titik awal untuk memberikan konteks.
-    end = start + 25
-    snippet = " ".join(words[start:end])
-
-    # 6. Tambahkan elipsis (...) untuk menandakan bahwa snippet adalah potongan teks.
-    # Tambahkan di awal jika snippet tidak dimulai dari kata pertama dokumen.
-    if start > 0:
-        snippet = "... " + snippet
-    # Tambahkan di akhir jika snippet tidak berakhir di kata terakhir dokumen.
-    if end < len(words):
-        snippet = snippet + " ..."
-        
-    return snippet
+# Index korpus dibuka dari disk (mmap) dan dipakai bersama oleh kedua engine.
+# Dokumen hanya di-preprocess dan di-indeks ulang jika index belum ada atau file
+# dokumen/analyzer sudah berubah; teksnya dialirkan satu per satu ke index builder.
+corpus_index = load_or_build_index(selected_path, documents.iter_texts())
+vsm_engine = VSMEngine(corpus_index)
+bm25_engine = BM25Engine(corpus_index)
+
+# --- Cache Hasil Pencarian ---
+# Query yang sama (setelah preprocessing) pada engine dan top-k yang sama dilayani dari cache.
+# Cache otomatis dikosongkan jika index berubah atau file data lain dimuat.
+query_cache = QueryCache()
+
+# --- Instrumentasi ---
+# Jika aktif (perintah '/trace'), waktu per tahap (cache, parse, score, select, snippet) dan
+# penghitung (term, posting, dokumen dinilai) ditampilkan dan dicatat ke result_log.txt.
+tracing = False
 
 # --- Fungsi Loop Pencarian Interaktif ---
 def run_search_loop(searcher, engine_name):
@@ -124,11 +87,11 @@ def run_search_loop(searcher, engine_name):
     Returns:
         bool: False jika pengguna ingin keluar, True jika pengguna ingin mengganti engine.
     """
-    global selected_path
+    global selected_path, tracing
 
     while True:
         # Meminta input dari pengguna.
-        query = input("\nMasukkan query ('/exit' untuk keluar, '/engine' untuk ganti mesin, '/data' untuk ganti data): ")
+        query = input("\nMasukkan query ('/exit' untuk keluar, '/engine' untuk ganti mesin, '/data' untuk ganti data, '/trace' untuk instrumentasi): ")
         
         # Query untuk keluar dari program.
         if query.lower() == '/exit':
@@ -139,66 +102,72 @@ def run_search_loop(searcher, engine_name):
         # Query untuk kembali ke menu pemilihan data
         elif query.lower() == '/data':
             # Reset semua variabel yang sudah di gunakan
-            global docs, raw_texts, doc_ids, doc_lookup, vsm_engine, bm25_engine
-            # Pilih ulang file data JSON
+            global documents, doc_ids, corpus_index, vsm_engine, bm25_engine
+            # Pilih ulang file data JSON/JSONL
             selected_path = select_file_data()
-            with open(selected_path, 'r') as f:
-                docs = json.load(f)
+            documents = open_documents(selected_path)
             
             # --- Persiapan Data untuk Pencarian ---
-            # Mengekstrak teks mentah dari setiap dokumen untuk diindeks oleh mesin pencari.
-            raw_texts = [doc["text"] for doc in docs]
             # Menyimpan ID dokumen dalam urutan yang sama untuk referensi nanti.
-            doc_ids = [doc["doc_id"] for doc in docs]
-            # Membuat 'lookup table' (seperti kamus) untuk mendapatkan teks asli dokumen dengan cepat menggunakan doc_id.
-            # Ini sangat efisien untuk mengambil teks saat akan membuat snippet.
-            doc_lookup = {doc["doc_id"]: doc["text"] for doc in docs}
+            doc_ids = documents.doc_ids
             
-            vsm_engine = VSMEngine(raw_texts)
-            bm25_engine = BM25Engine(raw_texts)
+            corpus_index = load_or_build_index(selected_path, documents.iter_texts())
+            vsm_engine = VSMEngine(corpus_index)
+            bm25_engine = BM25Engine(corpus_index)
             searcher = vsm_engine if engine_name == 'vsm' else bm25_engine
             continue
+        # Query untuk menyalakan/mematikan instrumentasi.
+        elif query.lower() == '/trace':
+            tracing = not tracing
+            print(f"> Instrumentasi {'aktif' if tracing else 'nonaktif'}.")
+            continue
 
         # Menentukan jumlah hasil teratas yang akan ditampilkan.
         top_k = 5
         # Menjalankan pencarian menggunakan objek 'searcher' yang telah dipilih.
-        ranked_ids, scores = searcher.search(query, top_k=top_k)
-        # sorted_scores = sorted(scores, reverse=True)
-        # print(sorted_scores)
+        # Hasilnya hanya berisi pasangan (indeks dokumen, skor) untuk top-k.
+        # Query yang pernah dicari sebelumnya diambil langsung dari cache.
+        # Trace hanya dibuat jika instrumentasi aktif; tanpa trace tidak ada pengukuran.
+        trace = Trace() if tracing else None
+        result = query_cache.search(searcher, query, top_k=top_k, trace=trace)
 
         # Memeriksa apakah ada hasil yang ditemukan.
-        if not ranked_ids or all(scores[i] == 0 for i in ranked_ids):
+        if not result.hits or all(score == 0 for _, score in result.hits):
             print("Tidak ada dokumen relevan ditemukan.")
             continue
 
         print(f"\nTop {top_k} dokumen dari data {os.path.basename(selected_path)} yang relevan menurut {engine_name.upper()}:\n")
         
         # --- Menampilkan Hasil Pencarian ---
+        # Query cukup di-parse sekali untuk semua snippet (tanpa token operator seperti NEAR/k).
+        query_tokens = parse_query(query).tokens
+        lines = []
         # Iterasi melalui ID dokumen yang sudah diperingkat.
-        for i in ranked_ids:
+        for i, score in result.hits:
             # Mengambil ID dokumen aktual.
             doc_id = doc_ids[i]
-            # Mengambil teks lengkap dokumen dari 'lookup table'.
-            full_text = doc_lookup[doc_id]
-            # Membuat snippet yang relevan dari teks lengkap tersebut.
-            snippet = generate_snippet(query, full_text)
+            # Mengambil teks lengkap dokumen (dari memori atau langsung dari file JSONL).
+            full_text = documents.text(i)
+            # Membuat snippet dari posisi kata kunci yang tercatat di index posisional.
+            snippet = generate_snippet(searcher.index, i, full_text, query_tokens, trace=trace)
+            lines.append(f"{doc_id} (Skor: {score:.4f}): {snippet}\n")
             # Mencetak hasil dalam format yang rapi.
-            print(f"{doc_id} (Skor: {scores[i]:.4f}): {snippet}\n")
+            print(lines[-1])
+        if trace is not None:
+            print(f"Trace: {trace.format()}")
 
         # --- Menyimpan Hasil ke Log ---
         # Membuka file log dalam mode 'append' (`a`) dan dengan encoding utf-8.
+        # Snippet yang sudah dibuat di atas dipakai ulang, tidak dibuat ulang.
         with open("result_log.txt", "a", encoding="utf-8") as f:
             f.write(f"Query: {query} (Engine: {engine_name})\n")
-            # Iterasi sekali lagi untuk menulis setiap hasil ke file log.
-            for i in ranked_ids:
-                doc_id = doc_ids[i]
-                full_text = doc_lookup[doc_id]
-                snippet = generate_snippet(query, full_text)
-                f.write(f"{doc_id} (Skor: {scores[i]:.4f}): {snippet}\n")
+            f.writelines(lines)
+            if trace is not None:
+                f.write(f"Trace: {trace.format()}\n")
             f.write("-" * 20 + "\n\n")
 
 # Log jika  memuat data pilihan
-print(f"> {len(docs)} dokumen  berhasil dimuat!")
+print(f"> {len(documents)} dokumen  berhasil dimuat!")
 
 # --- Loop Program Utama ---
 # Loop ini berjalan terus menerus sampai pengguna memilih untuk keluar.
@@ -220,4 +189,7 @@ while True:
         break # Keluar dari loop utama dan menghentikan program.
     # Jika `True`, loop utama akan berlanjut, memungkinkan pengguna memilih engine lagi.
 
+# Menampilkan statistik cache hasil pencarian selama sesi ini.
+cache_info = query_cache.info()
+print(f"Cache query: {cache_info['hits']} hit, {cache_info['misses']} miss (hit rate {cache_info['hit_rate']:.0%})")
 print("Program selesai. Terima kasih!")
\ No newline at end of file
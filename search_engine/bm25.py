@@ -1,6 +1,11 @@
 import math
-from .preprocessing import preprocess # Mengimpor fungsi preprocess untuk membersihkan teks
-from collections import defaultdict, Counter # Mengimpor struktur data
+import heapq # Min-heap untuk menyimpan kandidat top-k saat pruning
+from collections import Counter # Menghitung multiplisitas token kueri
+from .index import CorpusIndex # Index korpus yang bisa dipakai bersama oleh beberapa engine
+from .numpy_backend import NumpyScorer, check_backend # Backend penilaian berbasis NumPy (opsional)
+from .results import SearchResult, select_top_k # Objek hasil pencarian dan seleksi top-k
+from .impact import ImpactIndex # Index dengan kontribusi BM25 yang sudah dihitung (opsional terkuantisasi)
+from .query import parse_query, match_constraints, apply_constraints # Operator frasa dan NEAR/k
 
 
 class BM25Engine:
@@ -8,41 +13,126 @@ class BM25Engine:
     Menginisialisasi engine BM25.
     
     Args:
-        raw_docs (list): Daftar string, di mana setiap string adalah konten sebuah dokumen.
+        raw_docs (list or CorpusIndex): Daftar string konten dokumen, atau CorpusIndex yang sudah dibangun.
         k (float): Parameter BM25 untuk saturasi frekuensi kata. Nilai umum antara 1.2 dan 2.0.
         b (float): Parameter BM25 untuk normalisasi panjang dokumen. Nilai umum adalah 0.75.
+        backend (str): 'python' (default) atau 'numpy' untuk penilaian tervektorisasi.
+        impacts (bool): Jika True, simpan kontribusi BM25 final per posting saat indexing
+            sehingga kueri hanya berupa penjumlahan (hanya untuk backend 'python').
+        impact_bits (int, optional): Kuantisasi impact ke 8 atau 16 bit. None berarti float64.
+            Hanya berlaku bersama `impacts=True`.
     """
-    def __init__(self, raw_docs, k=1.5, b=0.75):
+    # Toleransi relatif untuk perbandingan upper bound saat pruning, agar perbedaan
+    # pembulatan floating point tidak pernah membuang dokumen yang seharusnya masuk top-k.
+    PRUNING_SLACK = 1e-9
+
+    def __init__(self, raw_docs, k=1.5, b=0.75, backend="python", impacts=False, impact_bits=None):
+        check_backend(backend)
+        if impacts and backend != "python":
+            raise ValueError("Mode impact hanya tersedia untuk backend 'python'.")
+        if impact_bits is not None and not impacts:
+            raise ValueError("impact_bits hanya berlaku bersama impacts=True.")
         # Menyimpan parameter BM25
         self.k = k
         self.b = b
+        self.backend = backend
 
-        # Preprocessing
         # --- Tahap Preprocessing dan Indexing ---
-        # 1. Tokenisasi: Mengubah setiap dokumen mentah menjadi daftar token (kata-kata) yang sudah dibersihkan.
-        self.tokenized_docs = [preprocess(doc) for doc in raw_docs]
-        # 2. Menghitung dan menyimpan panjang setiap dokumen setelah tokenisasi.
-        self.doc_lens = [len(doc) for doc in self.tokenized_docs]
-        # 3. Menghitung panjang rata-rata dari semua dokumen dalam koleksi.
-        self.avg_doc_len = sum(self.doc_lens) / len(self.doc_lens)
-
-        # 4. Inisialisasi struktur data untuk statistik korpus.
-        # df: Document Frequency -> Berapa banyak dokumen yang mengandung sebuah term.
-        self.doc_freqs = defaultdict(int)   # df: berapa dokumen mengandung term
-        # tf: Term Frequency -> Daftar berisi Counter untuk setiap dokumen, menyimpan frekuensi setiap term.
-        self.term_freqs = []                # tf: list of Counter per dokumen
-
-         # 5. Proses indexing: Menghitung df dan tf untuk seluruh koleksi.
-        for tokens in self.tokenized_docs:
-            # Menghitung frekuensi term (tf) untuk dokumen saat ini.
-            tf = Counter(tokens)
-            self.term_freqs.append(tf)
-            # Memperbarui frekuensi dokumen (df) untuk setiap term unik dalam dokumen.
-            for term in tf:
-                self.doc_freqs[term] += 1
-
-        # Menyimpan jumlah total dokumen dalam koleksi.
-        self.N = len(self.tokenized_docs)  # jumlah dokumen
+        # Tokenisasi, TF, DF, panjang dokumen, dan postings disimpan di CorpusIndex.
+        # Jika sebuah CorpusIndex diberikan, index tersebut dipakai bersama tanpa diproses ulang.
+        self.index = raw_docs if isinstance(raw_docs, CorpusIndex) else CorpusIndex(raw_docs)
+        self.impacts = impacts
+        self.impact_bits = impact_bits
+        self._build_derived()
+
+    def _build_derived(self):
+        """
+        Membangun struktur turunan yang bergantung pada statistik korpus (N, DF, panjang rata-rata).
+        Dipanggil saat inisialisasi dan setiap kali generasi CorpusIndex berubah.
+        """
+        self._generation = self.index.generation
+
+        # Index impact-scored: kontribusi BM25 final per posting, opsional terkuantisasi.
+        self.impact_index = ImpactIndex(self, self.impact_bits) if self.impacts else None
+
+        # Cache upper bound kontribusi per term untuk dynamic pruning (MaxScore).
+        self._max_contributions = {}
+
+        # Backend NumPy: simpan kontribusi BM25 final per posting sebagai array per term.
+        self._numpy_scorer = None
+        if self.backend == "numpy":
+            live_postings = self.index.live_postings
+            self._numpy_scorer = NumpyScorer(
+                {term: [(doc_idx, self._contribution(term, doc_idx, tf)) for doc_idx, tf in live_postings(term)]
+                 for term in self.doc_freqs},
+                self.index.num_slots,
+            )
+
+    def _sync(self):
+        # Menyegarkan struktur turunan secara lazy jika koleksi berubah sejak terakhir dibangun.
+        if self._generation != self.index.generation:
+            self._build_derived()
+
+    def add_documents(self, raw_docs):
+        """
+        Menambahkan dokumen ke index (dipakai bersama engine lain yang memakai index yang sama).
+
+        Struktur turunan (index impact, array backend NumPy, upper bound MaxScore) dibangun ulang
+        saat pencarian berikutnya dengan biaya O(ukuran korpus), karena N, DF, dan panjang rata-rata
+        dokumen memengaruhi kontribusi setiap posting. Untuk banyak perubahan, kelompokkan dalam
+        satu panggilan.
+
+        Args:
+            raw_docs (list): Daftar teks dokumen baru.
+
+        Returns:
+            list: Indeks dokumen yang diberikan untuk dokumen-dokumen baru.
+        """
+        return self.index.add_documents(raw_docs)
+
+    def delete_documents(self, doc_indices):
+        """
+        Menghapus dokumen dari index dengan tombstone. Struktur turunan dibangun ulang saat
+        pencarian berikutnya dengan biaya O(ukuran korpus), sama seperti `add_documents`.
+
+        Args:
+            doc_indices (list): Indeks dokumen yang akan dihapus.
+
+        Returns:
+            int: Jumlah dokumen yang dihapus.
+        """
+        return self.index.delete_documents(doc_indices)
+
+    @property
+    def params(self):
+        # Parameter yang memengaruhi hasil pencarian (dipakai sebagai bagian kunci cache).
+        return {"k": self.k, "b": self.b, "backend": self.backend,
+                "impacts": self.impacts, "impact_bits": self.impact_bits}
+
+    # --- Statistik korpus (diambil dari CorpusIndex) ---
+    @property
+    def doc_lens(self):
+        return self.index.doc_lens
+
+    @property
+    def avg_doc_len(self):
+        return self.index.avg_doc_len
+
+    @property
+    def doc_freqs(self):
+        return self.index.doc_freqs
+
+    @property
+    def term_freqs(self):
+        return self.index.term_freqs
+
+    @property
+    def postings(self):
+        return self.index.postings
+
+    @property
+    def N(self):
+        return self.index.N
 
     def idf(self, term):
         # Inverse Document Frequency (menggunakan formula BM25)
@@ -56,6 +146,10 @@ class BM25Engine:
         Returns:
             float: Skor IDF dari term tersebut.
         """
+        # Index yang dibuka dari disk sudah menyimpan IDF setiap term.
+        precomputed = self.index.precomputed.get("bm25_idf")
+        if precomputed is not None:
+            return precomputed.get(term, 0)
         # Mengambil frekuensi dokumen (df) dari term. Jika term tidak ada, df = 0.
         df = self.doc_freqs.get(term, 0)
         # Jika term tidak pernah muncul di dokumen manapun, skor IDF-nya 0.
@@ -64,6 +158,22 @@ class BM25Engine:
         # Formula IDF BM25. Memberikan skor lebih tinggi untuk term yang lebih langka.
         return math.log(1 + (self.N - df + 0.5) / (df + 0.5))
 
+    def _contribution(self, term, doc_idx, tf):
+        """
+        Menghitung kontribusi skor BM25 dari satu term pada satu dokumen.
+
+        Args:
+            term (str): Term kueri.
+            doc_idx (int): Indeks dokumen.
+            tf (int): Frekuensi term di dalam dokumen.
+
+        Returns:
+            float: Kontribusi skor BM25.
+        """
+        numerator = tf * (self.k + 1)
+        denominator = tf + self.k * (1 - self.b + self.b * self.doc_lens[doc_idx] / self.avg_doc_len)
+        return self.idf(term) * (numerator / denominator)
+
     def score(self, query_tokens, doc_idx):
         """
         Menghitung skor relevansi BM25 untuk satu dokumen terhadap sebuah kueri.
@@ -82,12 +192,11 @@ class BM25Engine:
         
         # Iterasi melalui setiap term dalam kueri untuk mengakumulasi skor.
         for term in query_tokens:
+            # Mengambil frekuensi term (tf) di dalam dokumen (satu kali pencarian di forward index).
+            tf = doc_tf.get(term)
             # Jika term dari kueri tidak ada di dalam dokumen, lewati (tidak ada kontribusi skor).
-            if term not in doc_tf:
+            if tf is None:
                 continue
-            
-            # Mengambil frekuensi term (tf) di dalam dokumen.
-            tf = doc_tf[term]
             # Menghitung IDF untuk term tersebut.
             idf = self.idf(term)
             # --- Formula Inti BM25 untuk satu term ---
@@ -99,22 +208,329 @@ class BM25Engine:
             score += idf * (numerator / denominator)
         return score
 
-    def search(self, query, top_k=5):
+    def accumulate(self, query_tokens, k=None, b=None):
+        """
+        Menghitung skor BM25 secara term-at-a-time menggunakan inverted index.
+        Hanya dokumen yang mengandung minimal satu term kueri yang disentuh.
+
+        Args:
+            query_tokens (list): Daftar token dari kueri yang sudah diproses.
+            k (float, optional): Nilai k untuk kueri ini. Default: `self.k`.
+            b (float, optional): Nilai b untuk kueri ini. Default: `self.b`.
+
+        Returns:
+            dict: Pemetaan doc_idx -> skor BM25 (identik dengan memanggil `score` per dokumen).
+        """
+        scores = {}
+        k = self.k if k is None else k
+        b = self.b if b is None else b
+        doc_lens, avg_doc_len = self.doc_lens, self.avg_doc_len
+        # Urutan akumulasi mengikuti urutan token kueri, sama seperti `score`,
+        # sehingga hasil penjumlahan floating point identik.
+        for term in query_tokens:
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = self.idf(term)
+            for doc_idx, tf in postings:
+                numerator = tf * (k + 1)
+                denominator = tf + k * (1 - b + b * doc_lens[doc_idx] / avg_doc_len)
+                scores[doc_idx] = scores.get(doc_idx, 0) + idf * (numerator / denominator)
+        # Dokumen yang sudah dihapus (tombstone) tidak ikut dinilai.
+        return self.index.drop_deleted(scores)
+
+    def max_contribution(self, term):
+        """
+        Menghitung batas atas (upper bound) kontribusi skor sebuah term pada dokumen mana pun,
+        yaitu kontribusi terbesar di antara seluruh posting term tersebut. Hasilnya disimpan di cache.
+
+        Args:
+            term (str): Term kueri.
+
+        Returns:
+            float: Kontribusi BM25 maksimum term tersebut (0 jika term tidak ada).
+        """
+        cache = self._max_contributions
+        if term not in cache:
+            cache[term] = max(
+                (self._contribution(term, doc_idx, tf) for doc_idx, tf in self.postings.get(term, ())),
+                default=0,
+            )
+        return cache[term]
+
+    def search_maxscore(self, query_tokens, top_k):
+        """
+        Retrieval top-k dengan dynamic pruning MaxScore yang rank-safe.
+
+        Term kueri diurutkan berdasarkan upper bound kontribusinya. Term dengan upper bound
+        kumulatif yang tidak mungkin mencapai ambang top-k saat ini menjadi "non-essential":
+        dokumen hanya diambil sebagai kandidat dari postings term "essential", dan dokumen
+        yang total upper bound-nya tidak melampaui ambang dilewati tanpa dinilai penuh.
+        Hasil top-k identik dengan evaluasi BM25 menyeluruh.
+
+        Args:
+            query_tokens (list): Daftar token dari kueri yang sudah diproses.
+            top_k (int): Jumlah dokumen teratas yang dikembalikan.
+
+        Returns:
+            SearchResult: Hasil top-k beserta statistik 'docs_scored' (dokumen yang dinilai penuh)
+                dan 'candidates' (dokumen yang dipertimbangkan).
+        """
+        self._sync()
+        deleted = self.index.deleted
+        # 1. Kumpulkan postings setiap term unik beserta upper bound-nya (dikali multiplisitas token).
+        lists = []
+        for term, count in Counter(query_tokens).items():
+            postings = self.postings.get(term)
+            if postings:
+                lists.append((count * self.max_contribution(term), postings, count * self.idf(term)))
+        # Urutkan dari upper bound terkecil; awalan daftar ini adalah kandidat non-essential.
+        lists.sort(key=lambda item: item[0])
+        upper_bounds = [ub for ub, _, _ in lists]
+        k, b = self.k, self.b
+        doc_lens, avg_doc_len = self.doc_lens, self.avg_doc_len
+        cumulative = []
+        total = 0
+        for ub in upper_bounds:
+            total += ub
+            cumulative.append(total)
+
+        positions = [0] * len(lists)
+        heap = []  # Min-heap berisi (skor, -doc_idx); akar adalah kandidat terlemah di top-k.
+        threshold = 0
+        first_essential = 0
+        docs_scored = 0
+        candidates = 0
+        slack = 1 + self.PRUNING_SLACK
+
+        while True:
+            # 2. Ambil dokumen berikutnya (doc_idx terkecil) dari postings essential.
+            doc_idx = None
+            for i in range(first_essential, len(lists)):
+                postings = lists[i][1]
+                if positions[i] < len(postings):
+                    current = postings[positions[i]][0]
+                    if doc_idx is None or current < doc_idx:
+                        doc_idx = current
+            if doc_idx is None:
+                break
+            candidates += 1
+
+            # 3. Upper bound dokumen: kontribusi aktual term essential yang memuatnya
+            #    + upper bound seluruh term non-essential.
+            bound = cumulative[first_essential - 1] if first_essential else 0
+            norm = k * (1 - b + b * doc_lens[doc_idx] / avg_doc_len)
+            for i in range(first_essential, len(lists)):
+                postings = lists[i][1]
+                if positions[i] < len(postings) and postings[positions[i]][0] == doc_idx:
+                    tf = postings[positions[i]][1]
+                    bound += lists[i][2] * (tf * (k + 1) / (tf + norm))
+                    positions[i] += 1
+
+            # Dokumen terhapus dilewati. Dokumen hanya bisa masuk top-k jika skornya
+            # melampaui ambang (seri kalah oleh indeks lebih kecil).
+            if doc_idx in deleted or (len(heap) == top_k and bound * slack <= threshold):
+                continue
+
+            # 4. Nilai dokumen secara penuh dengan urutan akumulasi yang sama seperti `score`.
+            score = self.score(query_tokens, doc_idx)
+            docs_scored += 1
+            entry = (score, -doc_idx)
+            if len(heap) < top_k:
+                heapq.heappush(heap, entry)
+            elif entry > heap[0]:
+                heapq.heapreplace(heap, entry)
+            else:
+                continue
+
+            # 5. Perbarui ambang dan geser batas term non-essential.
+            if len(heap) == top_k:
+                threshold = heap[0][0]
+                while first_essential < len(lists) and cumulative[first_essential] * slack <= threshold:
+                    first_essential += 1
+
+        doc_scores = {-neg_idx: score for score, neg_idx in heap}
+        stats = {"docs_scored": docs_scored, "candidates": candidates}
+        return SearchResult(select_top_k(doc_scores, self.index.num_slots, top_k, deleted), stats=stats)
+
+    def score_all(self, query_tokens):
+        """
+        Menghitung skor BM25 untuk seluruh koleksi (dokumen yang tidak disentuh kueri bernilai 0).
+
+        Args:
+            query_tokens (list): Daftar token dari kueri yang sudah diproses.
+
+        Returns:
+            list: Skor BM25 untuk setiap dokumen.
+        """
+        scores = [0] * self.index.num_slots
+        for doc_idx, score in self.accumulate(query_tokens).items():
+            scores[doc_idx] = score
+        return scores
+
+    def _overrides(self, k, b):
+        # True jika k/b per kueri berbeda dari parameter engine. Struktur turunan (backend NumPy,
+        # index impact, upper bound MaxScore) dihitung dengan k/b engine, sehingga kueri dengan
+        # k/b lain dinilai langsung dari TF dan panjang dokumen di index.
+        return (k is not None and k != self.k) or (b is not None and b != self.b)
+
+    def search(self, query, top_k=5, full_scores=False, pruning=False, proximity_boost=0.0, trace=None,
+               k=None, b=None):
         """
         Mencari dan memeringkat dokumen berdasarkan kueri yang diberikan.
+        Kueri boleh memuat frasa dalam tanda kutip ("boundary layer") dan operator
+        kedekatan `a NEAR/k b` (lihat `search_engine.query`).
         
         Args:
             query (str): String kueri dari pengguna.
             top_k (int): Jumlah dokumen teratas yang akan dikembalikan.
+            full_scores (bool): Jika True, sertakan skor untuk seluruh dokumen di hasil.
+            pruning (bool): Jika True, gunakan dynamic pruning MaxScore (diabaikan jika `full_scores`,
+                kueri memuat operator posisional, atau engine memakai index impact; MaxScore menilai
+                dengan skor BM25 eksak sehingga skornya bisa berbeda dari impact terkuantisasi).
+            proximity_boost (float): 0 (default) berarti frasa/NEAR menyaring dokumen. Jika > 0,
+                dokumen yang memenuhi operator mendapat boost skor alih-alih disaring.
+            trace (Trace, optional): Jika diisi, waktu per tahap dan penghitung dicatat ke trace ini.
+            k (float, optional): Nilai k untuk kueri ini saja (tanpa membangun ulang index).
+            b (float, optional): Nilai b untuk kueri ini saja. Jika k/b berbeda dari parameter
+                engine, `pruning` diabaikan dan skor dihitung dari postings secara langsung.
             
         Returns:
-            tuple: Berisi daftar ID dokumen yang diperingkat dan daftar skor mentah.
-        """
-        # 1. Preprocess kueri pengguna.
-        query_tokens = preprocess(query)
-        # 2. Hitung skor BM25 untuk setiap dokumen dalam koleksi.
-        scores = [self.score(query_tokens, i) for i in range(len(self.tokenized_docs))]
-        # 3. Peringkat dokumen: Mengurutkan indeks dokumen berdasarkan skornya (dari tertinggi ke terendah).
-        ranked_ids = sorted(range(len(scores)), key=lambda i: scores[i], reverse=True)
-        # 4. Mengembalikan `top_k` dokumen teratas beserta skor mentahnya.
-        return ranked_ids[:top_k], scores
+            SearchResult: Pasangan (doc_idx, skor) top-k. Bisa di-unpack menjadi
+                `ranked_ids, scores` seperti sebelumnya.
+        """
+        if trace is not None:
+            trace.resume()
+        # 1. Preprocess kueri pengguna dan pisahkan operator frasa/NEAR.
+        parsed = parse_query(query)
+        query_tokens = parsed.tokens
+        self._sync()
+        if trace is not None:
+            trace.mark("parse")
+            trace.record_lookup(self.postings, query_tokens)
+        satisfied = None
+        if parsed.num_constraints:
+            satisfied = match_constraints(self.index, parsed)
+            if trace is not None:
+                trace.mark("match")
+        overridden = self._overrides(k, b)
+        if (pruning and not full_scores and top_k > 0 and satisfied is None and not overridden
+                and self.impact_index is None):
+            # MaxScore: hanya dokumen yang masih mungkin masuk top-k yang dinilai penuh.
+            result = self.search_maxscore(query_tokens, top_k)
+            if trace is not None:
+                trace.mark("score")
+                for name, value in result.stats.items():
+                    trace.count(name, value)
+            return result
+        if overridden:
+            doc_scores = self.accumulate(query_tokens, k, b)
+        elif self._numpy_scorer is not None:
+            # Backend NumPy: akumulasi kontribusi per term dengan np.add.at, lalu seleksi dengan argpartition.
+            scores = self._numpy_scorer.score([(term, 1) for term in query_tokens])
+            if trace is not None:
+                trace.mark("score")
+                trace.count("docs_scored", int((scores != 0).sum()))
+            if satisfied is None or proximity_boost:
+                if satisfied is not None:
+                    apply_constraints(scores, satisfied, parsed.num_constraints, proximity_boost)
+                hits = self._numpy_scorer.top_k(scores, top_k, self.index.deleted)
+                if trace is not None:
+                    trace.mark("select")
+                return SearchResult(hits, scores.tolist() if full_scores else None)
+            doc_scores = {doc_idx: float(scores[doc_idx]) for doc_idx in satisfied}
+        # 2. Hitung skor BM25 hanya untuk dokumen yang muncul di postings term kueri.
+        # Dengan index impact, skor cukup dijumlahkan dari kontribusi yang sudah disimpan.
+        elif self.impact_index is not None:
+            doc_scores = self.index.drop_deleted(self.impact_index.accumulate(query_tokens))
+        else:
+            doc_scores = self.accumulate(query_tokens)
+        if trace is not None and (overridden or self._numpy_scorer is None):
+            trace.mark("score")
+            trace.count("docs_scored", len(doc_scores))
+        # Operator frasa/NEAR: saring dokumen (atau beri boost jika `proximity_boost` diisi).
+        # Saat menyaring, hasil tidak dilengkapi dokumen berskor 0 yang tidak memenuhi operator.
+        n_docs = self.index.num_slots
+        if satisfied is not None:
+            doc_scores = apply_constraints(doc_scores, satisfied, parsed.num_constraints, proximity_boost)
+            if not proximity_boost:
+                n_docs = 0
+        # 3. Peringkat dokumen: seleksi top-k dengan heap, tanpa mengurutkan seluruh koleksi.
+        hits = select_top_k(doc_scores, n_docs, top_k, self.index.deleted)
+        if trace is not None:
+            trace.mark("select")
+        # 4. Mengembalikan `top_k` dokumen teratas (dan skor lengkap jika diminta).
+        all_scores = None
+        if full_scores:
+            all_scores = [0] * self.index.num_slots
+            for doc_idx, score in doc_scores.items():
+                all_scores[doc_idx] = score
+        return SearchResult(hits, all_scores, stats={"docs_scored": len(doc_scores)})
+
+    def search_many(self, queries, top_k=5, k=None, b=None):
+        """
+        Mencari sekumpulan kueri sekaligus. Hasil setiap kueri identik dengan `search`,
+        tetapi pekerjaan per term dibagi antar kueri: kontribusi BM25 setiap term unik
+        dihitung sekali untuk seluruh batch (backend 'python'), atau postings-nya dibaca
+        sekali untuk semua kueri yang memuatnya (backend 'numpy').
+
+        Args:
+            queries (list): Daftar string kueri.
+            top_k (int): Jumlah dokumen teratas yang dikembalikan per kueri.
+            k (float, optional): Nilai k untuk batch ini saja (tanpa membangun ulang index).
+            b (float, optional): Nilai b untuk batch ini saja.
+
+        Returns:
+            list: SearchResult untuk setiap kueri, sesuai urutan input.
+        """
+        # Kueri dengan operator frasa/NEAR dievaluasi satu per satu dengan `search`.
+        parsed = [parse_query(query) for query in queries]
+        results = [self.search(query, top_k, k=k, b=b) if p.num_constraints else None
+                   for query, p in zip(queries, parsed)]
+        plain = [i for i, p in enumerate(parsed) if not p.num_constraints]
+        for i, result in zip(plain, self._search_batch([parsed[i].tokens for i in plain], top_k, k, b)):
+            results[i] = result
+        return results
+
+    def _search_batch(self, token_lists, top_k, k=None, b=None):
+        # Inti `search_many` untuk kueri tanpa operator posisional (daftar token per kueri).
+        self._sync()
+        deleted, num_slots = self.index.deleted, self.index.num_slots
+        overridden = self._overrides(k, b)
+        if self._numpy_scorer is not None and not overridden:
+            scorer = self._numpy_scorer
+            blocks = scorer.score_many([[(term, 1) for term in tokens] for tokens in token_lists])
+            return [SearchResult(hits) for scores in blocks for hits in scorer.top_k_many(scores, top_k, deleted)]
+
+        results = []
+        if self.impact_index is not None and not overridden:
+            for tokens in token_lists:
+                doc_scores = self.index.drop_deleted(self.impact_index.accumulate(tokens))
+                results.append(SearchResult(select_top_k(doc_scores, num_slots, top_k, deleted),
+                                            stats={"docs_scored": len(doc_scores)}))
+            return results
+
+        # Kontribusi BM25 per posting untuk setiap term unik di batch, dihitung sekali saja
+        # dengan rumus yang sama seperti `accumulate`.
+        k = self.k if k is None else k
+        b = self.b if b is None else b
+        doc_lens, avg_doc_len = self.doc_lens, self.avg_doc_len
+        contributions = {}
+        for tokens in token_lists:
+            for term in tokens:
+                if term not in contributions:
+                    idf = self.idf(term)
+                    contributions[term] = [
+                        (doc_idx, idf * ((tf * (k + 1)) / (tf + k * (1 - b + b * doc_lens[doc_idx] / avg_doc_len))))
+                        for doc_idx, tf in self.index.live_postings(term)
+                    ]
+        for tokens in token_lists:
+            # Akumulasi mengikuti urutan token kueri, sama seperti `accumulate`.
+            doc_scores = {}
+            get = doc_scores.get
+            for term in tokens:
+                for doc_idx, contribution in contributions[term]:
+                    doc_scores[doc_idx] = get(doc_idx, 0) + contribution
+            results.append(SearchResult(select_top_k(doc_scores, num_slots, top_k, deleted),
+                                        stats={"docs_scored": len(doc_scores)}))
+        return results
@@ -0,0 +1,127 @@
+# Cache hasil pencarian (LRU) di depan VSMEngine dan BM25Engine.
+# Kueri yang sama (setelah preprocessing) dengan engine, parameter, dan top_k yang sama
+# dilayani langsung dari cache tanpa penilaian ulang. Cache otomatis dikosongkan jika
+# index berubah (dokumen ditambah/dihapus) atau engine dengan index lain (file data lain) dipakai.
+import threading
+from collections import OrderedDict
+from .query import parse_query
+
+# Jumlah maksimum hasil kueri yang disimpan sebelum entri terlama dibuang.
+DEFAULT_CACHE_SIZE = 1024
+
+
+class QueryCache:
+    """
+    Cache LRU untuk hasil pencarian.
+
+    Kunci cache terdiri dari kueri yang sudah dianalisis (token hasil preprocessing beserta
+    operator frasa/NEAR), nama dan parameter engine, `top_k`, serta opsi pencarian lainnya. Karena kuncinya
+    adalah token hasil analisis, variasi penulisan seperti huruf besar/kecil, tanda baca,
+    atau stopword menghasilkan entri yang sama.
+
+    Args:
+        maxsize (int): Jumlah maksimum entri di cache.
+    """
+    def __init__(self, maxsize=DEFAULT_CACHE_SIZE):
+        if maxsize < 1:
+            raise ValueError(f"Ukuran cache harus minimal 1, bukan {maxsize!r}")
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        # Index dan generasinya saat entri di cache dibuat; jika berubah, cache dikosongkan.
+        self._index = None
+        self._generation = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def _key(self, engine, query, top_k, options):
+        # Kunci cache: nama engine, parameternya, token kueri, top_k, dan opsi tambahan.
+        params = tuple(sorted(engine.params.items()))
+        return (type(engine).__name__, params, parse_query(query).key(), top_k, tuple(sorted(options.items())))
+
+    def _check_index(self, index):
+        # Mengosongkan cache jika index atau generasinya berbeda dari saat entri dibuat.
+        if index is not self._index or index.generation != self._generation:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+            self._index = index
+            self._generation = index.generation
+
+    def search(self, engine, query, top_k=5, trace=None, **options):
+        """
+        Menjalankan `engine.search` melalui cache.
+
+        Args:
+            engine (VSMEngine or BM25Engine): Engine yang dipakai jika hasil belum ada di cache.
+            query (str): String kueri dari pengguna.
+            top_k (int): Jumlah dokumen teratas yang akan dikembalikan.
+            trace (Trace, optional): Trace instrumentasi. Tidak menjadi bagian kunci cache; saat
+                cache hit, waktu pencarian di cache dicatat ke tahap 'cache'.
+            **options: Opsi tambahan untuk `engine.search` (misalnya `pruning=True`).
+
+        Returns:
+            SearchResult: Hasil pencarian (objek yang sama untuk kueri yang sama selama cache valid).
+        """
+        if trace is not None:
+            trace.resume()
+        key = self._key(engine, query, top_k, options)
+        with self._lock:
+            self._check_index(engine.index)
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                if trace is not None:
+                    trace.mark("cache")
+                    trace.count("cache_hits")
+                return result
+            self.misses += 1
+            generation = self._generation
+        if trace is not None:
+            trace.mark("cache")
+            options["trace"] = trace
+
+        result = engine.search(query, top_k=top_k, **options)
+
+        with self._lock:
+            # Hasil hanya disimpan jika index tidak berubah selama pencarian berlangsung.
+            if engine.index is self._index and generation == self._generation == engine.index.generation:
+                self._entries[key] = result
+                self._entries.move_to_end(key)
+                if len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+        return result
+
+    def clear(self):
+        # Mengosongkan cache dan mereset statistik.
+        with self._lock:
+            self._entries.clear()
+            self._index = None
+            self._generation = None
+            self.hits = self.misses = self.evictions = self.invalidations = 0
+
+    def info(self):
+        """
+        Statistik cache hasil kueri.
+
+        Returns:
+            dict: hits, misses, evictions, invalidations, maxsize, currsize, dan hit_rate.
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "maxsize": self.maxsize,
+                "currsize": len(self._entries),
+                "hit_rate": self.hits / total if total else 0.0,
+            }
+
+    def __len__(self):
+        return len(self._entries)
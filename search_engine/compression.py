@@ -0,0 +1,237 @@
+# Postings terkompresi: selisih doc_idx (delta/gap) dan tf disimpan sebagai variable-byte
+# dalam satu buffer `bytes`, dibagi menjadi blok berukuran tetap. Setiap blok punya skip pointer
+# (doc_idx terakhir di blok dan posisi byte awalnya), sehingga pencarian doc_idx tertentu
+# (irisan postings) hanya mendekode satu blok, bukan seluruh daftar.
+import sys
+from array import array
+from bisect import bisect_left
+from itertools import accumulate
+
+# Jumlah posting per blok.
+BLOCK_SIZE = 128
+
+
+def encode_varbyte(value, out):
+    """
+    Menambahkan bilangan bulat non-negatif ke `out` dalam format variable-byte:
+    7 bit per byte dimulai dari bit terendah; bit tertinggi menandakan masih ada byte lanjutan.
+
+    Args:
+        value (int): Bilangan yang dikodekan.
+        out (bytearray): Buffer tujuan.
+    """
+    while value >= 128:
+        out.append((value & 127) | 128)
+        value >>= 7
+    out.append(value)
+
+
+class CompressedPostings:
+    """
+    Postings satu term dalam bentuk terkompresi. Perilakunya seperti daftar (doc_idx, tf)
+    terurut: bisa diiterasi, diindeks, dihitung panjangnya, dan ditambah di akhir (`append`).
+
+    Args:
+        postings (iterable): Pasangan (doc_idx, tf) terurut naik berdasarkan doc_idx.
+        block_size (int): Jumlah posting per blok.
+    """
+    __slots__ = ("data", "last_docs", "offsets", "length", "block_size", "_cached")
+
+    def __init__(self, postings=(), block_size=BLOCK_SIZE):
+        self.data = bytearray()
+        # Skip pointer: doc_idx terakhir setiap blok, dan posisi byte awal setiap blok
+        # (ditambah satu entri akhir, sehingga blok b berada di data[offsets[b]:offsets[b + 1]]).
+        self.last_docs = array("I")
+        self.offsets = array("Q", [0])
+        self.length = 0
+        self.block_size = block_size
+        # Blok terakhir yang didekode sebagai satu tuple (nomor blok, postings), lihat `_block`.
+        self._cached = (-1, None)
+        for posting in postings:
+            self.append(posting)
+
+    @classmethod
+    def from_buffers(cls, data, last_docs, offsets, length, block_size):
+        """
+        Membuat tampilan read-only atas buffer yang sudah ada (misalnya seksi mmap).
+
+        Args:
+            data (buffer): Buffer byte; `offsets` menunjuk langsung ke posisi di buffer ini.
+            last_docs (sequence): doc_idx terakhir setiap blok.
+            offsets (sequence): Posisi byte awal setiap blok ditambah posisi akhir blok terakhir.
+            length (int): Jumlah posting.
+            block_size (int): Jumlah posting per blok.
+        """
+        postings = cls.__new__(cls)
+        postings.data = data
+        postings.last_docs = last_docs
+        postings.offsets = offsets
+        postings.length = length
+        postings.block_size = block_size
+        postings._cached = (-1, None)
+        return postings
+
+    def append(self, posting):
+        # Menambahkan (doc_idx, tf) di akhir; doc_idx harus lebih besar dari posting terakhir.
+        doc_idx, tf = posting
+        last = self.last_docs[-1] if self.length else -1
+        if doc_idx <= last:
+            raise ValueError(f"Postings harus terurut naik: {doc_idx} setelah {last}")
+        if self.length % self.block_size == 0:
+            # Blok baru: gap pertama dihitung dari doc_idx terakhir blok sebelumnya (atau 0).
+            encode_varbyte(doc_idx - max(last, 0), self.data)
+            encode_varbyte(tf, self.data)
+            self.last_docs.append(doc_idx)
+            self.offsets.append(len(self.data))
+        else:
+            encode_varbyte(doc_idx - last, self.data)
+            encode_varbyte(tf, self.data)
+            self.last_docs[-1] = doc_idx
+            self.offsets[-1] = len(self.data)
+            if self._cached[0] == len(self.last_docs) - 1:
+                self._cached = (-1, None)
+        self.length += 1
+
+    @property
+    def num_blocks(self):
+        return len(self.last_docs)
+
+    def decode_block(self, block):
+        """
+        Mendekode satu blok.
+
+        Args:
+            block (int): Nomor blok.
+
+        Returns:
+            list: Pasangan (doc_idx, tf) di blok tersebut.
+        """
+        doc_idx = self.last_docs[block - 1] if block else 0
+        chunk = self.data[self.offsets[block]:self.offsets[block + 1]]
+        if max(chunk) < 128:
+            # Jalur cepat: semua gap dan tf di blok ini muat dalam satu byte, sehingga byte
+            # genap adalah gap dan byte ganjil adalah tf.
+            doc_ids = accumulate(chunk[0::2], initial=doc_idx)
+            next(doc_ids)
+            return list(zip(doc_ids, chunk[1::2]))
+        postings = []
+        value = shift = 0
+        gap = None
+        for byte in chunk:
+            if byte & 128:
+                value |= (byte & 127) << shift
+                shift += 7
+                continue
+            value |= byte << shift
+            if gap is None:
+                gap = value
+            else:
+                doc_idx += gap
+                postings.append((doc_idx, value))
+                gap = None
+            value = shift = 0
+        return postings
+
+    def _block(self, block):
+        # Blok terakhir yang didekode disimpan, sehingga akses berurutan lewat indeks
+        # (misalnya kursor MaxScore) hanya mendekode setiap blok sekali. Nomor blok dan isinya
+        # disimpan dalam satu tuple dan dibaca sekali, sehingga thread lain yang mengganti cache
+        # tidak bisa membuat nomor blok dan isinya tidak cocok.
+        cached_block, postings = self._cached
+        if cached_block != block:
+            postings = self.decode_block(block)
+            self._cached = (block, postings)
+        return postings
+
+    def __len__(self):
+        return self.length
+
+    def __iter__(self):
+        for block in range(len(self.last_docs)):
+            yield from self.decode_block(block)
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self.length
+        if not 0 <= i < self.length:
+            raise IndexError("indeks posting di luar jangkauan")
+        block, j = divmod(i, self.block_size)
+        return self._block(block)[j]
+
+    def geq_index(self, target, lo=0):
+        """
+        Indeks posting pertama mulai dari `lo` dengan doc_idx >= target. Skip pointer dipakai
+        untuk menemukan blok yang tepat, sehingga hanya blok itu yang didekode.
+
+        Args:
+            target (int): doc_idx yang dicari.
+            lo (int): Indeks awal pencarian.
+
+        Returns:
+            int: Indeks hasil (len(self) jika semua doc_idx lebih kecil dari target).
+        """
+        block = bisect_left(self.last_docs, target, lo // self.block_size)
+        if block == len(self.last_docs):
+            return self.length
+        start = block * self.block_size
+        return start + bisect_left(self._block(block), (target,), max(lo - start, 0))
+
+    @property
+    def doc_ids(self):
+        # Tampilan doc_idx dengan skip pointer, dipakai irisan postings (lihat `query`).
+        return _CompressedDocIds(self)
+
+    @property
+    def nbytes(self):
+        # Ukuran buffer data dan skip pointer (byte).
+        return (len(self.data) + len(self.last_docs) * self.last_docs.itemsize
+                + len(self.offsets) * self.offsets.itemsize)
+
+
+class _CompressedDocIds:
+    # Tampilan doc_idx atas CompressedPostings; `geq_index` memakai skip pointer.
+    __slots__ = ("postings",)
+
+    def __init__(self, postings):
+        self.postings = postings
+
+    def __len__(self):
+        return len(self.postings)
+
+    def __getitem__(self, i):
+        return self.postings[i][0]
+
+    def __iter__(self):
+        return (doc_idx for doc_idx, _ in self.postings)
+
+    def geq_index(self, target, lo=0):
+        return self.postings.geq_index(target, lo)
+
+
+def postings_nbytes(postings):
+    """
+    Memperkirakan memori yang dipakai inverted index (term -> postings), tanpa kunci term.
+    Untuk daftar Python, ukuran list, tuple, dan objek int dihitung (int yang sama dihitung sekali);
+    untuk CompressedPostings, ukuran objek beserta buffer data dan skip pointer-nya.
+
+    Args:
+        postings (dict): Inverted index.
+
+    Returns:
+        int: Perkiraan ukuran dalam byte.
+    """
+    total = 0
+    seen = set()
+    for term_postings in postings.values():
+        if isinstance(term_postings, CompressedPostings):
+            total += (sys.getsizeof(term_postings) + sys.getsizeof(term_postings.data)
+                      + sys.getsizeof(term_postings.last_docs) + sys.getsizeof(term_postings.offsets))
+            continue
+        total += sys.getsizeof(term_postings)
+        for posting in term_postings:
+            total += sys.getsizeof(posting)
+            for value in posting:
+                if id(value) not in seen:
+                    seen.add(id(value))
+                    total += sys.getsizeof(value)
+    return total
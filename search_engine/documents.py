@@ -0,0 +1,160 @@
+# Penyimpanan dan pembacaan koleksi dokumen.
+# Selain file JSON (satu list besar berisi {"doc_id", "text"}), koleksi bisa disimpan sebagai
+# JSONL: satu objek dokumen JSON per baris. File JSONL bisa dibaca secara streaming, sehingga
+# dokumen mengalir satu per satu ke preprocessing dan index builder tanpa pernah memuat
+# seluruh teks koleksi ke memori sekaligus. Teks dokumen untuk snippet dibaca langsung
+# dari file berdasarkan posisi byte setiap baris.
+import json
+import threading
+from array import array
+
+# Ekstensi file koleksi yang dikenali.
+JSON_SUFFIX = ".json"
+JSONL_SUFFIX = ".jsonl"
+
+
+def is_document_file(name):
+    # Apakah `name` adalah file koleksi dokumen (documents*.json atau documents*.jsonl).
+    return name.startswith("documents") and name.endswith((JSON_SUFFIX, JSONL_SUFFIX))
+
+
+def write_jsonl(documents, path):
+    """
+    Menulis dokumen ke file JSONL, satu objek per baris. Dokumen ditulis sambil diiterasi,
+    sehingga `documents` boleh berupa generator.
+
+    Args:
+        documents (iterable): Dokumen berupa dict dengan kunci 'doc_id' dan 'text'.
+        path (str): Path file tujuan.
+
+    Returns:
+        int: Jumlah dokumen yang ditulis.
+    """
+    count = 0
+    with open(path, "w", encoding="utf-8") as f:
+        for doc in documents:
+            f.write(json.dumps(doc, ensure_ascii=False))
+            f.write("\n")
+            count += 1
+    return count
+
+
+def iter_documents(path):
+    """
+    Membaca dokumen dari file koleksi satu per satu.
+    File JSONL dibaca baris demi baris; file JSON lama harus dimuat utuh terlebih dahulu.
+
+    Args:
+        path (str): Path file JSON atau JSONL.
+
+    Yields:
+        dict: Dokumen dengan kunci 'doc_id' dan 'text'.
+    """
+    if path.endswith(JSONL_SUFFIX):
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            docs = json.load(f)
+        yield from docs
+
+
+def iter_texts(path):
+    # Teks setiap dokumen di file koleksi, secara streaming (lihat `iter_documents`).
+    return (doc["text"] for doc in iter_documents(path))
+
+
+class DocumentStore:
+    """
+    Koleksi dokumen di memori, dimuat dari file JSON. Hanya menyimpan satu salinan teks
+    dan daftar doc_id (urutannya sama dengan indeks dokumen di index).
+
+    Args:
+        documents (iterable): Dokumen berupa dict dengan kunci 'doc_id' dan 'text'.
+    """
+    def __init__(self, documents):
+        self.doc_ids = []
+        self._texts = []
+        for doc in documents:
+            self.doc_ids.append(doc["doc_id"])
+            self._texts.append(doc["text"])
+
+    def __len__(self):
+        return len(self.doc_ids)
+
+    def text(self, doc_idx):
+        # Teks asli dokumen ke-`doc_idx`.
+        return self._texts[doc_idx]
+
+    def iter_texts(self):
+        # Teks seluruh dokumen sesuai urutan indeks dokumen.
+        return iter(self._texts)
+
+
+class JsonlDocumentStore:
+    """
+    Koleksi dokumen yang dibaca langsung dari file JSONL.
+    Saat dibuka, file dipindai sekali untuk mencatat doc_id dan posisi byte awal setiap
+    baris; teks dokumen tidak disimpan di memori dan dibaca dari file saat dibutuhkan.
+
+    Args:
+        path (str): Path file JSONL.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.doc_ids = []
+        # Posisi byte awal baris setiap dokumen di file.
+        self.offsets = array("Q")
+        with open(path, "rb") as f:
+            offset = 0
+            for line in f:
+                if line.strip():
+                    self.doc_ids.append(json.loads(line)["doc_id"])
+                    self.offsets.append(offset)
+                offset += len(line)
+        self._file = open(path, "rb")
+        # Satu file handle dipakai bersama; seek + readline harus atomik antar thread.
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.doc_ids)
+
+    def text(self, doc_idx):
+        """
+        Membaca teks asli sebuah dokumen dari file.
+
+        Args:
+            doc_idx (int): Indeks dokumen.
+
+        Returns:
+            str: Teks dokumen.
+        """
+        with self._lock:
+            self._file.seek(self.offsets[doc_idx])
+            line = self._file.readline()
+        return json.loads(line)["text"]
+
+    def iter_texts(self):
+        # Teks seluruh dokumen secara streaming, sesuai urutan indeks dokumen.
+        return iter_texts(self.path)
+
+    def close(self):
+        self._file.close()
+
+
+def open_documents(path):
+    """
+    Membuka file koleksi dokumen: JSONL dibaca secara lazy dari file, JSON dimuat ke memori.
+
+    Args:
+        path (str): Path file JSON atau JSONL.
+
+    Returns:
+        DocumentStore or JsonlDocumentStore: Koleksi dengan `doc_ids`, `text(doc_idx)`,
+            dan `iter_texts()`.
+    """
+    if path.endswith(JSONL_SUFFIX):
+        return JsonlDocumentStore(path)
+    return DocumentStore(iter_documents(path))
@@ -1,3 +1,20 @@
+# Evaluasi efektivitas pencarian.
+# `precision_recall_f1` menilai satu daftar hasil pada satu cutoff. `evaluate_run` menilai
+# peringkat semua query (satu daftar sedalam K per query) sekaligus: P@k, R@k, nDCG@k untuk
+# banyak cutoff, serta MAP dan MRR, dihitung dalam satu lintasan atas setiap peringkat.
+# Peringkat per query bisa disimpan dan dibaca ulang sebagai run file format TREC, sehingga
+# laporan dengan cutoff/metrik lain tidak memerlukan pencarian ulang.
+import math
+
+try:
+    import numpy as np
+except ImportError:  # NumPy bersifat opsional; agregasi jatuh ke implementasi Python murni.
+    np = None
+
+# Cutoff default untuk P@k, R@k, dan nDCG@k.
+DEFAULT_CUTOFFS = (1, 5, 10, 20, 50, 100)
+
+
 def precision_recall_f1(predicted, relevant):
     """
     Menghitung metrik evaluasi Precision, Recall, dan F1-Score.
@@ -39,3 +56,190 @@ def precision_recall_f1(predicted, relevant):
     
     # Mengembalikan ketiga nilai metrik.
     return precision, recall, f1
+
+
+def metric_names(cutoffs=DEFAULT_CUTOFFS):
+    """
+    Nama metrik yang dihasilkan `evaluate_run`, sesuai urutan kolomnya.
+
+    Args:
+        cutoffs (tuple): Cutoff untuk P@k, R@k, dan nDCG@k.
+
+    Returns:
+        list: Misalnya ['P@5', 'P@10', 'R@5', 'R@10', 'nDCG@5', 'nDCG@10', 'MAP', 'MRR'].
+    """
+    names = [f"{prefix}@{k}" for prefix in ("P", "R", "nDCG") for k in cutoffs]
+    return names + ["MAP", "MRR"]
+
+
+def _doc_id(entry):
+    # Entri peringkat boleh berupa ID dokumen atau pasangan (ID dokumen, skor).
+    return entry[0] if isinstance(entry, tuple) else entry
+
+
+def _relevance(ranking, relevant):
+    # Daftar 0/1 (relevan atau tidak) untuk satu peringkat. ID dokumen yang sudah muncul di
+    # peringkat dilewati, seperti trec_eval, agar duplikat tidak dihitung relevan berkali-kali.
+    seen = set()
+    rel = []
+    for entry in ranking:
+        doc_id = _doc_id(entry)
+        if doc_id not in seen:
+            seen.add(doc_id)
+            rel.append(1 if doc_id in relevant else 0)
+    return rel
+
+
+def _evaluate_ranking(rel, num_relevant, cutoffs, discounts, ideal):
+    # Menilai satu peringkat (daftar 0/1 relevan) dalam satu lintasan: jumlah dokumen relevan
+    # dan DCG kumulatif per posisi, average precision, dan reciprocal rank.
+    hits = 0
+    dcg = 0.0
+    precision_sum = 0.0
+    reciprocal_rank = 0.0
+    cum_hits = [0]
+    cum_dcg = [0.0]
+    for rank, is_relevant in enumerate(rel, start=1):
+        if is_relevant:
+            hits += 1
+            dcg += discounts[rank - 1]
+            precision_sum += hits / rank
+            if not reciprocal_rank:
+                reciprocal_rank = 1 / rank
+        cum_hits.append(hits)
+        cum_dcg.append(dcg)
+
+    depth = len(rel)
+    precision, recall, ndcg = [], [], []
+    for k in cutoffs:
+        # Peringkat yang lebih pendek dari k dianggap diisi dokumen tidak relevan.
+        found = cum_hits[min(k, depth)]
+        precision.append(found / k)
+        recall.append(found / num_relevant if num_relevant else 0.0)
+        ndcg.append(cum_dcg[min(k, depth)] / ideal[min(k, num_relevant)] if num_relevant else 0.0)
+    average_precision = precision_sum / num_relevant if num_relevant else 0.0
+    return precision + recall + ndcg + [average_precision, reciprocal_rank]
+
+
+def _evaluate_matrix(rel, num_relevant, cutoffs, discounts, ideal):
+    # Versi NumPy dari `_evaluate_ranking` untuk semua query sekaligus.
+    # rel: matriks (query x kedalaman) 0/1; num_relevant: jumlah dokumen relevan per query.
+    depth = rel.shape[1]
+    ranks = np.arange(1, depth + 1)
+    hits = np.concatenate([np.zeros((rel.shape[0], 1)), rel.cumsum(axis=1)], axis=1)
+    dcg = np.concatenate([np.zeros((rel.shape[0], 1)), (rel * discounts[:depth]).cumsum(axis=1)], axis=1)
+    ks = np.array(cutoffs)
+    found = hits[:, np.minimum(ks, depth)]
+    has_relevant = num_relevant > 0
+    denominator = np.where(has_relevant, num_relevant, 1)[:, None]
+    precision = found / ks
+    recall = np.where(has_relevant[:, None], found / denominator, 0.0)
+    ideal_dcg = np.asarray(ideal)[np.minimum(ks[None, :], num_relevant[:, None])]
+    ndcg = np.where(has_relevant[:, None], dcg[:, np.minimum(ks, depth)] / np.where(ideal_dcg > 0, ideal_dcg, 1), 0.0)
+    average_precision = np.where(has_relevant, (rel * hits[:, 1:] / ranks).sum(axis=1) / denominator[:, 0], 0.0)
+    any_relevant = rel.any(axis=1)
+    reciprocal_rank = np.where(any_relevant, 1 / (rel.argmax(axis=1) + 1), 0.0)
+    return np.column_stack([precision, recall, ndcg, average_precision, reciprocal_rank])
+
+
+def evaluate_run(run, qrels, cutoffs=DEFAULT_CUTOFFS, backend=None):
+    """
+    Menghitung P@k, R@k, nDCG@k (untuk setiap cutoff), MAP, dan MRR dari satu run.
+
+    Setiap query cukup dicari sekali sedalam K (misalnya `search_many(queries, top_k=100)`);
+    semua cutoff dihitung dari peringkat yang sama. Relevansi bersifat biner (ground truth
+    berupa daftar dokumen relevan). P@k dibagi k walaupun peringkat lebih pendek dari k, dan
+    query tanpa dokumen relevan bernilai 0 untuk metrik berbasis recall, seperti trec_eval.
+    Dokumen yang muncul lebih dari sekali di satu peringkat hanya dihitung pada posisi pertamanya.
+
+    Args:
+        run (dict): ID query -> peringkat (daftar ID dokumen, atau pasangan (ID dokumen, skor)).
+        qrels (dict): ID query -> daftar ID dokumen relevan. Query yang tidak ada di `run`
+            dinilai dengan peringkat kosong.
+        cutoffs (tuple): Cutoff untuk P@k, R@k, dan nDCG@k.
+        backend (str, optional): 'numpy' atau 'python'. Default: 'numpy' jika terinstal.
+
+    Returns:
+        tuple: (rata-rata per metrik {nama: nilai}, nilai per query {ID query: {nama: nilai}}).
+    """
+    cutoffs = tuple(cutoffs)
+    if not cutoffs or min(cutoffs) < 1:
+        raise ValueError(f"Cutoff harus bilangan bulat positif, bukan {cutoffs!r}")
+    if backend is None:
+        backend = "numpy" if np is not None else "python"
+    elif backend == "numpy" and np is None:
+        raise ImportError("Backend 'numpy' membutuhkan paket numpy yang belum terinstal.")
+    names = metric_names(cutoffs)
+
+    # 1. Ubah setiap peringkat menjadi daftar 0/1 (relevan atau tidak) dalam satu lintasan.
+    qids = list(qrels)
+    relevance, num_relevant = [], []
+    for qid in qids:
+        relevant = set(qrels[qid])
+        relevance.append(_relevance(run.get(qid, ()), relevant))
+        num_relevant.append(len(relevant))
+
+    # 2. Diskon DCG per posisi dan DCG ideal untuk n dokumen relevan teratas.
+    depth = max([len(rel) for rel in relevance] + [max(cutoffs)])
+    discounts = [1 / math.log2(rank + 1) for rank in range(1, depth + 1)]
+    ideal = [0.0]
+    for discount in discounts:
+        ideal.append(ideal[-1] + discount)
+
+    # 3. Hitung metrik per query lalu rata-ratakan per kolom.
+    if not qids:
+        return dict.fromkeys(names, 0.0), {}
+    if backend == "numpy":
+        matrix = np.zeros((len(qids), depth))
+        for row, rel in zip(matrix, relevance):
+            row[:len(rel)] = rel
+        values = _evaluate_matrix(matrix, np.array(num_relevant), cutoffs, np.array(discounts), ideal)
+        means = values.mean(axis=0).tolist()
+        values = values.tolist()
+    else:
+        values = [_evaluate_ranking(rel, n, cutoffs, discounts, ideal)
+                  for rel, n in zip(relevance, num_relevant)]
+        means = [sum(column) / len(values) for column in zip(*values)]
+    per_query = {qid: dict(zip(names, row)) for qid, row in zip(qids, values)}
+    return dict(zip(names, means)), per_query
+
+
+def write_trec_run(run, path, tag="mini-search"):
+    """
+    Menyimpan run ke file format TREC: `qid Q0 doc_id rank score tag` per baris.
+
+    Args:
+        run (dict): ID query -> daftar pasangan (ID dokumen, skor), terurut dari peringkat teratas.
+        path (str): Lokasi file run.
+        tag (str): Nama run (kolom terakhir).
+    """
+    with open(path, "w", encoding="utf-8") as f:
+        for qid, ranking in run.items():
+            for rank, (doc_id, score) in enumerate(ranking, start=1):
+                if any(" " in str(field) or not str(field) for field in (qid, doc_id)):
+                    raise ValueError(f"ID query/dokumen tidak boleh kosong atau mengandung spasi: {qid!r}, {doc_id!r}")
+                f.write(f"{qid} Q0 {doc_id} {rank} {float(score)!r} {tag}\n")
+
+
+def read_trec_run(path):
+    """
+    Membaca run file format TREC.
+
+    Args:
+        path (str): Lokasi file run.
+
+    Returns:
+        dict: ID query -> daftar pasangan (ID dokumen, skor), terurut menurut kolom rank.
+    """
+    entries = {}
+    with open(path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, start=1):
+            fields = line.split()
+            if not fields:
+                continue
+            if len(fields) != 6:
+                raise ValueError(f"{path}:{line_number}: baris run TREC harus berisi 6 kolom.")
+            qid, _, doc_id, rank, score, _ = fields
+            entries.setdefault(qid, []).append((int(rank), doc_id, float(score)))
+    return {qid: [(doc_id, score) for _, doc_id, score in sorted(ranking, key=lambda e: e[0])]
+            for qid, ranking in entries.items()}
@@ -0,0 +1,85 @@
+from array import array # Array bertipe untuk menyimpan postings secara ringkas
+
+# Typecode array untuk setiap lebar bit kuantisasi. None berarti float64 tanpa kuantisasi.
+IMPACT_TYPECODES = {None: "d", 8: "B", 16: "H"}
+
+
+class ImpactIndex:
+    """
+    Index impact-scored untuk BM25: setiap posting menyimpan kontribusi BM25 final
+    (idf x bobot tf ternormalisasi) yang sudah dihitung saat indexing, sehingga evaluasi
+    kueri hanya berupa penjumlahan.
+
+    Jika `bits` diisi 8 atau 16, kontribusi dikuantisasi secara linear ke bilangan bulat
+    [0, 2^bits - 1] dengan satu skala global. Skor dokumen dijumlahkan sebagai bilangan
+    bulat lalu dikalikan skala di akhir.
+
+    Args:
+        engine (BM25Engine): Engine sumber (menentukan k, b, dan statistik korpus).
+        bits (int, optional): Lebar bit kuantisasi (8 atau 16). None berarti float64 tanpa kuantisasi.
+    """
+    def __init__(self, engine, bits=None):
+        if bits not in IMPACT_TYPECODES:
+            raise ValueError(f"Lebar bit impact tidak didukung: {bits!r}. Pilihan: None, 8, 16")
+        self.bits = bits
+        self.postings = {}
+
+        # 1. Hitung kontribusi BM25 final untuk setiap posting.
+        k, b = engine.k, engine.b
+        doc_lens, avg_doc_len = engine.doc_lens, engine.avg_doc_len
+        contributions = {}
+        for term in engine.doc_freqs:
+            # Dokumen yang sudah dihapus (tombstone) tidak disimpan.
+            postings = engine.index.live_postings(term)
+            idf = engine.idf(term)
+            contributions[term] = (
+                array("I", (doc_idx for doc_idx, _ in postings)),
+                [idf * ((tf * (k + 1)) / (tf + k * (1 - b + b * doc_lens[doc_idx] / avg_doc_len)))
+                 for doc_idx, tf in postings],
+            )
+
+        # 2. Simpan sebagai float64 atau kuantisasi ke 8/16 bit dengan skala global.
+        if bits is None:
+            self.scale = 1.0
+        else:
+            max_impact = max((max(values) for _, values in contributions.values() if values), default=0)
+            levels = (1 << bits) - 1
+            self.scale = max_impact / levels if max_impact > 0 else 1.0
+        typecode = IMPACT_TYPECODES[bits]
+        for term, (doc_ids, values) in contributions.items():
+            if bits is not None:
+                # Kontribusi positif tidak dibulatkan menjadi 0 agar dokumen tetap tercatat cocok.
+                values = (max(1, round(value / self.scale)) for value in values)
+            self.postings[term] = (doc_ids, array(typecode, values))
+
+    def accumulate(self, query_tokens):
+        """
+        Menjumlahkan impact setiap token kueri untuk dokumen yang mengandungnya.
+
+        Args:
+            query_tokens (list): Daftar token dari kueri yang sudah diproses.
+
+        Returns:
+            dict: Pemetaan doc_idx -> skor (sudah dikalikan skala jika terkuantisasi).
+        """
+        scores = {}
+        for term in query_tokens:
+            entry = self.postings.get(term)
+            if entry is None:
+                continue
+            for doc_idx, impact in zip(*entry):
+                scores[doc_idx] = scores.get(doc_idx, 0) + impact
+        if self.bits is not None:
+            scale = self.scale
+            scores = {doc_idx: total * scale for doc_idx, total in scores.items()}
+        return scores
+
+    def nbytes(self):
+        """
+        Menghitung ukuran buffer postings (ID dokumen + impact) dalam byte.
+
+        Returns:
+            int: Total byte yang dipakai array postings.
+        """
+        return sum(len(doc_ids) * doc_ids.itemsize + len(values) * values.itemsize
+                   for doc_ids, values in self.postings.values())
@@ -0,0 +1,461 @@
+from .preprocessing import preprocess_with_offsets # Preprocessing yang juga mencatat posisi token di teks asli
+from array import array # Array bertipe untuk menyimpan posisi token secara ringkas
+from collections import defaultdict, deque # Mengimpor struktur data
+from concurrent.futures import ProcessPoolExecutor # Untuk membangun index secara paralel
+from itertools import islice # Untuk memotong aliran dokumen menjadi chunk
+from functools import partial # Factory postings terkompresi dengan ukuran blok tertentu
+from bisect import bisect_left # Binary search term_id di forward index
+from .compression import CompressedPostings, BLOCK_SIZE # Postings terkompresi (delta + variable-byte)
+
+# Jumlah dokumen per chunk jika jumlah dokumen tidak diketahui (misalnya input berupa generator).
+DEFAULT_CHUNK_SIZE = 256
+
+
+def _analyze_doc(doc):
+    """
+    Memproses satu dokumen: token, TF, posisi setiap term, dan asal setiap token di teks asli.
+
+    Args:
+        doc (str): Teks dokumen.
+
+    Returns:
+        tuple: (panjang dokumen dalam token, dict term -> array posisi token (TF = jumlah posisi),
+            array indeks kata asal setiap token, array posisi karakter awal setiap token).
+    """
+    tokens, word_offsets, char_offsets = preprocess_with_offsets(doc)
+    positions = {}
+    for position, term in enumerate(tokens):
+        positions.setdefault(term, []).append(position)
+    positions = {term: array("I", term_positions) for term, term_positions in positions.items()}
+    return len(tokens), positions, array("I", word_offsets), array("I", char_offsets)
+
+
+def _analyze_chunk(raw_docs):
+    """
+    Memproses satu potongan (chunk) koleksi: tokenisasi, TF per dokumen, posisi token, dan DF parsial.
+    Fungsi ini berada di level modul agar bisa dijalankan di proses worker.
+
+    Args:
+        raw_docs (list): Daftar teks dokumen dalam satu chunk.
+
+    Returns:
+        tuple: (daftar hasil `_analyze_doc` per dokumen, dict DF parsial).
+    """
+    analyzed = [_analyze_doc(doc) for doc in raw_docs]
+    doc_freqs = defaultdict(int)
+    for _, positions, _, _ in analyzed:
+        for term in positions:
+            doc_freqs[term] += 1
+    return analyzed, dict(doc_freqs)
+
+
+def _iter_chunks(raw_docs, chunk_size):
+    # Memotong aliran dokumen menjadi list berukuran `chunk_size` tanpa memuat semuanya sekaligus.
+    docs = iter(raw_docs)
+    while True:
+        chunk = list(islice(docs, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _analyze_stream(raw_docs, workers, chunk_size):
+    """
+    Memproses aliran dokumen per chunk dan menghasilkan hasil `_analyze_chunk` sesuai urutan dokumen.
+    Jika workers > 1, chunk diproses di ProcessPoolExecutor dengan jumlah chunk yang sedang
+    diproses dibatasi, sehingga hanya sebagian kecil teks mentah yang berada di memori.
+
+    Args:
+        raw_docs (iterable): Teks dokumen (boleh berupa generator).
+        workers (int): Jumlah proses.
+        chunk_size (int): Jumlah dokumen per chunk.
+
+    Yields:
+        tuple: Hasil `_analyze_chunk` untuk setiap chunk.
+    """
+    chunks = _iter_chunks(raw_docs, chunk_size)
+    if workers <= 1:
+        for chunk in chunks:
+            yield _analyze_chunk(chunk)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(_analyze_chunk, chunk))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+class ForwardIndex:
+    """
+    Forward index ringkas: term di-intern menjadi term_id sekali, lalu pasangan (term_id, tf)
+    setiap dokumen disimpan berurutan dalam array datar, terurut berdasarkan term_id dalam
+    satu dokumen. Posisi token setiap entri disimpan sejajar di array lain. Memori per dokumen
+    hanya beberapa byte per term unik, bukan satu dict (Counter) per dokumen.
+
+    `forward[doc_idx]` menghasilkan DocTermsView yang berperilaku seperti dict {term: tf}.
+    Array bisa berupa `array` di memori maupun seksi mmap (lihat `storage.open_index`).
+
+    Args:
+        vocab (list): Term untuk setiap term_id.
+        term_ids (dict, optional): Pemetaan term -> term_id. Default: dibangun dari `vocab`.
+        fwd_offsets (sequence): Entri awal setiap dokumen ditambah satu entri akhir.
+        fwd_terms (sequence): term_id setiap entri.
+        fwd_tfs (sequence): TF setiap entri.
+        pos_offsets (sequence): Posisi awal setiap entri di `positions` ditambah satu entri akhir.
+        positions (sequence): Posisi token semua entri, disambung.
+    """
+    def __init__(self, vocab=None, term_ids=None, fwd_offsets=None, fwd_terms=None, fwd_tfs=None,
+                 pos_offsets=None, positions=None):
+        self.vocab = [] if vocab is None else vocab
+        self.term_ids = {term: term_id for term_id, term in enumerate(self.vocab)} if term_ids is None else term_ids
+        self.fwd_offsets = array("Q", [0]) if fwd_offsets is None else fwd_offsets
+        self.fwd_terms = array("I") if fwd_terms is None else fwd_terms
+        self.fwd_tfs = array("I") if fwd_tfs is None else fwd_tfs
+        self.pos_offsets = array("Q", [0]) if pos_offsets is None else pos_offsets
+        self.positions = array("I") if positions is None else positions
+
+    def intern(self, term):
+        # term_id untuk `term`; term baru mendapat id berikutnya.
+        term_id = self.term_ids.get(term)
+        if term_id is None:
+            term_id = self.term_ids[term] = len(self.vocab)
+            self.vocab.append(term)
+        return term_id
+
+    def append(self, doc_positions):
+        """
+        Menambahkan satu dokumen di akhir forward index.
+
+        Args:
+            doc_positions (dict): Pemetaan term -> array posisi token (hasil `_analyze_doc`).
+        """
+        entries = sorted((self.intern(term), term_positions) for term, term_positions in doc_positions.items())
+        for term_id, term_positions in entries:
+            self.fwd_terms.append(term_id)
+            self.fwd_tfs.append(len(term_positions))
+            self.positions.extend(term_positions)
+            self.pos_offsets.append(len(self.positions))
+        self.fwd_offsets.append(len(self.fwd_terms))
+
+    def copy(self):
+        # Salinan yang bisa diubah (array di memori), misalnya dari forward index di mmap.
+        return ForwardIndex(list(self.vocab), dict(self.term_ids),
+                            array("Q", self.fwd_offsets), array("I", self.fwd_terms), array("I", self.fwd_tfs),
+                            array("Q", self.pos_offsets), array("I", self.positions))
+
+    @property
+    def nbytes(self):
+        # Ukuran semua array per dokumen (byte), tanpa vocabulary.
+        return sum(len(values) * values.itemsize for values in
+                   (self.fwd_offsets, self.fwd_terms, self.fwd_tfs, self.pos_offsets, self.positions))
+
+    def __len__(self):
+        return len(self.fwd_offsets) - 1
+
+    def __getitem__(self, doc_idx):
+        return DocTermsView(self, self.fwd_offsets[doc_idx], self.fwd_offsets[doc_idx + 1])
+
+    def __iter__(self):
+        return (self[doc_idx] for doc_idx in range(len(self)))
+
+
+class DocTermsView:
+    """
+    Tampilan satu dokumen di ForwardIndex, berperilaku seperti dict {term: tf}.
+    Entri dokumen terurut berdasarkan term_id, sehingga sebuah term dicari dengan
+    binary search tanpa membangun dict.
+    """
+    __slots__ = ("forward", "start", "end")
+
+    def __init__(self, forward, start, end):
+        self.forward = forward
+        self.start = start
+        self.end = end
+
+    def _entry(self, term):
+        # Indeks entri forward index untuk `term`, atau None jika term tidak ada di dokumen.
+        term_id = self.forward.term_ids.get(term)
+        if term_id is None:
+            return None
+        fwd_terms = self.forward.fwd_terms
+        entry = bisect_left(fwd_terms, term_id, self.start, self.end)
+        return entry if entry < self.end and fwd_terms[entry] == term_id else None
+
+    def _value(self, entry):
+        return self.forward.fwd_tfs[entry]
+
+    def __len__(self):
+        return self.end - self.start
+
+    def __iter__(self):
+        vocab, fwd_terms = self.forward.vocab, self.forward.fwd_terms
+        return (vocab[fwd_terms[entry]] for entry in range(self.start, self.end))
+
+    def __contains__(self, term):
+        return self._entry(term) is not None
+
+    def __getitem__(self, term):
+        entry = self._entry(term)
+        if entry is None:
+            raise KeyError(term)
+        return self._value(entry)
+
+    def get(self, term, default=None):
+        entry = self._entry(term)
+        return default if entry is None else self._value(entry)
+
+    def items(self):
+        vocab, fwd_terms = self.forward.vocab, self.forward.fwd_terms
+        return ((vocab[fwd_terms[entry]], self._value(entry)) for entry in range(self.start, self.end))
+
+
+class DocPositionsView(DocTermsView):
+    # Seperti DocTermsView, tetapi nilainya adalah posisi token term di dokumen.
+    __slots__ = ()
+
+    def _value(self, entry):
+        pos_offsets = self.forward.pos_offsets
+        return self.forward.positions[pos_offsets[entry]:pos_offsets[entry + 1]]
+
+
+class PositionsView:
+    """
+    Index posisional di atas ForwardIndex. `view[doc_idx]` menghasilkan DocPositionsView
+    yang berperilaku seperti dict {term: posisi token}.
+    """
+    def __init__(self, forward):
+        self.forward = forward
+
+    def __len__(self):
+        return len(self.forward)
+
+    def __getitem__(self, doc_idx):
+        forward = self.forward
+        return DocPositionsView(forward, forward.fwd_offsets[doc_idx], forward.fwd_offsets[doc_idx + 1])
+
+
+class CorpusIndex:
+    """
+    Index korpus bersama yang dibangun sekali dan dipakai oleh VSMEngine maupun BM25Engine.
+    Menyimpan Term Frequency (TF) per dokumen dalam forward index ringkas (lihat ForwardIndex),
+    Document Frequency (DF), panjang dokumen, inverted index (postings), serta index posisional: posisi setiap term
+    di dokumen dan asal setiap token (indeks kata dan posisi karakter) di teks asli.
+
+    Args:
+        raw_docs (iterable): Teks setiap dokumen. Boleh berupa generator (misalnya dari
+            `documents.iter_texts`); dokumen diproses secara streaming per chunk sehingga
+            seluruh teks mentah tidak pernah berada di memori sekaligus.
+        workers (int): Jumlah proses untuk membangun index. 1 (default) berarti serial.
+        chunk_size (int, optional): Jumlah dokumen per chunk.
+        compress (bool): Jika True, postings langsung disimpan terkompresi (lihat `compress`).
+    """
+    def __init__(self, raw_docs, workers=1, chunk_size=None, compress=False):
+        # 1. Tokenisasi dan perhitungan TF/DF per chunk. Jika workers > 1, chunk diproses
+        # di ProcessPoolExecutor lalu statistik parsialnya digabungkan sesuai urutan dokumen,
+        # sehingga hasilnya identik dengan pembangunan serial.
+        if hasattr(raw_docs, "__len__") and len(raw_docs) <= 1:
+            workers = 1
+        if chunk_size is None:
+            if workers > 1 and hasattr(raw_docs, "__len__"):
+                chunk_size = max(1, -(-len(raw_docs) // (workers * 4)))
+            else:
+                chunk_size = DEFAULT_CHUNK_SIZE
+        parts = _analyze_stream(raw_docs, workers, chunk_size)
+
+        # 2. Inisialisasi struktur data untuk statistik korpus.
+        # df: Document Frequency -> Berapa banyak dokumen yang mengandung sebuah term.
+        self.doc_freqs = defaultdict(int)
+        # tf: Term Frequency -> forward index ringkas (term_id, tf) per dokumen; `term_freqs[doc_idx]`
+        # berperilaku seperti dict {term: tf}. Token hasil preprocessing tidak disimpan.
+        self.term_freqs = ForwardIndex()
+        # Panjang setiap dokumen (jumlah token setelah preprocessing).
+        self.doc_lens = []
+        # Inverted index: term -> daftar posting (doc_idx, tf), terurut berdasarkan doc_idx.
+        # Dengan `compress`, setiap daftar berupa CompressedPostings yang diisi secara streaming.
+        self.postings = defaultdict(CompressedPostings if compress else list)
+        # Index posisional per dokumen: term -> array posisi token (urutan token setelah preprocessing),
+        # disimpan sejajar dengan entri forward index.
+        self.positions = PositionsView(self.term_freqs)
+        # Asal setiap token di teks asli: indeks kata (dipisah spasi) dan posisi karakter awal kata.
+        self.word_offsets = []
+        self.char_offsets = []
+
+        # Statistik turunan yang sudah dihitung sebelumnya (misalnya IDF dan norma VSM
+        # dari index yang dibuka dari disk). Kosong untuk index yang dibangun di memori.
+        self.precomputed = {}
+
+        # 3. Menggabungkan hasil setiap chunk begitu selesai diproses: df dijumlahkan, tf dan
+        # postings disambung dengan indeks dokumen global. Hasil analisis per dokumen (dict posisi)
+        # langsung dibuang setelah dimasukkan ke array forward index.
+        for analyzed, doc_freqs in parts:
+            for term, df in doc_freqs.items():
+                self.doc_freqs[term] += df
+            for doc_len, positions, word_offsets, char_offsets in analyzed:
+                doc_idx = len(self.doc_lens)
+                self.doc_lens.append(doc_len)
+                self.term_freqs.append(positions)
+                self.word_offsets.append(word_offsets)
+                self.char_offsets.append(char_offsets)
+                for term, term_positions in positions.items():
+                    self.postings[term].append((doc_idx, len(term_positions)))
+
+        # 4. Menyimpan jumlah total dokumen dalam koleksi.
+        self.N = len(self.doc_lens)
+        # 5. Menghitung panjang rata-rata dari semua dokumen dalam koleksi.
+        self.total_len = sum(self.doc_lens)
+        self.avg_doc_len = self.total_len / self.N if self.N else 0
+
+        # Tombstone: indeks dokumen yang sudah dihapus. Posting-nya tetap ada di postings
+        # tetapi dilewati saat pencarian; indeks dokumen lain tidak bergeser.
+        self.deleted = set()
+        # Generasi index, naik setiap kali koleksi berubah. Engine memakai nilai ini
+        # untuk menyegarkan statistik turunan (IDF, bobot, cache) secara lazy.
+        self.generation = 0
+
+    @property
+    def num_slots(self):
+        # Jumlah slot indeks dokumen, termasuk dokumen yang sudah dihapus (tombstone).
+        return len(self.doc_lens)
+
+    def compress(self, block_size=BLOCK_SIZE):
+        """
+        Mengompresi postings: selisih doc_idx dan tf disimpan sebagai variable-byte per blok
+        dengan skip pointer. Engine tetap bekerja tanpa perubahan, karena postings terkompresi
+        berperilaku seperti daftar (doc_idx, tf), dengan memori jauh lebih kecil.
+
+        Args:
+            block_size (int): Jumlah posting per blok.
+        """
+        self.postings = defaultdict(partial(CompressedPostings, block_size=block_size), {term: CompressedPostings(postings, block_size)
+                                              for term, postings in self.postings.items()})
+
+    def live_postings(self, term):
+        """
+        Mengembalikan postings sebuah term tanpa dokumen yang sudah dihapus.
+
+        Args:
+            term (str): Term yang dicari.
+
+        Returns:
+            list: Daftar (doc_idx, tf) untuk dokumen yang masih aktif.
+        """
+        postings = self.postings.get(term, ())
+        if not self.deleted:
+            return postings
+        deleted = self.deleted
+        return [(doc_idx, tf) for doc_idx, tf in postings if doc_idx not in deleted]
+
+    def term_positions(self, doc_idx, term):
+        """
+        Mengembalikan posisi token sebuah term di sebuah dokumen.
+
+        Args:
+            doc_idx (int): Indeks dokumen.
+            term (str): Term hasil preprocessing.
+
+        Returns:
+            array: Posisi token (terurut naik); kosong jika term tidak ada di dokumen.
+        """
+        return self.positions[doc_idx].get(term, ())
+
+    def drop_deleted(self, doc_scores):
+        """
+        Membuang dokumen yang sudah dihapus (tombstone) dari akumulator skor.
+
+        Args:
+            doc_scores (dict): Pemetaan doc_idx -> skor.
+
+        Returns:
+            dict: Akumulator yang sama tanpa dokumen terhapus.
+        """
+        if self.deleted:
+            if len(self.deleted) < len(doc_scores):
+                for doc_idx in self.deleted:
+                    doc_scores.pop(doc_idx, None)
+            else:
+                for doc_idx in [d for d in doc_scores if d in self.deleted]:
+                    del doc_scores[doc_idx]
+        return doc_scores
+
+    def _make_mutable(self):
+        """
+        Menyalin struktur read-only (misalnya index yang dibuka dari mmap) ke struktur di memori
+        agar index bisa diubah. Statistik turunan yang tersimpan dibuang karena akan usang.
+        """
+        if not isinstance(self.doc_lens, list):
+            self.doc_lens = list(self.doc_lens)
+            self.term_freqs = self.term_freqs.copy()
+            self.postings = defaultdict(list, {term: list(postings) for term, postings in self.postings.items()})
+            self.doc_freqs = defaultdict(int, self.doc_freqs)
+            self.positions = PositionsView(self.term_freqs)
+            self.word_offsets = [array("I", offsets) for offsets in self.word_offsets]
+            self.char_offsets = [array("I", offsets) for offsets in self.char_offsets]
+            self.total_len = sum(self.doc_lens[doc_idx] for doc_idx in range(len(self.doc_lens))
+                                 if doc_idx not in self.deleted)
+        self.precomputed = {}
+
+    def _update_stats(self):
+        # Memperbarui panjang rata-rata dokumen dan generasi setelah koleksi berubah.
+        self.avg_doc_len = self.total_len / self.N if self.N else 0
+        self.generation += 1
+
+    def add_documents(self, raw_docs):
+        """
+        Menambahkan dokumen baru ke index tanpa membangun ulang seluruh koleksi.
+        Biayanya sebanding dengan ukuran dokumen baru; engine yang memakai index ini
+        menyegarkan bobot turunannya (O(ukuran korpus)) saat pencarian berikutnya.
+
+        Args:
+            raw_docs (list): Daftar teks dokumen baru.
+
+        Returns:
+            list: Indeks dokumen yang diberikan untuk dokumen-dokumen baru.
+        """
+        self._make_mutable()
+        new_ids = []
+        for doc in raw_docs:
+            doc_len, positions, word_offsets, char_offsets = _analyze_doc(doc)
+            doc_idx = len(self.doc_lens)
+            self.term_freqs.append(positions)
+            self.word_offsets.append(word_offsets)
+            self.char_offsets.append(char_offsets)
+            self.doc_lens.append(doc_len)
+            self.total_len += doc_len
+            # Indeks dokumen baru selalu paling besar, sehingga postings tetap terurut.
+            for term, term_positions in positions.items():
+                self.doc_freqs[term] += 1
+                self.postings[term].append((doc_idx, len(term_positions)))
+            new_ids.append(doc_idx)
+        self.N += len(new_ids)
+        self._update_stats()
+        return new_ids
+
+    def delete_documents(self, doc_indices):
+        """
+        Menghapus dokumen dari index dengan tombstone. DF, N, dan panjang rata-rata
+        langsung diperbarui; posting dokumen tersebut dilewati saat pencarian.
+
+        Args:
+            doc_indices (list): Indeks dokumen yang akan dihapus.
+
+        Returns:
+            int: Jumlah dokumen yang benar-benar dihapus (yang belum terhapus sebelumnya).
+        """
+        self._make_mutable()
+        removed = 0
+        for doc_idx in doc_indices:
+            if doc_idx in self.deleted or not 0 <= doc_idx < len(self.doc_lens):
+                continue
+            self.deleted.add(doc_idx)
+            for term in self.term_freqs[doc_idx]:
+                self.doc_freqs[term] -= 1
+                if self.doc_freqs[term] == 0:
+                    del self.doc_freqs[term]
+            self.total_len -= self.doc_lens[doc_idx]
+            removed += 1
+        self.N -= removed
+        self._update_stats()
+        return removed
@@ -0,0 +1,83 @@
+# Instrumentasi opsional untuk jalur pencarian: waktu per tahap dan penghitung.
+# Sebuah Trace diberikan ke `engine.search(..., trace=trace)`, `QueryCache.search`, dan
+# `generate_snippet(..., trace=trace)`. Setiap tahap (parse, score, select, snippet, ...)
+# mencatat durasinya, dan penghitung mencatat jumlah term yang dicari, postings yang
+# ditelusuri, serta dokumen yang dinilai. Tanpa trace (default None), jalur pencarian
+# hanya melakukan pengecekan `trace is not None`, sehingga overhead-nya hampir nol.
+from time import perf_counter
+
+# Urutan tampilan tahap yang dikenal; tahap lain ditampilkan setelahnya.
+STAGES = ("cache", "parse", "match", "score", "select", "snippet")
+
+
+class Trace:
+    """
+    Catatan waktu per tahap dan penghitung untuk satu permintaan pencarian.
+
+    Waktu sebuah tahap adalah selisih antara `resume()` (atau `mark()` sebelumnya) dan
+    `mark(tahap)`, sehingga waktu di luar jalur yang diinstrumentasi (misalnya kode
+    antarmuka di antara pencarian dan pembuatan snippet) tidak ikut terhitung.
+    """
+    __slots__ = ("timings", "counters", "_last")
+
+    def __init__(self):
+        self.timings = {}
+        self.counters = {}
+        self._last = perf_counter()
+
+    def resume(self):
+        # Memulai pengukuran tahap berikutnya dari saat ini.
+        self._last = perf_counter()
+
+    def mark(self, stage):
+        # Menambahkan waktu sejak `resume()`/`mark()` terakhir ke tahap `stage`.
+        now = perf_counter()
+        self.timings[stage] = self.timings.get(stage, 0.0) + (now - self._last)
+        self._last = now
+
+    def count(self, name, value=1):
+        # Menambah penghitung `name` sebesar `value`.
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def record_lookup(self, postings, terms):
+        """
+        Mencatat term yang dicari di inverted index dan jumlah posting yang ditelusuri.
+
+        Args:
+            postings (dict): Inverted index (term atau term_idx -> daftar posting).
+            terms (iterable): Term yang ditelusuri (setiap kemunculan dihitung).
+        """
+        looked_up = 0
+        traversed = 0
+        for term in terms:
+            looked_up += 1
+            traversed += len(postings.get(term, ()))
+        self.count("terms", looked_up)
+        self.count("postings", traversed)
+
+    @property
+    def total(self):
+        # Total waktu seluruh tahap (detik).
+        return sum(self.timings.values())
+
+    def report(self):
+        """
+        Ringkasan trace yang bisa dikirim sebagai JSON.
+
+        Returns:
+            dict: 'timings_ms' (per tahap), 'total_ms', dan 'counters'.
+        """
+        order = [stage for stage in STAGES if stage in self.timings]
+        order += [stage for stage in self.timings if stage not in STAGES]
+        return {
+            "timings_ms": {stage: self.timings[stage] * 1000 for stage in order},
+            "total_ms": self.total * 1000,
+            "counters": dict(self.counters),
+        }
+
+    def format(self):
+        # Ringkasan satu baris, misalnya untuk result_log.txt.
+        report = self.report()
+        timings = ", ".join(f"{stage}={ms:.3f}ms" for stage, ms in report["timings_ms"].items())
+        counters = ", ".join(f"{name}={value}" for name, value in report["counters"].items())
+        return f"total={report['total_ms']:.3f}ms; {timings}; {counters}"
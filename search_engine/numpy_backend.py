@@ -0,0 +1,173 @@
+# Backend penilaian berbasis NumPy (opsional) untuk VSMEngine dan BM25Engine.
+# Setiap term disimpan sebagai dua array: ID dokumen dan kontribusi skornya.
+# Skor kueri dihitung dengan akumulator `np.add.at` tanpa loop Python per posting.
+try:
+    import numpy as np
+except ImportError:  # NumPy bersifat opsional; backend 'python' tetap bisa digunakan.
+    np = None
+
+BACKENDS = ("python", "numpy")
+# Batas jumlah sel (kueri x dokumen) matriks skor yang diproses sekaligus oleh `score_many`.
+BATCH_CELLS = 1 << 22
+
+
+def check_backend(backend):
+    """
+    Memvalidasi nama backend dan memastikan NumPy tersedia jika diperlukan.
+
+    Args:
+        backend (str): Nama backend ('python' atau 'numpy').
+
+    Raises:
+        ValueError: Jika nama backend tidak dikenal.
+        ImportError: Jika backend 'numpy' dipilih tetapi NumPy tidak terinstal.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Backend tidak dikenal: {backend!r}. Pilihan: {', '.join(BACKENDS)}")
+    if backend == "numpy" and np is None:
+        raise ImportError("Backend 'numpy' membutuhkan paket numpy yang belum terinstal.")
+
+
+class NumpyScorer:
+    """
+    Menyimpan array per-term berisi ID dokumen dan kontribusi skor yang sudah dihitung.
+
+    Args:
+        term_contributions (dict): Pemetaan term -> daftar (doc_idx, kontribusi).
+        n_docs (int): Jumlah dokumen dalam koleksi.
+    """
+    def __init__(self, term_contributions, n_docs):
+        self.n_docs = n_docs
+        self.doc_ids = {}
+        self.contributions = {}
+        for term, postings in term_contributions.items():
+            self.doc_ids[term] = np.fromiter((doc_idx for doc_idx, _ in postings), dtype=np.int64, count=len(postings))
+            self.contributions[term] = np.fromiter((value for _, value in postings), dtype=np.float64, count=len(postings))
+
+    def score(self, weighted_terms):
+        """
+        Menghitung skor seluruh dokumen untuk daftar term kueri berbobot.
+
+        Args:
+            weighted_terms (list): Daftar (term, bobot). Urutan daftar menentukan urutan akumulasi.
+
+        Returns:
+            numpy.ndarray: Skor untuk setiap dokumen.
+        """
+        scores = np.zeros(self.n_docs, dtype=np.float64)
+        for term, weight in weighted_terms:
+            doc_ids = self.doc_ids.get(term)
+            if doc_ids is None:
+                continue
+            contributions = self.contributions[term]
+            # Gather kontribusi term lalu akumulasikan ke skor dokumen yang bersangkutan.
+            np.add.at(scores, doc_ids, contributions if weight == 1 else weight * contributions)
+        return scores
+
+    def score_many(self, weighted_queries):
+        """
+        Menghitung skor seluruh dokumen untuk sekumpulan kueri sekaligus sebagai matriks
+        kueri x dokumen. Postings semua kueri dalam satu blok digabung lalu diakumulasikan
+        dengan satu panggilan `np.bincount`. Karena penjumlahan mengikuti urutan indeks,
+        urutan akumulasi per kueri tetap sama dengan `score`.
+
+        Args:
+            weighted_queries (list): Daftar kueri, masing-masing daftar (term, bobot) terurut
+                sesuai urutan akumulasi.
+
+        Yields:
+            numpy.ndarray: Matriks skor (kueri x dokumen) untuk setiap blok kueri, sesuai urutan input.
+        """
+        rows_per_block = max(1, BATCH_CELLS // max(1, self.n_docs))
+        for start in range(0, len(weighted_queries), rows_per_block):
+            block = weighted_queries[start:start + rows_per_block]
+            rows, weights, doc_ids, contributions = [], [], [], []
+            for row, weighted_terms in enumerate(block):
+                for term, weight in weighted_terms:
+                    term_doc_ids = self.doc_ids.get(term)
+                    if term_doc_ids is None:
+                        continue
+                    rows.append(row)
+                    weights.append(weight)
+                    doc_ids.append(term_doc_ids)
+                    contributions.append(self.contributions[term])
+            n_cells = len(block) * self.n_docs
+            if not doc_ids:
+                yield np.zeros((len(block), self.n_docs), dtype=np.float64)
+                continue
+            lengths = [len(ids) for ids in doc_ids]
+            values = np.concatenate(contributions)
+            if any(weight != 1 for weight in weights):
+                values = np.repeat(np.array(weights, dtype=np.float64), lengths) * values
+            # Indeks datar sel (kueri, dokumen). `np.bincount` menjumlahkan bobot sesuai urutan indeks,
+            # sama seperti `np.add.at`, tetapi jauh lebih cepat untuk array besar.
+            flat_ids = np.repeat(np.array(rows, dtype=np.int64) * self.n_docs, lengths) + np.concatenate(doc_ids)
+            yield np.bincount(flat_ids, weights=values, minlength=n_cells).reshape(len(block), self.n_docs)
+
+    @classmethod
+    def top_k_many(cls, scores, top_k, excluded=()):
+        """
+        Versi `top_k` untuk matriks skor (kueri x dokumen). Kandidat setiap baris dipilih
+        sekaligus dengan `np.argpartition` lalu diurutkan dengan `np.lexsort`. Baris yang
+        skor ke-k-nya seri dengan dokumen di luar kandidat diproses ulang dengan `top_k`
+        agar dokumen seri tetap dipilih berdasarkan indeks terkecil.
+
+        Args:
+            scores (numpy.ndarray): Matriks skor, satu baris per kueri.
+            top_k (int): Jumlah dokumen teratas yang dikembalikan per kueri.
+            excluded (set): Indeks dokumen yang tidak boleh muncul di hasil (misalnya tombstone).
+
+        Returns:
+            list: Daftar (doc_idx, skor) terurut untuk setiap baris.
+        """
+        n_rows, n_docs = scores.shape
+        top_k = min(top_k, n_docs - len(excluded))
+        if top_k <= 0 or n_rows == 0:
+            return [[] for _ in range(n_rows)]
+        if excluded:
+            scores = scores.copy()
+            scores[:, np.fromiter(excluded, dtype=np.int64, count=len(excluded))] = -np.inf
+        candidates = np.argpartition(-scores, top_k - 1, axis=1)[:, :top_k]
+        values = np.take_along_axis(scores, candidates, axis=1)
+        order = np.lexsort((candidates, -values), axis=1)
+        ranked = np.take_along_axis(candidates, order, axis=1)
+        values = np.take_along_axis(values, order, axis=1)
+        # Baris yang jumlah dokumen berskor >= skor ke-k melebihi k memiliki seri di batas top-k.
+        ambiguous = (scores >= values[:, -1:]).sum(axis=1) > top_k
+        results = []
+        for row, (ids, row_values) in enumerate(zip(ranked.tolist(), values.tolist())):
+            if ambiguous[row]:
+                results.append(cls.top_k(scores[row], top_k))
+            else:
+                results.append(list(zip(ids, row_values)))
+        return results
+
+    @staticmethod
+    def top_k(scores, top_k, excluded=()):
+        """
+        Memilih dokumen top-k dengan `np.partition` (O(N)) lalu mengurutkan k kandidat saja.
+        Skor seri diurutkan berdasarkan indeks dokumen, sama seperti pengurutan penuh yang stabil.
+
+        Args:
+            scores (numpy.ndarray): Skor untuk setiap dokumen.
+            top_k (int): Jumlah dokumen teratas yang dikembalikan.
+            excluded (set): Indeks dokumen yang tidak boleh muncul di hasil (misalnya tombstone).
+
+        Returns:
+            list: Daftar (doc_idx, skor) yang sudah terurut.
+        """
+        if excluded:
+            scores = scores.copy()
+            scores[np.fromiter(excluded, dtype=np.int64, count=len(excluded))] = -np.inf
+            top_k = min(top_k, len(scores) - len(excluded))
+        top_k = min(top_k, len(scores))
+        if top_k <= 0:
+            return []
+        # Nilai skor ke-k; semua dokumen di atasnya pasti masuk, sisanya diisi dokumen seri berindeks terkecil.
+        kth = -np.partition(-scores, top_k - 1)[top_k - 1]
+        above = np.flatnonzero(scores > kth)
+        ties = np.flatnonzero(scores == kth)[:top_k - len(above)]
+        candidates = np.concatenate([above, ties])
+        order = np.lexsort((candidates, -scores[candidates]))
+        ranked = candidates[order]
+        return list(zip(ranked.tolist(), scores[ranked].tolist()))
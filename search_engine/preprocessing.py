@@ -1,21 +1,107 @@
 # Mengimpor library yang diperlukan
 import re # 're' untuk operasi Regular Expression, digunakan untuk membersihkan teks.
-import nltk # 'nltk' (Natural Language Toolkit) adalah library utama untuk pemrosesan bahasa.
-from nltk.corpus import stopwords # Mengimpor daftar kata-kata umum (stopwords) dari NLTK.
-from nltk.stem import PorterStemmer # Mengimpor algoritma Porter Stemmer untuk mengubah kata ke bentuk dasarnya.
-
-# Persiapan Awal (dilakukan sekali saat program pertama kali dijalankan)
-# Mengunduh paket 'stopwords' dari NLTK jika belum terinstal di lingkungan Anda.
-# Ini berisi daftar stopwords untuk berbagai bahasa.
-nltk.download('stopwords')
+import hashlib # Untuk membuat sidik jari (fingerprint) pengaturan analyzer.
+from functools import lru_cache # Cache memoization dengan batas ukuran dan eviction LRU.
+from .stopwords import ENGLISH_STOPWORDS # Daftar stopwords bahasa Inggris yang dibundel (tanpa unduhan NLTK).
 
+# Persiapan Awal
 # Memuat daftar stopwords untuk bahasa Inggris dan menyimpannya sebagai 'set'.
 # Menggunakan 'set' membuat proses pemeriksaan stopword menjadi sangat cepat.
-stop_words = set(stopwords.words('english'))
+# Daftar ini dibundel bersama paket, sehingga impor modul ini tidak mengakses jaringan
+# (nltk.download) maupun data NLTK di disk, dan tetap berjalan di host tanpa internet.
+stop_words = set(ENGLISH_STOPWORDS)
+
+# Instance PorterStemmer dibuat secara lazy (lihat `get_stemmer`): mengimpor NLTK memakan
+# waktu cukup lama, sehingga baru dilakukan saat sebuah kata pertama kali perlu di-stem.
+_stemmer = None
+
+
+def get_stemmer():
+    """
+    Mengembalikan instance PorterStemmer (algoritma Porter untuk mengubah kata ke bentuk
+    dasarnya), yang dibuat dan NLTK-nya diimpor saat fungsi ini pertama kali dipanggil.
+
+    Returns:
+        PorterStemmer: Stemmer yang dipakai preprocessing.
+    """
+    global _stemmer
+    if _stemmer is None:
+        from nltk.stem import PorterStemmer
+        _stemmer = PorterStemmer()
+    return _stemmer
+
+
+def _stem(word):
+    return get_stemmer().stem(word)
+
+
+# Ukuran default cache stemming (jumlah bentuk kata unik yang disimpan).
+# Vocabulary korpus bersifat Zipfian, sehingga sebagian kecil kata mendominasi kemunculan.
+STEM_CACHE_SIZE = 100_000
+
+# Cache word -> stem di depan PorterStemmer. Kata yang paling lama tidak dipakai
+# dikeluarkan (LRU) saat cache penuh.
+_cached_stem = lru_cache(maxsize=STEM_CACHE_SIZE)(_stem)
+
+
+def set_stem_cache_size(maxsize):
+    """
+    Mengatur ulang ukuran maksimum cache stemming. Isi cache dan statistiknya direset.
+
+    Args:
+        maxsize (int or None): Jumlah maksimum kata yang disimpan. None berarti tanpa batas,
+            0 berarti cache dinonaktifkan.
+    """
+    global _cached_stem
+    _cached_stem = lru_cache(maxsize=maxsize)(_stem)
+
+
+def stem_cache_info():
+    """
+    Mengembalikan statistik cache stemming.
+
+    Returns:
+        dict: Berisi 'hits', 'misses', 'maxsize', 'currsize', dan 'hit_rate'.
+    """
+    info = _cached_stem.cache_info()
+    lookups = info.hits + info.misses
+    return {
+        "hits": info.hits,
+        "misses": info.misses,
+        "maxsize": info.maxsize,
+        "currsize": info.currsize,
+        "hit_rate": info.hits / lookups if lookups else 0.0,
+    }
+
+
+def clear_stem_cache():
+    """Mengosongkan cache stemming beserta statistiknya."""
+    _cached_stem.cache_clear()
+
+# Versi aturan analyzer (cleaning, tokenisasi, stopword, stemming).
+# Naikkan nilai ini setiap kali perilaku `preprocess` berubah agar index di disk dibangun ulang.
+ANALYZER_VERSION = 1
+
+
+def analyzer_fingerprint():
+    """
+    Membuat sidik jari dari pengaturan analyzer: versi aturan, daftar stopwords, dan stemmer.
+    Digunakan sebagai bagian dari kunci index di disk, sehingga index yang dibangun dengan
+    analyzer berbeda otomatis dianggap usang.
+
+    Returns:
+        str: Hash SHA-256 (heksadesimal) dari pengaturan analyzer.
+    """
+    # NLTK sudah diimpor oleh `get_stemmer`; versinya ikut menentukan hasil stemming.
+    stemmer = get_stemmer()
+    import nltk
+    settings = "\n".join([
+        f"version={ANALYZER_VERSION}",
+        f"stemmer={type(stemmer).__name__}:{getattr(stemmer, 'mode', '')}:{nltk.__version__}",
+        "stopwords=" + ",".join(sorted(stop_words)),
+    ])
+    return hashlib.sha256(settings.encode("utf-8")).hexdigest()
 
-# Membuat instance dari kelas PorterStemmer.
-# Objek ini akan digunakan untuk melakukan stemming pada kata-kata.
-stemmer = PorterStemmer()
 
 def preprocess(text):
     # Lowercase, remove non-alphabet
@@ -47,8 +133,52 @@ def preprocess(text):
     # 3: Stopword Removal & Stemming (dilakukan dalam satu langkah menggunakan list comprehension)
     # Untuk setiap 'word' dalam 'tokens':
     # - Cek dulu apakah 'word' BUKAN stopword (`if word not in stop_words`).
-    # - Jika bukan stopword, ubah kata tersebut ke bentuk dasarnya menggunakan stemmer (`stemmer.stem(word)`).
-    tokens = [stemmer.stem(word) for word in tokens if word not in stop_words]
+    # - Jika bukan stopword, ubah kata tersebut ke bentuk dasarnya menggunakan stemmer.
+    #   Stemming melewati cache sehingga bentuk kata yang sama tidak di-stem berulang kali.
+    stem = _cached_stem
+    tokens = [stem(word) for word in tokens if word not in stop_words]
     
     # Mengembalikan daftar token yang sudah selesai diproses
     return tokens
+
+
+# Pola satu "kata" pada teks asli: rangkaian karakter non-spasi (sama seperti `str.split()`).
+_WORD_PATTERN = re.compile(r'\S+')
+
+
+def preprocess_with_offsets(text):
+    """
+    Sama seperti `preprocess`, tetapi juga mencatat asal setiap token di teks asli.
+    Karena cleaning hanya menghapus karakter di dalam kata dan tokenisasi memecah di spasi,
+    setiap kata (dipisah spasi) di teks asli menghasilkan paling banyak satu token, sehingga
+    token yang dihasilkan identik dengan `preprocess(text)`.
+
+    Args:
+        text (str): String teks mentah yang akan diproses.
+
+    Returns:
+        tuple: (daftar token, daftar indeks kata asal setiap token, daftar posisi karakter
+            awal kata asal setiap token).
+    """
+    lowered = text.lower()
+    if len(lowered) != len(text):
+        # Case folding beberapa karakter Unicode mengubah panjang teks; proses per kata
+        # agar posisi karakter tetap mengacu ke teks asli.
+        matches = list(_WORD_PATTERN.finditer(text))
+        words = [re.sub(r'[^a-zA-Z\s]', '', match.group().lower()) for match in matches]
+        starts = [match.start() for match in matches]
+    else:
+        # Karakter yang dihapus saat cleaning diganti penanda sementara agar setiap kata
+        # tetap sejajar dengan posisi karakter kata asalnya.
+        cleaned = re.sub(r'[^a-zA-Z\s]', '\x00', lowered)
+        words = cleaned.split()
+        if "\x00" in cleaned:
+            words = [word.replace("\x00", "") for word in words]
+        starts = [match.start() for match in _WORD_PATTERN.finditer(lowered)]
+
+    # Kata kosong (seluruhnya dihapus saat cleaning) dan stopword tidak menjadi token.
+    word_offsets = [i for i, word in enumerate(words) if word and word not in stop_words]
+    stem = _cached_stem
+    tokens = [stem(words[i]) for i in word_offsets]
+    char_offsets = [starts[i] for i in word_offsets]
+    return tokens, word_offsets, char_offsets
@@ -0,0 +1,222 @@
+# Operator kueri posisional: frasa dalam tanda kutip dan kedekatan NEAR/k.
+# Contoh: '"boundary layer" flow' atau 'shock NEAR/5 wave'.
+# Operator dievaluasi dengan irisan postings posisional (galloping search), tanpa
+# membaca ulang teks dokumen. Semua kata kueri (termasuk yang berada di dalam operator)
+# tetap dipakai untuk skor BM25/VSM seperti biasa; operator hanya menyaring dokumen,
+# atau memberi boost skor jika `proximity_boost` diisi.
+import re
+from bisect import bisect_left
+from functools import partial
+from .preprocessing import preprocess
+
+# Pola operator: frasa dalam tanda kutip dan `kata NEAR/k kata`.
+_PHRASE_PATTERN = re.compile(r'"([^"]*)"')
+_NEAR_PATTERN = re.compile(r'(\S+)\s+NEAR/(\d+)\s+(\S+)')
+
+
+class ParsedQuery:
+    """
+    Kueri yang sudah diurai menjadi token untuk penilaian dan batasan posisional.
+
+    Args:
+        tokens (list): Token seluruh kueri (urutan asli) untuk skor BM25/VSM.
+        phrases (list): Daftar frasa, masing-masing daftar token yang harus berurutan.
+        near (list): Daftar (token_a, token_b, k): kedua token berjarak paling jauh k posisi.
+    """
+    def __init__(self, tokens, phrases=(), near=()):
+        self.tokens = tokens
+        self.phrases = list(phrases)
+        self.near = list(near)
+
+    @property
+    def num_constraints(self):
+        # Jumlah batasan posisional (frasa + NEAR).
+        return len(self.phrases) + len(self.near)
+
+    def key(self):
+        # Representasi kueri yang sudah dianalisis (dipakai sebagai kunci cache).
+        return (tuple(self.tokens), tuple(map(tuple, self.phrases)), tuple(self.near))
+
+
+def parse_query(query):
+    """
+    Mengurai string kueri menjadi token dan operator posisional.
+    Kueri tanpa operator menghasilkan token yang sama persis dengan `preprocess(query)`.
+
+    Args:
+        query (str): String kueri dari pengguna.
+
+    Returns:
+        ParsedQuery: Token kueri beserta frasa dan batasan NEAR/k.
+    """
+    near = []
+
+    def take_near(match):
+        # Operand NEAR harus menghasilkan tepat satu token (stopword diabaikan).
+        left, right = preprocess(match.group(1)), preprocess(match.group(3))
+        if len(left) == 1 and len(right) == 1:
+            near.append((left[0], right[0], int(match.group(2))))
+        return f"{match.group(1)} {match.group(3)}"
+
+    text = _NEAR_PATTERN.sub(take_near, query) if "NEAR/" in query else query
+    phrases = []
+    if '"' in text:
+        for phrase in _PHRASE_PATTERN.findall(text):
+            tokens = preprocess(phrase)
+            if tokens:
+                phrases.append(tokens)
+    return ParsedQuery(preprocess(text), phrases, near)
+
+
+def _gallop(seq, target, lo=0):
+    """
+    Galloping (exponential) search: indeks pertama di `seq[lo:]` dengan nilai >= target.
+    Biayanya O(log d), dengan d jarak dari `lo` ke hasil, sehingga murah saat melompati
+    bagian panjang dari daftar terurut.
+
+    Args:
+        seq (sequence): Urutan bilangan terurut naik.
+        target (int): Nilai yang dicari.
+        lo (int): Indeks awal pencarian.
+
+    Returns:
+        int: Indeks hasil (len(seq) jika semua nilai lebih kecil dari target).
+    """
+    n = len(seq)
+    step, hi = 1, lo
+    while hi < n and seq[hi] < target:
+        lo = hi + 1
+        hi += step
+        step *= 2
+    return bisect_left(seq, target, lo, min(hi, n))
+
+
+class _DocIds:
+    # Tampilan doc_idx atas daftar postings (doc_idx, tf) agar bisa dicari dengan bisect.
+    __slots__ = ("postings",)
+
+    def __init__(self, postings):
+        self.postings = postings
+
+    def __len__(self):
+        return len(self.postings)
+
+    def __getitem__(self, i):
+        return self.postings[i][0]
+
+
+def _doc_ids(index, term):
+    # Urutan doc_idx dari postings sebuah term (langsung dari mmap, atau dengan skip pointer
+    # untuk postings terkompresi).
+    postings = index.postings.get(term, ())
+    return getattr(postings, "doc_ids", None) or _DocIds(postings)
+
+
+def _intersect_docs(index, terms):
+    """
+    Irisan dokumen yang memuat semua `terms`. Daftar terpendek diiterasi dan daftar
+    lainnya dicari dengan galloping search, sehingga biayanya mengikuti daftar terpendek.
+
+    Returns:
+        list: doc_idx yang memuat semua term (dokumen terhapus tidak disertakan).
+    """
+    lists = sorted((_doc_ids(index, term) for term in set(terms)), key=len)
+    if not lists or not len(lists[0]):
+        return []
+    # Postings terkompresi mencari dengan skip pointer (`geq_index`) tanpa mendekode seluruh daftar.
+    seeks = [getattr(seq, "geq_index", None) or partial(_gallop, seq) for seq in lists]
+    cursors = [0] * len(lists)
+    result = []
+    deleted = index.deleted
+    for doc_idx in lists[0]:
+        for i in range(1, len(lists)):
+            cursors[i] = seeks[i](doc_idx, cursors[i])
+            if cursors[i] == len(lists[i]):
+                return result
+            if lists[i][cursors[i]] != doc_idx:
+                break
+        else:
+            if doc_idx not in deleted:
+                result.append(doc_idx)
+    return result
+
+
+def _has_phrase(positions, phrase):
+    # Apakah token `phrase` muncul berurutan: untuk posisi p token pertama, p+i ada di posisi token ke-i.
+    candidates = positions[phrase[0]]
+    for offset in range(1, len(phrase)):
+        seq = positions[phrase[offset]]
+        cursor, matched = 0, []
+        for start in candidates:
+            cursor = _gallop(seq, start + offset, cursor)
+            if cursor == len(seq):
+                break
+            if seq[cursor] == start + offset:
+                matched.append(start)
+        if not matched:
+            return False
+        candidates = matched
+    return True
+
+
+def _is_near(first, second, k):
+    # Apakah ada posisi di `first` dan `second` yang berjarak paling jauh k (penelusuran dua pointer).
+    i = j = 0
+    while i < len(first) and j < len(second):
+        if abs(first[i] - second[j]) <= k:
+            return True
+        if first[i] < second[j]:
+            i += 1
+        else:
+            j += 1
+    return False
+
+
+def match_constraints(index, parsed):
+    """
+    Menghitung berapa batasan posisional (frasa dan NEAR/k) yang dipenuhi setiap dokumen.
+    Kandidat diambil dari irisan postings term batasan, lalu diverifikasi dengan posisi token.
+
+    Args:
+        index (CorpusIndex): Index posisional.
+        parsed (ParsedQuery): Kueri yang sudah diurai.
+
+    Returns:
+        dict: Pemetaan doc_idx -> jumlah batasan yang dipenuhi (hanya dokumen dengan minimal satu).
+    """
+    satisfied = {}
+    for phrase in parsed.phrases:
+        for doc_idx in _intersect_docs(index, phrase):
+            if len(phrase) == 1 or _has_phrase(index.positions[doc_idx], phrase):
+                satisfied[doc_idx] = satisfied.get(doc_idx, 0) + 1
+    for first, second, k in parsed.near:
+        for doc_idx in _intersect_docs(index, (first, second)):
+            positions = index.positions[doc_idx]
+            if _is_near(positions[first], positions[second], k):
+                satisfied[doc_idx] = satisfied.get(doc_idx, 0) + 1
+    return satisfied
+
+
+def apply_constraints(doc_scores, satisfied, num_constraints, proximity_boost=0.0):
+    """
+    Menerapkan hasil `match_constraints` ke skor dokumen.
+
+    Tanpa boost, operator bersifat filter: hanya dokumen yang memenuhi semua batasan yang
+    dipertahankan. Dengan boost, semua dokumen tetap dinilai dan skor dokumen yang memenuhi
+    batasan dikalikan `1 + proximity_boost * (batasan terpenuhi / jumlah batasan)`.
+
+    Args:
+        doc_scores (dict or numpy.ndarray): Skor dokumen (diubah langsung jika boost dipakai).
+        satisfied (dict): Pemetaan doc_idx -> jumlah batasan yang dipenuhi.
+        num_constraints (int): Jumlah batasan di kueri.
+        proximity_boost (float): Bobot boost. 0 berarti operator bersifat filter.
+
+    Returns:
+        dict or numpy.ndarray: Skor setelah filter (dict) atau boost (objek yang sama).
+    """
+    if not proximity_boost:
+        return {doc_idx: float(doc_scores[doc_idx]) for doc_idx, count in satisfied.items()
+                if count == num_constraints}
+    for doc_idx, count in satisfied.items():
+        doc_scores[doc_idx] = doc_scores[doc_idx] * (1 + proximity_boost * count / num_constraints)
+    return doc_scores
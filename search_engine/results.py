@@ -0,0 +1,73 @@
+import heapq # Heap untuk seleksi top-k dalam O(N log k)
+
+
+class SearchResult:
+    """
+    Hasil pencarian yang ringkas: hanya pasangan (indeks dokumen, skor) untuk top-k.
+
+    Objek ini tetap bisa di-unpack seperti hasil lama, yaitu
+    `ranked_ids, scores = engine.search(query)`. Dalam hal itu `scores` adalah
+    dict {doc_idx: skor} untuk dokumen top-k saja, atau daftar skor lengkap jika
+    `full_scores=True` diminta saat pencarian.
+
+    Args:
+        hits (list): Daftar (doc_idx, skor) yang sudah terurut dari skor tertinggi.
+        all_scores (list, optional): Skor untuk seluruh dokumen (hanya jika diminta).
+        stats (dict, optional): Statistik eksekusi kueri, misalnya jumlah dokumen yang dinilai penuh.
+    """
+    def __init__(self, hits, all_scores=None, stats=None):
+        self.hits = hits
+        self.all_scores = all_scores
+        self.stats = stats or {}
+
+    @property
+    def ranked_ids(self):
+        # Daftar indeks dokumen sesuai peringkat.
+        return [doc_idx for doc_idx, _ in self.hits]
+
+    @property
+    def scores(self):
+        # Skor lengkap jika tersedia, jika tidak hanya skor untuk dokumen top-k.
+        if self.all_scores is not None:
+            return self.all_scores
+        return dict(self.hits)
+
+    def __iter__(self):
+        # Mendukung unpacking `ranked_ids, scores = result` seperti API lama.
+        return iter((self.ranked_ids, self.scores))
+
+    def __len__(self):
+        return len(self.hits)
+
+    def __repr__(self):
+        return f"SearchResult(hits={self.hits!r})"
+
+
+def select_top_k(doc_scores, n_docs, top_k, deleted=()):
+    """
+    Memilih `top_k` dokumen dengan skor tertinggi dari akumulator skor sparse.
+
+    Urutannya identik dengan mengurutkan seluruh skor secara stabil dari tertinggi
+    ke terendah: skor seri diurutkan berdasarkan indeks dokumen terkecil. Jika dokumen
+    berskor positif kurang dari `top_k`, sisanya diisi dokumen berskor 0 sesuai urutan indeks.
+
+    Args:
+        doc_scores (dict): Pemetaan doc_idx -> skor untuk dokumen yang disentuh kueri.
+        n_docs (int): Jumlah dokumen dalam koleksi.
+        top_k (int): Jumlah dokumen teratas yang dikembalikan.
+        deleted (set): Indeks dokumen terhapus yang tidak boleh dipakai untuk mengisi hasil.
+
+    Returns:
+        list: Daftar (doc_idx, skor) yang sudah terurut.
+    """
+    hits = heapq.nlargest(top_k, doc_scores.items(), key=lambda item: (item[1], -item[0]))
+    # Jika dokumen yang disentuh kueri kurang dari `top_k`, semuanya sudah terpilih.
+    # Lengkapi dengan dokumen berskor 0 sesuai urutan indeks (sama seperti pengurutan penuh).
+    if len(hits) < top_k:
+        hits = [(doc_idx, score) for doc_idx, score in hits if score > 0]
+        for doc_idx in range(n_docs):
+            if len(hits) >= top_k:
+                break
+            if doc_scores.get(doc_idx, 0) <= 0 and doc_idx not in deleted:
+                hits.append((doc_idx, doc_scores.get(doc_idx, 0.0)))
+    return hits
@@ -0,0 +1,452 @@
+# Layanan HTTP/JSON berbasis asyncio untuk VSMEngine dan BM25Engine (hanya pustaka standar).
+# Endpoint:
+#   GET  /health                       -> status layanan, engine yang tersedia, dan beban saat ini.
+#   GET  /search?q=...&engine=bm25&top_k=5
+#   POST /search       {"query": "...", "engine": "bm25", "top_k": 5, "trace": true}
+#   POST /search_many  {"queries": ["...", "..."], "engine": "bm25", "top_k": 5}
+# Penilaian (CPU-bound) dijalankan di executor agar event loop tetap responsif. Permintaan
+# /search yang datang hampir bersamaan digabung menjadi satu panggilan `search_many`
+# (micro-batching). Jika antrean penuh, permintaan baru langsung ditolak dengan 503
+# (backpressure), dan permintaan yang melewati batas waktu dijawab dengan 504.
+import json
+import time
+import asyncio
+import contextvars
+from urllib.parse import urlsplit, parse_qs
+from concurrent.futures import ThreadPoolExecutor
+from .instrumentation import Trace
+
+# Jumlah maksimum kueri dalam satu micro-batch dan waktu tunggu untuk mengumpulkannya (detik).
+MAX_BATCH_SIZE = 32
+BATCH_DELAY = 0.002
+# Jumlah maksimum permintaan yang sedang diproses/mengantre sebelum permintaan baru ditolak.
+MAX_PENDING = 256
+# Batas waktu pemrosesan satu permintaan dan batas waktu membaca permintaan dari klien (detik).
+REQUEST_TIMEOUT = 5.0
+READ_TIMEOUT = 10.0
+# Ukuran maksimum header dan body permintaan (byte).
+MAX_HEADER_SIZE = 16 * 1024
+MAX_BODY_SIZE = 1024 * 1024
+# Nilai top_k maksimum per kueri, agar satu permintaan tidak bisa meminta seluruh koleksi.
+MAX_TOP_K = 1000
+
+# Opsi `engine.search` yang boleh dikirim klien lewat "options", per nama engine, beserta tipenya.
+# Opsi lain (termasuk top_k, yang sudah menjadi parameter tersendiri) ditolak dengan 400.
+SEARCH_OPTIONS = {
+    "bm25": {"pruning": bool, "proximity_boost": float, "k": float, "b": float},
+    "vsm": {"proximity_boost": float},
+}
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            413: "Payload Too Large", 500: "Internal Server Error", 503: "Service Unavailable",
+            504: "Gateway Timeout"}
+
+
+class HTTPError(Exception):
+    # Kesalahan yang dikirim ke klien sebagai respons JSON dengan status `status`.
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+# Slot beban permintaan yang sedang diproses (diisi oleh `SearchService.handle`).
+_current_slot = contextvars.ContextVar("search_slot", default=None)
+
+
+class _Slot:
+    """
+    Beban satu permintaan pada `SearchService.pending`. Slot baru dilepas setelah permintaan
+    dijawab dan semua pekerjaannya di executor selesai, sehingga pekerjaan milik permintaan
+    yang sudah dijawab 504 (timeout) tetap dihitung sebagai beban sampai benar-benar selesai.
+    """
+    __slots__ = ("service", "holders")
+
+    def __init__(self, service):
+        self.service = service
+        self.holders = 1
+        service.pending += 1
+
+    def hold(self):
+        self.holders += 1
+
+    def release(self):
+        self.holders -= 1
+        if self.holders == 0:
+            self.service.pending -= 1
+
+
+def _submit(executor, slots, func, *args):
+    """
+    Menjalankan `func(*args)` di executor dan mengembalikan future asyncio hasilnya.
+    Slot permintaan ditahan sampai pekerjaan di executor selesai (bukan sampai future asyncio
+    dibatalkan), sehingga antrean executor tidak bisa tumbuh melebihi batas beban layanan.
+
+    Args:
+        executor (ThreadPoolExecutor): Executor penilaian.
+        slots (list): Slot permintaan pemilik pekerjaan ini (None diabaikan).
+        func (callable): Fungsi yang dijalankan.
+    """
+    loop = asyncio.get_running_loop()
+    slots = [slot for slot in slots if slot is not None]
+    for slot in slots:
+        slot.hold()
+    job = executor.submit(func, *args)
+
+    def release(_):
+        # Dipanggil di thread executor; pelepasan slot dijalankan di event loop.
+        for slot in slots:
+            try:
+                loop.call_soon_threadsafe(slot.release)
+            except RuntimeError:  # Event loop sudah ditutup.
+                pass
+
+    job.add_done_callback(release)
+    return asyncio.wrap_future(job, loop=loop)
+
+
+class _MicroBatcher:
+    """
+    Mengumpulkan kueri /search untuk satu engine dan top_k yang sama, lalu menjalankannya
+    sekaligus dengan `engine.search_many` di executor. Batch dikirim saat berisi
+    `max_batch` kueri atau `delay` detik setelah kueri pertama masuk.
+    """
+    def __init__(self, engine, top_k, executor, max_batch, delay):
+        self.engine = engine
+        self.top_k = top_k
+        self.executor = executor
+        self.max_batch = max_batch
+        self.delay = delay
+        self._queries = []
+        self._futures = []
+        self._slots = []
+        self._flush_handle = None
+        # Jumlah batch yang sudah dijalankan.
+        self.batches = 0
+
+    def submit(self, query):
+        # Menambahkan kueri ke batch berjalan dan mengembalikan future hasilnya.
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._queries.append(query)
+        self._futures.append(future)
+        self._slots.append(_current_slot.get())
+        if len(self._queries) >= self.max_batch:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.delay, self._flush)
+        return future
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        queries, futures, slots = self._queries, self._futures, self._slots
+        self._queries, self._futures, self._slots = [], [], []
+        if queries:
+            self.batches += 1
+            asyncio.ensure_future(self._run(queries, futures, slots))
+
+    async def _run(self, queries, futures, slots):
+        # Kueri yang future-nya sudah dibatalkan (timeout sebelum batch dikirim) tidak dinilai.
+        live = [i for i, future in enumerate(futures) if not future.done()]
+        if not live:
+            return
+        queries = [queries[i] for i in live]
+        futures = [futures[i] for i in live]
+        slots = [slots[i] for i in live]
+        try:
+            results = await _submit(self.executor, slots, self.engine.search_many, queries, self.top_k)
+        except Exception as error:
+            for future in futures:
+                if not future.done():
+                    future.set_exception(error)
+            return
+        for future, result in zip(futures, results):
+            # Future yang sudah dibatalkan (misalnya karena timeout) dilewati.
+            if not future.done():
+                future.set_result(result)
+
+
+class SearchService:
+    """
+    Layanan pencarian HTTP/JSON di atas satu atau beberapa engine.
+
+    Args:
+        engines (dict): Pemetaan nama engine (misalnya 'vsm', 'bm25') -> objek engine
+            dengan metode `search` dan `search_many`.
+        documents (DocumentStore or JsonlDocumentStore, optional): Koleksi dokumen untuk
+            menyertakan doc_id di hasil.
+        workers (int): Jumlah thread executor untuk penilaian.
+        max_batch (int): Jumlah maksimum kueri per micro-batch.
+        batch_delay (float): Waktu tunggu (detik) untuk mengumpulkan micro-batch.
+        max_pending (int): Jumlah maksimum permintaan yang sedang diproses sebelum ditolak (503),
+            termasuk permintaan yang sudah timeout tetapi pekerjaannya masih berjalan di executor.
+        timeout (float): Batas waktu (detik) pemrosesan satu permintaan sebelum dijawab 504.
+    """
+    def __init__(self, engines, documents=None, workers=2, max_batch=MAX_BATCH_SIZE,
+                 batch_delay=BATCH_DELAY, max_pending=MAX_PENDING, timeout=REQUEST_TIMEOUT):
+        if not engines:
+            raise ValueError("Minimal satu engine harus diberikan.")
+        self.engines = engines
+        self.documents = documents
+        self.max_batch = max_batch
+        self.batch_delay = batch_delay
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="search")
+        self._batchers = {}
+        self.pending = 0
+        self.stats = {"requests": 0, "rejected": 0, "timeouts": 0, "errors": 0}
+        self._server = None
+
+    # --- Eksekusi pencarian ---
+    def _engine(self, name):
+        engine = self.engines.get(name)
+        if engine is None:
+            raise HTTPError(400, f"Engine tidak dikenal: {name!r}. Pilihan: {sorted(self.engines)}")
+        return engine
+
+    def _options(self, engine, options):
+        # Memvalidasi opsi pencarian dari klien terhadap SEARCH_OPTIONS; opsi lain dijawab 400.
+        if not isinstance(options, dict):
+            raise HTTPError(400, "Parameter 'options' harus berupa objek JSON.")
+        allowed = SEARCH_OPTIONS.get(engine, {})
+        for name, value in options.items():
+            if name == "top_k":
+                raise HTTPError(400, "top_k dikirim sebagai parameter tersendiri, bukan di 'options'.")
+            if name not in allowed:
+                raise HTTPError(400, f"Opsi tidak dikenal untuk engine {engine!r}: {name!r}. "
+                                     f"Pilihan: {sorted(allowed)}")
+            if allowed[name] is bool:
+                valid = isinstance(value, bool)
+            else:
+                valid = isinstance(value, (int, float)) and not isinstance(value, bool)
+            if not valid:
+                raise HTTPError(400, f"Opsi {name!r} harus bertipe {allowed[name].__name__}.")
+        return dict(options)
+
+    def _format(self, result):
+        # Mengubah SearchResult menjadi daftar dict yang bisa dikirim sebagai JSON.
+        doc_ids = self.documents.doc_ids if self.documents is not None else None
+        hits = []
+        for doc_idx, score in result.hits:
+            hit = {"doc_idx": doc_idx, "score": score}
+            if doc_ids is not None:
+                hit["doc_id"] = doc_ids[doc_idx]
+            hits.append(hit)
+        return hits
+
+    async def search(self, query, engine="bm25", top_k=5, **options):
+        """
+        Menjalankan satu kueri. Kueri tanpa opsi tambahan digabung ke micro-batch.
+
+        Args:
+            query (str): String kueri.
+            engine (str): Nama engine.
+            top_k (int): Jumlah dokumen teratas.
+            **options: Opsi tambahan untuk `engine.search` (kueri ini tidak di-batch).
+
+        Returns:
+            SearchResult: Hasil pencarian.
+        """
+        searcher = self._engine(engine)
+        if options:
+            return await _submit(self.executor, [_current_slot.get()],
+                                 lambda: searcher.search(query, top_k=top_k, **options))
+        key = (engine, top_k)
+        batcher = self._batchers.get(key)
+        if batcher is None:
+            batcher = self._batchers[key] = _MicroBatcher(
+                searcher, top_k, self.executor, self.max_batch, self.batch_delay)
+        return await batcher.submit(query)
+
+    async def search_many(self, queries, engine="bm25", top_k=5):
+        # Menjalankan sekumpulan kueri sebagai satu panggilan `search_many` di executor.
+        searcher = self._engine(engine)
+        return await _submit(self.executor, [_current_slot.get()], searcher.search_many, queries, top_k)
+
+    # --- Routing ---
+    async def _dispatch(self, method, target, body):
+        url = urlsplit(target)
+        if url.path == "/health":
+            if method != "GET":
+                raise HTTPError(405, "Gunakan GET untuk /health.")
+            return {"status": "ok", "engines": sorted(self.engines), "pending": self.pending,
+                    "max_pending": self.max_pending,
+                    "documents": len(self.documents) if self.documents is not None else None,
+                    "stats": dict(self.stats, batches=sum(b.batches for b in self._batchers.values()))}
+        if url.path not in ("/search", "/search_many"):
+            raise HTTPError(404, f"Endpoint tidak ditemukan: {url.path}")
+
+        if method == "GET":
+            params = {name: values[-1] for name, values in parse_qs(url.query).items()}
+            if "q" in params:
+                params["query"] = params.pop("q")
+        elif method == "POST":
+            try:
+                params = json.loads(body or b"{}")
+            except ValueError:
+                raise HTTPError(400, "Body harus berupa JSON yang valid.")
+            if not isinstance(params, dict):
+                raise HTTPError(400, "Body harus berupa objek JSON.")
+        else:
+            raise HTTPError(405, "Gunakan GET atau POST.")
+
+        engine = params.get("engine", "bm25")
+        top_k = params.get("top_k", 5)
+        if method == "GET":
+            # Query string selalu berupa teks, jadi top_k di-parse sebagai bilangan bulat.
+            try:
+                top_k = int(top_k)
+            except ValueError:
+                raise HTTPError(400, "top_k harus berupa bilangan bulat.")
+        elif not isinstance(top_k, int) or isinstance(top_k, bool):
+            # Body JSON: hanya bilangan bulat JSON (bukan 5.5, true, atau "7").
+            raise HTTPError(400, "top_k harus berupa bilangan bulat.")
+        if not 1 <= top_k <= MAX_TOP_K:
+            raise HTTPError(400, f"top_k harus antara 1 dan {MAX_TOP_K}.")
+
+        if url.path == "/search":
+            query = params.get("query")
+            if not isinstance(query, str):
+                raise HTTPError(400, "Parameter 'query' (atau 'q') wajib diisi.")
+            self._engine(engine)
+            options = self._options(engine, params.get("options") or {})
+            # Dengan "trace": true, kueri dijalankan tanpa batching dan laporan instrumentasinya
+            # (waktu per tahap dan penghitung) ikut dikirim.
+            trace = Trace() if params.get("trace") in (True, "1", "true") else None
+            if trace is not None:
+                options["trace"] = trace
+            result = await self.search(query, engine, top_k, **options)
+            response = {"query": query, "engine": engine, "hits": self._format(result)}
+            if trace is not None:
+                response["trace"] = trace.report()
+            return response
+
+        queries = params.get("queries")
+        if not isinstance(queries, list) or not all(isinstance(q, str) for q in queries):
+            raise HTTPError(400, "Parameter 'queries' harus berupa daftar string.")
+        results = await self.search_many(queries, engine, top_k)
+        return {"engine": engine, "results": [{"query": query, "hits": self._format(result)}
+                                              for query, result in zip(queries, results)]}
+
+    async def handle(self, method, target, body):
+        """
+        Memproses satu permintaan HTTP dengan backpressure dan batas waktu.
+
+        Returns:
+            tuple: (status HTTP, objek respons JSON).
+        """
+        self.stats["requests"] += 1
+        # /health selalu dijawab dan tidak dihitung sebagai beban.
+        # Beban dihitung per permintaan sampai permintaan dijawab dan pekerjaannya di executor
+        # selesai (lihat `_Slot`).
+        counted = urlsplit(target).path != "/health"
+        slot = token = None
+        if counted:
+            if self.pending >= self.max_pending:
+                self.stats["rejected"] += 1
+                return 503, {"error": "Layanan sedang penuh, coba lagi nanti."}
+            slot = _Slot(self)
+            token = _current_slot.set(slot)
+        started = time.perf_counter()
+        try:
+            response = await asyncio.wait_for(self._dispatch(method, target, body), self.timeout)
+            response["took_ms"] = (time.perf_counter() - started) * 1000
+            return 200, response
+        except HTTPError as error:
+            return error.status, {"error": error.message}
+        except asyncio.TimeoutError:
+            self.stats["timeouts"] += 1
+            return 504, {"error": f"Permintaan melewati batas waktu {self.timeout} detik."}
+        except Exception as error:
+            self.stats["errors"] += 1
+            return 500, {"error": f"{type(error).__name__}: {error}"}
+        finally:
+            if counted:
+                _current_slot.reset(token)
+                slot.release()
+
+    # --- Server HTTP ---
+    async def _read_request(self, reader):
+        # Membaca satu permintaan HTTP/1.1: (method, target, header, body). None jika koneksi ditutup.
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except asyncio.IncompleteReadError:
+            return None
+        except asyncio.LimitOverrunError:
+            raise HTTPError(413, "Header permintaan terlalu besar.")
+        lines = head.decode("latin-1").split("\r\n")
+        try:
+            method, target, _ = lines[0].split(" ", 2)
+        except ValueError:
+            raise HTTPError(400, "Baris permintaan tidak valid.")
+        headers = {}
+        for line in lines[1:]:
+            if ":" in line:
+                name, value = line.split(":", 1)
+                headers[name.strip().lower()] = value.strip()
+        try:
+            length = int(headers.get("content-length", 0))
+        except ValueError:
+            raise HTTPError(400, "Content-Length tidak valid.")
+        if length > MAX_BODY_SIZE:
+            raise HTTPError(413, "Body permintaan terlalu besar.")
+        body = await reader.readexactly(length) if length else b""
+        return method.upper(), target, headers, body
+
+    async def _handle_connection(self, reader, writer):
+        # Melayani satu koneksi; koneksi dipertahankan (keep-alive) sampai klien menutupnya.
+        try:
+            while True:
+                keep_alive = False
+                try:
+                    request = await asyncio.wait_for(self._read_request(reader), READ_TIMEOUT)
+                    if request is None:
+                        break
+                    method, target, headers, body = request
+                    keep_alive = headers.get("connection", "").lower() != "close"
+                    status, payload = await self.handle(method, target, body)
+                except HTTPError as error:
+                    status, payload = error.status, {"error": error.message}
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError):
+                    break
+                data = json.dumps(payload).encode("utf-8")
+                head = (f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+                        f"Content-Type: application/json\r\n"
+                        f"Content-Length: {len(data)}\r\n"
+                        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n")
+                if status == 503:
+                    head += "Retry-After: 1\r\n"
+                writer.write(head.encode("latin-1") + b"\r\n" + data)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host="127.0.0.1", port=8000):
+        """
+        Menjalankan server HTTP (tanpa memblokir).
+
+        Returns:
+            asyncio.AbstractServer: Server yang sedang berjalan.
+        """
+        self._server = await asyncio.start_server(self._handle_connection, host, port, limit=MAX_HEADER_SIZE)
+        return self._server
+
+    async def serve_forever(self, host="127.0.0.1", port=8000):
+        # Menjalankan server sampai dihentikan (misalnya dengan Ctrl+C).
+        server = await self.start(host, port)
+        async with server:
+            await server.serve_forever()
+
+    def close(self):
+        # Menghentikan server dan executor.
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+        self.executor.shutdown(wait=False)
@@ -0,0 +1,263 @@
+# Mode sharded untuk BM25: koleksi dibagi ke beberapa proses worker, masing-masing memegang
+# index shard-nya sendiri. Koordinator menyebarkan kueri ke semua shard (scatter), lalu
+# menggabungkan daftar top-k setiap shard (gather). Statistik korpus global (N, DF, panjang
+# rata-rata dokumen) dibagikan ke semua shard, sehingga skor setiap dokumen identik dengan
+# BM25Engine tanpa sharding.
+import heapq
+import threading
+import multiprocessing
+from itertools import islice
+from .index import CorpusIndex
+from .bm25 import BM25Engine
+from .results import SearchResult
+
+# Jumlah dokumen yang dikirim ke worker dalam satu pesan saat membangun shard.
+SEND_BATCH_SIZE = 256
+
+
+def _receive_docs(conn):
+    # Membaca batch dokumen dari koordinator sampai penanda akhir (None).
+    while True:
+        batch = conn.recv()
+        if batch is None:
+            return
+        yield from batch
+
+
+def _apply_global_stats(index, stats):
+    """
+    Mengganti statistik korpus lokal shard dengan statistik global, sehingga IDF dan
+    normalisasi panjang dokumen BM25 dihitung terhadap seluruh koleksi.
+
+    Args:
+        index (CorpusIndex): Index shard.
+        stats (tuple): (N global, total panjang dokumen global, dict DF global untuk term shard).
+    """
+    n_docs, total_len, doc_freqs = stats
+    index.N = n_docs
+    index.total_len = total_len
+    index.avg_doc_len = total_len / n_docs if n_docs else 0
+    index.doc_freqs = doc_freqs
+
+
+def _shard_worker(conn, engine_options):
+    """
+    Loop utama proses worker: membangun index shard dari dokumen yang dikirim koordinator,
+    menerima statistik global, lalu melayani permintaan pencarian sampai diminta berhenti.
+    Fungsi ini berada di level modul agar bisa dijalankan di proses worker.
+
+    Args:
+        conn (Connection): Ujung pipe ke koordinator.
+        engine_options (dict): Argumen tambahan untuk BM25Engine (k, b, backend, ...).
+    """
+    # 1. Bangun index shard secara streaming, lalu laporkan statistik lokalnya.
+    index = CorpusIndex(_receive_docs(conn))
+    conn.send((index.N, index.total_len, dict(index.doc_freqs)))
+    # 2. Terapkan statistik global sebelum engine menghitung IDF dan struktur turunannya.
+    _apply_global_stats(index, conn.recv())
+    engine = BM25Engine(index, **engine_options)
+    conn.send(len(index.doc_lens))
+
+    # 3. Layani permintaan: (nama metode, argumen). None berarti berhenti.
+    while True:
+        request = conn.recv()
+        if request is None:
+            break
+        method, args, kwargs = request
+        try:
+            if method == "search":
+                result = engine.search(*args, **kwargs)
+                response = (result.hits, result.stats)
+            elif method == "search_many":
+                response = [(result.hits, result.stats) for result in engine.search_many(*args, **kwargs)]
+            else:
+                raise ValueError(f"Metode shard tidak dikenal: {method!r}")
+            conn.send(("ok", response))
+        except Exception as error:
+            conn.send(("error", error))
+    conn.close()
+
+
+def _merge_stats(stats_list):
+    # Menjumlahkan statistik eksekusi (misalnya docs_scored) dari semua shard.
+    merged = {}
+    for stats in stats_list:
+        for key, value in stats.items():
+            merged[key] = merged.get(key, 0) + value
+    return merged
+
+
+class ShardedBM25Engine:
+    """
+    BM25 yang koleksinya dibagi ke `num_shards` proses worker.
+
+    Dokumen dibagi secara round-robin: dokumen ke-i masuk shard `i % num_shards` dengan indeks
+    lokal `i // num_shards`. Karena urutan indeks lokal mengikuti urutan indeks global, hasil
+    gabungan (skor tertinggi, seri dimenangkan indeks terkecil) identik dengan BM25Engine biasa.
+    Indeks dokumen di hasil pencarian adalah indeks global.
+
+    Args:
+        raw_docs (iterable): Teks dokumen (boleh berupa generator; dokumen dialirkan ke worker).
+        num_shards (int): Jumlah shard (dan proses worker).
+        k (float): Parameter BM25 untuk saturasi frekuensi kata.
+        b (float): Parameter BM25 untuk normalisasi panjang dokumen.
+        **engine_options: Opsi tambahan untuk BM25Engine di setiap shard (misalnya backend='numpy').
+    """
+    def __init__(self, raw_docs, num_shards=2, k=1.5, b=0.75, **engine_options):
+        if num_shards < 1:
+            raise ValueError(f"Jumlah shard harus minimal 1, bukan {num_shards!r}")
+        self.num_shards = num_shards
+        self.k = k
+        self.b = b
+        self.engine_options = engine_options
+        self._lock = threading.Lock()
+
+        # 1. Jalankan worker untuk setiap shard.
+        options = dict(engine_options, k=k, b=b)
+        self._conns = []
+        self._processes = []
+        for _ in range(num_shards):
+            parent_conn, child_conn = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=_shard_worker, args=(child_conn, options), daemon=True)
+            process.start()
+            child_conn.close()
+            self._conns.append(parent_conn)
+            self._processes.append(process)
+
+        try:
+            # 2. Alirkan dokumen ke shard secara round-robin, per batch.
+            docs = iter(raw_docs)
+            while True:
+                batch = list(islice(docs, SEND_BATCH_SIZE * num_shards))
+                if not batch:
+                    break
+                for shard, conn in enumerate(self._conns):
+                    conn.send(batch[shard::num_shards])
+            for conn in self._conns:
+                conn.send(None)
+
+            # 3. Gabungkan statistik lokal menjadi statistik global, lalu bagikan ke setiap shard
+            # (DF hanya untuk term yang ada di shard tersebut).
+            local_stats = [conn.recv() for conn in self._conns]
+            self.N = sum(n_docs for n_docs, _, _ in local_stats)
+            self.total_len = sum(total_len for _, total_len, _ in local_stats)
+            self.avg_doc_len = self.total_len / self.N if self.N else 0
+            doc_freqs = {}
+            for _, _, shard_freqs in local_stats:
+                for term, df in shard_freqs.items():
+                    doc_freqs[term] = doc_freqs.get(term, 0) + df
+            self.doc_freqs = doc_freqs
+            for conn, (_, _, shard_freqs) in zip(self._conns, local_stats):
+                conn.send((self.N, self.total_len, {term: doc_freqs[term] for term in shard_freqs}))
+            self.shard_sizes = [conn.recv() for conn in self._conns]
+        except BaseException:
+            self.close()
+            raise
+
+    @property
+    def params(self):
+        # Parameter yang memengaruhi hasil pencarian.
+        return dict(self.engine_options, k=self.k, b=self.b, num_shards=self.num_shards)
+
+    def _to_global(self, shard, hits):
+        # Mengubah indeks dokumen lokal shard menjadi indeks global.
+        num_shards = self.num_shards
+        return [(doc_idx * num_shards + shard, score) for doc_idx, score in hits]
+
+    def _merge(self, shard_hits, top_k):
+        # Menggabungkan daftar top-k yang sudah terurut dari setiap shard (skor tertinggi,
+        # seri dimenangkan indeks global terkecil).
+        merged = heapq.merge(*shard_hits, key=lambda hit: (-hit[1], hit[0]))
+        return list(islice(merged, top_k))
+
+    def _scatter_gather(self, method, *args, **kwargs):
+        """
+        Mengirim permintaan yang sama ke semua shard lalu menunggu semua jawabannya.
+        Semua shard memproses permintaan secara paralel.
+
+        Returns:
+            list: Jawaban setiap shard, sesuai urutan shard.
+        """
+        with self._lock:
+            if not self._conns:
+                raise RuntimeError("ShardedBM25Engine sudah ditutup.")
+            for conn in self._conns:
+                conn.send((method, args, kwargs))
+            responses = [conn.recv() for conn in self._conns]
+        for status, payload in responses:
+            if status == "error":
+                raise payload
+        return [payload for _, payload in responses]
+
+    def search(self, query, top_k=5, trace=None, **options):
+        """
+        Mencari di semua shard dan menggabungkan hasil top-k-nya.
+
+        Args:
+            query (str): String kueri dari pengguna.
+            top_k (int): Jumlah dokumen teratas yang akan dikembalikan.
+            trace (Trace, optional): Jika diisi, waktu scatter-gather dicatat ke tahap 'score'
+                dan penggabungan hasil ke tahap 'select'.
+            **options: Opsi tambahan untuk `BM25Engine.search` (misalnya `pruning=True`).
+                `full_scores` tidak didukung.
+
+        Returns:
+            SearchResult: Pasangan (indeks dokumen global, skor) top-k.
+        """
+        if options.get("full_scores"):
+            raise ValueError("full_scores tidak didukung oleh ShardedBM25Engine.")
+        if trace is not None:
+            trace.resume()
+        responses = self._scatter_gather("search", query, top_k, **options)
+        stats = _merge_stats(stats for _, stats in responses)
+        if trace is not None:
+            trace.mark("score")
+            trace.count("shards", self.num_shards)
+            for name, value in stats.items():
+                trace.count(name, value)
+        shard_hits = [self._to_global(shard, hits) for shard, (hits, _) in enumerate(responses)]
+        hits = self._merge(shard_hits, top_k)
+        if trace is not None:
+            trace.mark("select")
+        return SearchResult(hits, stats=stats)
+
+    def search_many(self, queries, top_k=5):
+        """
+        Mencari sekumpulan kueri sekaligus: satu pesan per shard untuk semua kueri.
+
+        Args:
+            queries (list): Daftar string kueri.
+            top_k (int): Jumlah dokumen teratas yang dikembalikan per kueri.
+
+        Returns:
+            list: SearchResult untuk setiap kueri, sesuai urutan input.
+        """
+        queries = list(queries)
+        responses = self._scatter_gather("search_many", queries, top_k)
+        results = []
+        for i in range(len(queries)):
+            shard_hits = [self._to_global(shard, response[i][0]) for shard, response in enumerate(responses)]
+            results.append(SearchResult(self._merge(shard_hits, top_k)))
+        return results
+
+    def close(self):
+        # Menghentikan semua proses worker.
+        with self._lock:
+            conns, self._conns = self._conns, []
+        for conn in conns:
+            try:
+                conn.send(None)
+            except (OSError, ValueError):
+                pass
+            conn.close()
+        for process in self._processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        self._processes = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,117 @@
+# Pembuatan cuplikan (snippet) hasil pencarian dari index posisional.
+# Posisi term kueri di dokumen dan asal token di teks asli sudah dicatat saat indexing,
+# sehingga snippet dipotong langsung dari teks tanpa memproses ulang setiap kata dokumen.
+# Biayanya sebanding dengan jumlah kecocokan dan panjang snippet, bukan panjang dokumen.
+import re
+from heapq import merge
+from itertools import islice
+from .preprocessing import preprocess
+
+# Jumlah kata dalam satu snippet dan jumlah kata konteks sebelum kecocokan pertama.
+SNIPPET_WORDS = 25
+SNIPPET_CONTEXT = 10
+# Jumlah kata yang ditampilkan jika tidak ada kata kueri yang cocok.
+FALLBACK_WORDS = 20
+
+# Pola satu kata pada teks asli: rangkaian karakter non-spasi (sama seperti `str.split()`).
+_WORD_PATTERN = re.compile(r'\S+')
+
+
+def _densest_window(word_positions, window):
+    """
+    Mencari rentang kecocokan terpadat: jumlah kecocokan terbanyak yang muat dalam `window` kata.
+
+    Args:
+        word_positions (list): Indeks kata setiap kecocokan, terurut naik.
+        window (int): Panjang jendela dalam jumlah kata.
+
+    Returns:
+        tuple: (indeks kecocokan pertama, indeks kecocokan terakhir) dari rentang terpadat.
+            Jika seri, rentang paling awal yang dipilih.
+    """
+    best = (0, 0)
+    first = 0
+    for last in range(len(word_positions)):
+        while word_positions[last] - word_positions[first] >= window:
+            first += 1
+        if last - first > best[1] - best[0]:
+            best = (first, last)
+    return best
+
+
+def _skip_words_back(text, pos, count):
+    # Mundur `count` kata dari posisi karakter `pos` (awal sebuah kata) dan mengembalikan awal kata tersebut.
+    for _ in range(count):
+        while pos > 0 and text[pos - 1].isspace():
+            pos -= 1
+        while pos > 0 and not text[pos - 1].isspace():
+            pos -= 1
+    return pos
+
+
+def generate_snippet(index, doc_idx, doc_text, query, max_length=150,
+                     window=SNIPPET_WORDS, context=SNIPPET_CONTEXT, trace=None):
+    """
+    Membuat cuplikan (snippet) dari teks dokumen yang relevan dengan query.
+    Posisi kata kunci diambil dari index posisional, lalu snippet diambil di sekitar
+    rentang kecocokan terpadat (bukan sekadar kecocokan pertama).
+
+    Args:
+        index (CorpusIndex): Index yang dibangun dari teks dokumen yang sama.
+        doc_idx (int): Indeks dokumen di index.
+        doc_text (str): Teks asli dokumen (sama dengan teks saat indexing).
+        query (str or list): String kueri, atau token kueri yang sudah di-preprocess.
+        max_length (int): Panjang snippet (karakter) jika kueri kosong setelah preprocessing.
+        window (int): Jumlah kata dalam snippet.
+        context (int): Jumlah kata maksimum sebelum kecocokan pertama di rentang terpilih.
+        trace (Trace, optional): Jika diisi, waktu pembuatan snippet dicatat ke tahap 'snippet'.
+
+    Returns:
+        str: Snippet teks, dengan elipsis (...) jika terpotong.
+    """
+    if trace is None:
+        return _generate_snippet(index, doc_idx, doc_text, query, max_length, window, context)
+    trace.resume()
+    snippet = _generate_snippet(index, doc_idx, doc_text, query, max_length, window, context)
+    trace.mark("snippet")
+    trace.count("snippets")
+    return snippet
+
+
+def _generate_snippet(index, doc_idx, doc_text, query, max_length, window, context):
+    # Inti `generate_snippet` (tanpa instrumentasi).
+    # 1. Token kueri. Jika kosong setelah diproses, kembalikan awal dokumen.
+    query_tokens = set(preprocess(query) if isinstance(query, str) else query)
+    if not query_tokens:
+        return doc_text[:max_length] + "..."
+
+    # 2. Posisi token yang cocok dengan term kueri, digabung dan diurutkan.
+    positions = index.positions[doc_idx]
+    matches = list(merge(*(positions[term] for term in query_tokens if term in positions)))
+
+    # 3. Jika tidak ada kata yang cocok sama sekali, ambil beberapa kata pertama sebagai snippet.
+    if not matches:
+        words = doc_text.split(None, FALLBACK_WORDS)
+        return " ".join(words[:FALLBACK_WORDS]) + ("..." if len(words) > FALLBACK_WORDS else "")
+
+    # 4. Pilih rentang kecocokan terpadat dalam `window` kata.
+    word_offsets = index.word_offsets[doc_idx]
+    word_positions = [word_offsets[position] for position in matches]
+    first, last = _densest_window(word_positions, window)
+    first_word = word_positions[first]
+    leftover = window - (word_positions[last] - first_word + 1)
+    start = max(0, first_word - min(context, leftover))
+
+    # 5. Potong teks langsung dari posisi karakter kata pertama yang cocok.
+    char_start = _skip_words_back(doc_text, index.char_offsets[doc_idx][matches[first]], first_word - start)
+    words = list(islice(_WORD_PATTERN.finditer(doc_text, char_start), window))
+    snippet = " ".join(word.group() for word in words)
+
+    # 6. Tambahkan elipsis (...) untuk menandakan bahwa snippet adalah potongan teks.
+    # Di awal jika snippet tidak dimulai dari kata pertama dokumen.
+    if start > 0:
+        snippet = "... " + snippet
+    # Di akhir jika masih ada kata setelah snippet.
+    if _WORD_PATTERN.search(doc_text, words[-1].end()):
+        snippet = snippet + " ..."
+    return snippet
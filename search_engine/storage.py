@@ -0,0 +1,338 @@
+# Format index di disk yang bisa di-memory-map (mmap).
+# Satu file berisi header JSON kecil diikuti beberapa seksi array biner:
+# vocabulary, postings (doc_idx dan tf), forward index beserta posisi token,
+# asal token di teks asli, panjang dokumen, IDF BM25, IDF VSM, norma vektor dokumen VSM, dan bobot
+# TF-IDF ternormalisasi VSM setiap posting. Saat dibuka, array-array
+# tersebut tidak dideserialisasi melainkan langsung dibaca dari mmap. Postings bisa disimpan
+# terkompresi (delta + variable-byte per blok dengan skip pointer, lihat `compression`).
+import os
+import json
+import mmap
+import struct
+import hashlib
+from array import array
+from .index import CorpusIndex, ForwardIndex, PositionsView
+from .compression import CompressedPostings, BLOCK_SIZE
+from .documents import iter_texts
+from .preprocessing import analyzer_fingerprint
+
+# Penanda awal file dan versi format index.
+MAGIC = b"IRIDX\x00\x01\x00"
+FORMAT_VERSION = 3
+# Seksi array disejajarkan (align) ke kelipatan 8 byte agar aman di-cast sebagai 'Q'/'d'.
+ALIGNMENT = 8
+# Lokasi default penyimpanan index, relatif terhadap folder file sumber.
+DEFAULT_INDEX_DIR = ".index"
+
+
+def source_key(source_path):
+    """
+    Membuat kunci index dari isi file sumber dan pengaturan analyzer.
+
+    Args:
+        source_path (str): Path ke file dokumen JSON/JSONL sumber.
+
+    Returns:
+        str: Hash SHA-256 (heksadesimal).
+    """
+    digest = hashlib.sha256()
+    with open(source_path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    digest.update(analyzer_fingerprint().encode("ascii"))
+    digest.update(f"format={FORMAT_VERSION}".encode("ascii"))
+    return digest.hexdigest()
+
+
+def default_index_path(source_path):
+    """
+    Menentukan lokasi file index untuk sebuah file sumber, misalnya
+    `data/documentsLibrary.json` -> `data/.index/documentsLibrary.idx` dan
+    `data/documentsLibrary.jsonl` -> `data/.index/documentsLibrary-jsonl.idx`.
+    """
+    folder, name = os.path.split(source_path)
+    stem, ext = os.path.splitext(name)
+    if ext != ".json":
+        stem += ext.replace(".", "-")
+    return os.path.join(folder, DEFAULT_INDEX_DIR, stem + ".idx")
+
+
+class PostingsView:
+    """
+    Tampilan read-only atas postings satu term yang disimpan di mmap.
+    Iterasi menghasilkan pasangan (doc_idx, tf), sama seperti daftar postings di memori.
+    """
+    __slots__ = ("doc_ids", "tfs")
+
+    def __init__(self, doc_ids, tfs):
+        self.doc_ids = doc_ids
+        self.tfs = tfs
+
+    def __iter__(self):
+        return zip(self.doc_ids, self.tfs)
+
+    def __len__(self):
+        return len(self.doc_ids)
+
+    def __getitem__(self, i):
+        return self.doc_ids[i], self.tfs[i]
+
+
+class OffsetsView:
+    """
+    Tampilan read-only atas array per dokumen di mmap (misalnya asal token di teks asli).
+    `view[doc_idx]` menghasilkan potongan array milik dokumen tersebut.
+    """
+    def __init__(self, offsets, values):
+        self.offsets = offsets
+        self.values = values
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, doc_idx):
+        return self.values[self.offsets[doc_idx]:self.offsets[doc_idx + 1]]
+
+
+def save_index(index, path, key="", compress=False):
+    """
+    Menyimpan CorpusIndex beserta IDF BM25, IDF VSM, norma VSM, dan bobot postings VSM ke sebuah file.
+    File ditulis ke file sementara lalu dipindahkan, sehingga pembaca tidak pernah
+    melihat file yang setengah jadi.
+
+    Args:
+        index (CorpusIndex): Index yang akan disimpan.
+        path (str): Path file tujuan.
+        key (str): Kunci sumber (lihat `source_key`) yang dicatat di header.
+        compress (bool): Jika True, postings disimpan terkompresi (delta + variable-byte).
+    """
+    # Impor di sini untuk menghindari impor melingkar (engine bergantung pada index).
+    from .bm25 import BM25Engine
+    from .vsm import VSMEngine
+
+    bm25 = BM25Engine(index)
+    vsm = VSMEngine(index)
+    vocab = vsm.vocab  # Term terurut; term_id = posisi di vocabulary.
+    term_ids = vsm.term_index
+
+    # Dokumen yang sudah dihapus (tombstone) tidak ditulis ke postings maupun forward index;
+    # slot indeksnya tetap ada agar indeks dokumen lain tidak bergeser.
+    post_offsets = array("Q", [0])
+    if compress:
+        # Blok semua term disambung dalam satu buffer; skip pointer memakai posisi byte absolut,
+        # dan post_blocks mencatat rentang blok setiap term.
+        post_data, post_last_docs = bytearray(), array("I")
+        post_block_offsets, post_blocks = array("Q", [0]), array("Q", [0])
+        for term in vocab:
+            postings = CompressedPostings(index.live_postings(term), BLOCK_SIZE)
+            base = len(post_data)
+            post_data += postings.data
+            post_last_docs.extend(postings.last_docs)
+            post_block_offsets.extend(base + offset for offset in postings.offsets[1:])
+            post_blocks.append(len(post_last_docs))
+            post_offsets.append(post_offsets[-1] + len(postings))
+        postings_sections = {"post_data": bytes(post_data), "post_last_docs": post_last_docs,
+                             "post_block_offsets": post_block_offsets, "post_blocks": post_blocks}
+    else:
+        post_docs, post_tfs = array("I"), array("I")
+        for term in vocab:
+            for doc_idx, tf in index.live_postings(term):
+                post_docs.append(doc_idx)
+                post_tfs.append(tf)
+            post_offsets.append(len(post_docs))
+        postings_sections = {"post_docs": post_docs, "post_tfs": post_tfs}
+
+    fwd_offsets, fwd_terms, fwd_tfs = array("Q", [0]), array("I"), array("I")
+    pos_offsets, positions = array("Q", [0]), array("I")
+    tok_offsets, tok_words, tok_chars = array("Q", [0]), array("I"), array("I")
+    for doc_idx, tf_counter in enumerate(index.term_freqs):
+        if doc_idx not in index.deleted:
+            doc_positions = index.positions[doc_idx]
+            for term, tf in sorted(tf_counter.items(), key=lambda item: term_ids[item[0]]):
+                fwd_terms.append(term_ids[term])
+                fwd_tfs.append(tf)
+                positions.extend(doc_positions[term])
+                pos_offsets.append(len(positions))
+            tok_words.extend(index.word_offsets[doc_idx])
+            tok_chars.extend(index.char_offsets[doc_idx])
+        fwd_offsets.append(len(fwd_terms))
+        tok_offsets.append(len(tok_words))
+
+    sections = {
+        "vocab": "\n".join(vocab).encode("utf-8"),
+        "doc_lens": array("I", index.doc_lens),
+        "post_offsets": post_offsets,
+        **postings_sections,
+        "fwd_offsets": fwd_offsets,
+        "fwd_terms": fwd_terms,
+        "fwd_tfs": fwd_tfs,
+        "pos_offsets": pos_offsets,
+        "positions": positions,
+        "tok_offsets": tok_offsets,
+        "tok_words": tok_words,
+        "tok_chars": tok_chars,
+        "bm25_idf": array("d", (bm25.idf(term) for term in vocab)),
+        "vsm_idf": array("d", (vsm.idf[term] for term in vocab)),
+        "vsm_norms": array("d", vsm.doc_norms),
+        # Bobot VSM sejajar dengan postings (rentang setiap term sama dengan post_offsets).
+        "vsm_weights": array("d", (weight for term_id in range(len(vocab))
+                                   for _, weight in vsm.postings[term_id])),
+    }
+
+    # Hitung offset setiap seksi setelah header.
+    layout, offset = {}, 0
+    for name, data in sections.items():
+        typecode = data.typecode if isinstance(data, array) else "B"
+        nbytes = len(data) * data.itemsize if isinstance(data, array) else len(data)
+        layout[name] = [offset, nbytes, typecode]
+        offset += nbytes + (-nbytes % ALIGNMENT)
+    header = json.dumps({
+        "format": FORMAT_VERSION,
+        "key": key,
+        "N": index.N,
+        "avg_doc_len": index.avg_doc_len,
+        "total_len": index.total_len,
+        "deleted": sorted(index.deleted),
+        "compressed": {"block_size": BLOCK_SIZE} if compress else None,
+        "sections": layout,
+    }).encode("utf-8")
+    # Data dimulai setelah magic + panjang header + header, disejajarkan ke ALIGNMENT.
+    data_start = len(MAGIC) + 8 + len(header)
+    header_pad = -data_start % ALIGNMENT
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<Q", len(header) + header_pad))
+        f.write(header + b" " * header_pad)
+        for name, data in sections.items():
+            raw = data.tobytes() if isinstance(data, array) else data
+            f.write(raw)
+            f.write(b"\0" * (-len(raw) % ALIGNMENT))
+    os.replace(tmp_path, path)
+
+
+def read_header(path):
+    """
+    Membaca header JSON dari file index tanpa memetakan seksi datanya.
+
+    Returns:
+        dict or None: Header index, atau None jika file tidak ada/tidak valid.
+    """
+    try:
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                return None
+            (header_len,) = struct.unpack("<Q", f.read(8))
+            return json.loads(f.read(header_len))
+    except (OSError, ValueError, struct.error):
+        return None
+
+
+def open_index(path):
+    """
+    Membuka file index dengan mmap dan mengembalikan CorpusIndex yang siap dipakai engine.
+    Postings, forward index, posisi token, panjang dokumen, dan norma VSM dibaca langsung dari mmap;
+    hanya vocabulary dan tabel term -> statistik yang dibangun di memori.
+
+    Args:
+        path (str): Path file index.
+
+    Returns:
+        CorpusIndex: Index read-only yang didukung oleh file.
+    """
+    with open(path, "rb") as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    buffer = memoryview(mm)
+    if buffer[:len(MAGIC)] != MAGIC:
+        raise ValueError(f"File bukan index yang valid: {path}")
+    (header_len,) = struct.unpack("<Q", buffer[len(MAGIC):len(MAGIC) + 8])
+    data_start = len(MAGIC) + 8 + header_len
+    header = json.loads(bytes(buffer[len(MAGIC) + 8:data_start]))
+    if header.get("format") != FORMAT_VERSION:
+        raise ValueError(f"Versi format index tidak didukung: {header.get('format')}")
+
+    def section(name):
+        offset, nbytes, typecode = header["sections"][name]
+        start = data_start + offset
+        return buffer[start:start + nbytes].cast(typecode)
+
+    vocab_bytes = bytes(section("vocab"))
+    vocab = vocab_bytes.decode("utf-8").split("\n") if vocab_bytes else []
+    post_offsets = section("post_offsets")
+    bm25_idf, vsm_idf = section("bm25_idf"), section("vsm_idf")
+    vsm_weights = section("vsm_weights")
+
+    index = CorpusIndex([])
+    index.N = header["N"]
+    index.avg_doc_len = header["avg_doc_len"]
+    index.total_len = header["total_len"]
+    index.deleted = set(header["deleted"])
+    index.doc_lens = section("doc_lens")
+    index.term_freqs = ForwardIndex(vocab, None, section("fwd_offsets"), section("fwd_terms"), section("fwd_tfs"),
+                                    section("pos_offsets"), section("positions"))
+    index.positions = PositionsView(index.term_freqs)
+    tok_offsets = section("tok_offsets")
+    index.word_offsets = OffsetsView(tok_offsets, section("tok_words"))
+    index.char_offsets = OffsetsView(tok_offsets, section("tok_chars"))
+    index.postings = {}
+    index.doc_freqs = {}
+    compressed = header.get("compressed")
+    if compressed:
+        post_data, post_last_docs = section("post_data"), section("post_last_docs")
+        post_block_offsets, post_blocks = section("post_block_offsets"), section("post_blocks")
+        for term_id, term in enumerate(vocab):
+            first, last = post_blocks[term_id], post_blocks[term_id + 1]
+            length = post_offsets[term_id + 1] - post_offsets[term_id]
+            index.postings[term] = CompressedPostings.from_buffers(
+                post_data, post_last_docs[first:last], post_block_offsets[first:last + 1],
+                length, compressed["block_size"])
+            index.doc_freqs[term] = length
+    else:
+        post_docs, post_tfs = section("post_docs"), section("post_tfs")
+        for term_id, term in enumerate(vocab):
+            start, end = post_offsets[term_id], post_offsets[term_id + 1]
+            index.postings[term] = PostingsView(post_docs[start:end], post_tfs[start:end])
+            index.doc_freqs[term] = end - start
+    index.precomputed = {
+        "bm25_idf": dict(zip(vocab, bm25_idf)),
+        "vsm_idf": dict(zip(vocab, vsm_idf)),
+        "vsm_norms": section("vsm_norms"),
+        # Bobot postings VSM, sejajar dengan postings (rentang term_id = post_offsets).
+        "vsm_weights": vsm_weights,
+        "post_offsets": post_offsets,
+    }
+    index.key = header.get("key", "")
+    # Simpan referensi mmap agar tetap terbuka selama index dipakai.
+    index._mmap = mm
+    return index
+
+
+def load_or_build_index(source_path, raw_docs=None, index_path=None, workers=1, compress=False):
+    """
+    Membuka index di disk untuk `source_path` jika masih sesuai, atau membangun
+    dan menyimpannya ulang jika belum ada atau sudah usang (isi file sumber atau
+    pengaturan analyzer berubah).
+
+    Args:
+        source_path (str): Path ke file dokumen JSON/JSONL sumber.
+        raw_docs (iterable, optional): Teks dokumen (dipakai hanya jika index perlu dibangun
+            ulang). Default: teks dibaca secara streaming dari `source_path`.
+        index_path (str, optional): Lokasi file index. Default: `<folder>/.index/<nama>.idx`.
+        workers (int): Jumlah proses untuk membangun ulang index (lihat CorpusIndex).
+        compress (bool): Jika True, postings di disk disimpan terkompresi. Index yang tersimpan
+            dengan pengaturan berbeda dibangun ulang.
+
+    Returns:
+        CorpusIndex: Index yang dibuka dari disk (mmap).
+    """
+    index_path = index_path or default_index_path(source_path)
+    key = source_key(source_path)
+    header = read_header(index_path)
+    if (header is None or header.get("key") != key or header.get("format") != FORMAT_VERSION
+            or bool(header.get("compressed")) != compress):
+        if raw_docs is None:
+            raw_docs = iter_texts(source_path)
+        save_index(CorpusIndex(raw_docs, workers=workers), index_path, key=key, compress=compress)
+    return open_index(index_path)
@@ -0,0 +1,132 @@
+# Penyetelan parameter BM25 (k dan b) dengan grid search terhadap ground truth.
+# TF mentah dan panjang dokumen tidak bergantung pada k dan b, sehingga index cukup dibangun
+# sekali. Postings semua term query dikumpulkan sekali menjadi array datar; untuk setiap
+# titik grid, kontribusi BM25 seluruh posting dihitung sekaligus (NumPy), diakumulasikan ke
+# matriks skor query x dokumen, lalu dievaluasi dengan `evaluate_run`. Tanpa NumPy, setiap
+# titik grid dijalankan dengan `BM25Engine.search_many(..., k=k, b=b)`.
+from .bm25 import BM25Engine
+from .query import parse_query
+from .numpy_backend import NumpyScorer, check_backend, np, BATCH_CELLS
+from .evaluation import evaluate_run, DEFAULT_CUTOFFS
+
+# Grid default untuk k (saturasi TF) dan b (normalisasi panjang dokumen).
+DEFAULT_K_VALUES = (0.6, 0.9, 1.2, 1.5, 1.8, 2.1)
+DEFAULT_B_VALUES = (0.3, 0.45, 0.6, 0.75, 0.9)
+
+
+class _PostingArrays:
+    """
+    Postings semua query sebagai array datar, dikelompokkan per blok query agar ukuran
+    matriks skor (query x dokumen) per blok tetap terbatas.
+
+    Args:
+        engine (BM25Engine): Engine yang menyediakan index dan IDF.
+        token_lists (list): Token setiap query.
+    """
+    def __init__(self, engine, token_lists):
+        index = engine.index
+        self.num_slots = index.num_slots
+        self.deleted = index.deleted
+        doc_lens = np.array(index.doc_lens, dtype=np.float64)
+        self.avg_doc_len = engine.avg_doc_len
+
+        # Postings per term unik (dibaca sekali), lalu disusun per blok sesuai urutan token query,
+        # sama seperti urutan akumulasi `BM25Engine.accumulate`.
+        term_arrays = {}
+        for tokens in token_lists:
+            for term in tokens:
+                if term not in term_arrays:
+                    postings = list(index.live_postings(term))
+                    term_arrays[term] = (
+                        np.fromiter((doc_idx for doc_idx, _ in postings), dtype=np.int64, count=len(postings)),
+                        np.fromiter((tf for _, tf in postings), dtype=np.float64, count=len(postings)),
+                        engine.idf(term),
+                    )
+
+        rows_per_block = max(1, BATCH_CELLS // max(1, self.num_slots))
+        self.blocks = []
+        for start in range(0, len(token_lists), rows_per_block):
+            block = token_lists[start:start + rows_per_block]
+            rows, doc_ids, tfs, idfs = [], [], [], []
+            for row, tokens in enumerate(block):
+                for term in tokens:
+                    term_doc_ids, term_tfs, idf = term_arrays[term]
+                    rows.append(np.full(len(term_doc_ids), row * self.num_slots, dtype=np.int64))
+                    doc_ids.append(term_doc_ids)
+                    tfs.append(term_tfs)
+                    idfs.append(np.full(len(term_doc_ids), idf, dtype=np.float64))
+            if doc_ids:
+                doc_ids = np.concatenate(doc_ids)
+                flat_ids = np.concatenate(rows) + doc_ids
+                tfs, idfs, lens = np.concatenate(tfs), np.concatenate(idfs), doc_lens[doc_ids]
+            else:
+                flat_ids = tfs = idfs = lens = np.zeros(0)
+            self.blocks.append((len(block), flat_ids.astype(np.int64), tfs, idfs, lens))
+
+    def top_k(self, k, b, top_k):
+        """
+        Menilai semua query dengan parameter (k, b) dan memilih top-k setiap query.
+
+        Returns:
+            list: Daftar (doc_idx, skor) terurut untuk setiap query.
+        """
+        avg_doc_len = self.avg_doc_len
+        hits = []
+        for n_rows, flat_ids, tfs, idfs, lens in self.blocks:
+            # Rumus dan urutan operasinya sama dengan `BM25Engine.accumulate`.
+            values = idfs * ((tfs * (k + 1)) / (tfs + k * (1 - b + b * lens / avg_doc_len)))
+            scores = np.bincount(flat_ids, weights=values, minlength=n_rows * self.num_slots)
+            hits.extend(NumpyScorer.top_k_many(scores.reshape(n_rows, self.num_slots), top_k, self.deleted))
+        return hits
+
+
+def grid_search(index, ground_truth, doc_ids, k_values=DEFAULT_K_VALUES, b_values=DEFAULT_B_VALUES,
+                metric="MAP", depth=100, cutoffs=DEFAULT_CUTOFFS, backend=None):
+    """
+    Mencari pasangan (k, b) BM25 terbaik terhadap ground truth tanpa membangun ulang index.
+
+    Setiap titik grid menilai seluruh query sedalam `depth`, lalu semua metrik `evaluate_run`
+    dihitung dari peringkat tersebut. Operator frasa/NEAR di query diabaikan; query dinilai
+    berdasarkan term-nya saja.
+
+    Args:
+        index (CorpusIndex): Index korpus (dibangun sekali).
+        ground_truth (dict): Query -> daftar ID dokumen relevan (format file ground_truth*.json).
+        doc_ids (list): ID dokumen sesuai urutan indeks dokumen di index.
+        k_values (tuple): Nilai k yang dicoba.
+        b_values (tuple): Nilai b yang dicoba.
+        metric (str): Metrik yang dimaksimalkan (misalnya 'MAP', 'nDCG@10', 'P@5').
+        depth (int): Kedalaman peringkat per query.
+        cutoffs (tuple): Cutoff untuk P@k, R@k, dan nDCG@k.
+        backend (str, optional): 'numpy' atau 'python'. Default: 'numpy' jika terinstal.
+
+    Returns:
+        tuple: (baris terbaik, semua baris). Setiap baris adalah dict berisi 'k', 'b', dan
+            rata-rata setiap metrik.
+    """
+    if backend is None:
+        backend = "numpy" if np is not None else "python"
+    check_backend(backend)
+    queries = list(ground_truth)
+    qids = [str(n) for n in range(1, len(queries) + 1)]
+    qrels = dict(zip(qids, ground_truth.values()))
+    engine = BM25Engine(index)
+
+    if backend == "numpy":
+        arrays = _PostingArrays(engine, [parse_query(query).tokens for query in queries])
+        score_grid_point = lambda k, b: arrays.top_k(k, b, depth)
+    else:
+        score_grid_point = lambda k, b: [result.hits for result in engine.search_many(queries, depth, k=k, b=b)]
+
+    rows = []
+    for k in k_values:
+        for b in b_values:
+            run = {qid: [(doc_ids[i], score) for i, score in hits]
+                   for qid, hits in zip(qids, score_grid_point(k, b))}
+            means, _ = evaluate_run(run, qrels, cutoffs, backend=backend)
+            if metric not in means:
+                raise ValueError(f"Metrik tidak dikenal: {metric!r}. Pilihan: {', '.join(means)}")
+            rows.append(dict(k=k, b=b, **means))
+    # Seri dimenangkan titik grid yang lebih awal.
+    best = max(rows, key=lambda row: row[metric])
+    return best, rows
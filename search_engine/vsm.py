@@ -1,6 +1,13 @@
 import math
-from .preprocessing import preprocess # Mengimpor fungsi preprocess untuk membersihkan teks
-from collections import defaultdict, Counter # Mengimpor struktur data yang berguna
+from collections import Counter, defaultdict # Mengimpor struktur data yang berguna
+from .index import CorpusIndex # Index korpus yang bisa dipakai bersama oleh beberapa engine
+from .storage import PostingsView # Tampilan postings (doc_idx, bobot) di atas array mmap
+from .numpy_backend import NumpyScorer, check_backend # Backend penilaian berbasis NumPy (opsional)
+from .results import SearchResult, select_top_k # Objek hasil pencarian dan seleksi top-k
+from .query import parse_query, match_constraints, apply_constraints # Operator frasa dan NEAR/k
+
+# Jumlah kueri per blok `search_many` pada backend 'python'.
+BATCH_QUERIES = 32
 
 # Implementasi model pencarian Vector Space Model (VSM).
 # VSM merepresentasikan dokumen dan kueri sebagai vektor dalam ruang multidimensi.
@@ -10,24 +17,24 @@ class VSMEngine:
     Menginisialisasi engine Vector Space Model.
 
     Args:
-        raw_docs (list): Daftar string, di mana setiap string adalah konten sebuah dokumen.
+        raw_docs (list or CorpusIndex): Daftar string konten dokumen, atau CorpusIndex yang sudah dibangun.
+        backend (str): 'python' (default) atau 'numpy' untuk penilaian tervektorisasi.
     """
-    def __init__(self, raw_docs):
-        # 1. Preprocessing: Mengubah setiap dokumen mentah menjadi daftar token.
-        self.tokenized_docs = [preprocess(doc) for doc in raw_docs]
-        self.doc_count = len(self.tokenized_docs)
-
-        # --- Tahap Indexing ---
-        # 2. Bangun Term Frequency (TF) dan Document Frequency (DF).
-        self.tf_list = [] # Daftar untuk menyimpan Counter TF dari setiap dokumen.
-        self.df = defaultdict(int) # Dictionary untuk menyimpan DF setiap term.
-        for tokens in self.tokenized_docs:
-            # Menghitung frekuensi term (tf) untuk dokumen saat ini.
-            tf = Counter(tokens)
-            self.tf_list.append(tf)
-            # Memperbarui frekuensi dokumen (df) untuk setiap term unik dalam dokumen.
-            for term in tf:
-                self.df[term] += 1
+    def __init__(self, raw_docs, backend="python"):
+        check_backend(backend)
+        self.backend = backend
+        # 1-2. Preprocessing dan indexing (TF dan DF) diambil dari CorpusIndex.
+        # Jika sebuah CorpusIndex diberikan, index tersebut dipakai bersama tanpa diproses ulang.
+        self.index = raw_docs if isinstance(raw_docs, CorpusIndex) else CorpusIndex(raw_docs)
+        self._build()
+
+    def _build(self):
+        """
+        Membangun vocabulary, IDF, norma dokumen, dan postings berbobot TF-IDF dari CorpusIndex.
+        Dipanggil saat inisialisasi dan (secara lazy) setiap kali generasi CorpusIndex berubah,
+        karena perubahan N dan DF mengubah seluruh bobot yang bergantung pada IDF.
+        """
+        self._generation = self.index.generation
 
         # Buat vocabulary dan term index
         # 3. Buat Vocabulary: Daftar unik dari semua term yang ada di koleksi.
@@ -36,94 +43,356 @@ class VSMEngine:
         # Buat pemetaan dari term ke indeksnya dalam vocabulary.
         self.term_index = {term: idx for idx, term in enumerate(self.vocab)}
 
+        # Index yang dibuka dari disk sudah menyimpan IDF dan norma vektor dokumen.
+        precomputed = self.index.precomputed
+
         # 4. Hitung Inverse Document Frequency (IDF) untuk setiap term di vocabulary.
-        self.idf = {}
-        for term in self.vocab:
-            df = self.df[term]
-            # Menggunakan "smoothed IDF" untuk menghindari pembagian dengan nol jika df = 0
-            # dan untuk memberikan bobot pada term yang muncul di semua dokumen.
-            self.idf[term] = math.log((self.doc_count) / (df + 1)) + 1  # smoothed idf
-
-        # Buat matrix TF-IDF untuk dokumen
-        # 5. Buat Vektor Dokumen: Mengubah setiap dokumen menjadi vektor TF-IDF.
-        # Vektor-vektor ini akan disimpan untuk perbandingan saat pencarian.
-        self.doc_vectors = [self._compute_vector(tf) for tf in self.tf_list]
+        if "vsm_idf" in precomputed:
+            self.idf = precomputed["vsm_idf"]
+        else:
+            self.idf = {}
+            for term in self.vocab:
+                df = self.df[term]
+                # Menggunakan "smoothed IDF" untuk menghindari pembagian dengan nol jika df = 0
+                # dan untuk memberikan bobot pada term yang muncul di semua dokumen.
+                self.idf[term] = math.log((self.doc_count) / (df + 1)) + 1  # smoothed idf
+
+        # 5. Hitung panjang (L2 norm) vektor TF-IDF setiap dokumen.
+        # Vektor dokumen tidak disimpan utuh; cukup normanya untuk normalisasi bobot di postings.
+        if "vsm_norms" in precomputed:
+            self.doc_norms = precomputed["vsm_norms"]
+        else:
+            deleted = self.index.deleted
+            self.doc_norms = [0.0 if doc_idx in deleted else self._norm(self._weights(tf))
+                              for doc_idx, tf in enumerate(self.tf_list)]
+
+        # 6. Bangun postings TF-IDF ternormalisasi: term_idx -> daftar (doc_idx, bobot).
+        # Hanya dimensi yang tidak nol yang disimpan, sehingga memori sebanding dengan jumlah
+        # non-zero, bukan jumlah dokumen x ukuran vocabulary. Saat pencarian, hanya dokumen
+        # yang berbagi term dengan kueri yang disentuh.
+        # Dokumen yang sudah dihapus (tombstone) tidak dimasukkan.
+        # Index yang dibuka dari disk sudah menyimpan bobot ini sejajar dengan postings-nya, sehingga
+        # postings VSM cukup berupa tampilan atas mmap (vocabulary di disk juga terurut, jadi
+        # term_idx sama dengan term_id di file).
+        if "vsm_weights" in precomputed:
+            weights, offsets = precomputed["vsm_weights"], precomputed["post_offsets"]
+            self.postings = {
+                idx: PostingsView(self.index.postings[term].doc_ids, weights[offsets[idx]:offsets[idx + 1]])
+                for idx, term in enumerate(self.vocab)
+            }
+        else:
+            self.postings = {}
+            doc_norms = self.doc_norms
+            for term in self.vocab:
+                idf = self.idf[term]
+                # Bobot sama dengan elemen vektor dokumen: (1 + log(tf)) * idf / norm.
+                self.postings[self.term_index[term]] = [
+                    (doc_idx, ((1 + math.log(tf)) * idf) / doc_norms[doc_idx])
+                    for doc_idx, tf in self.index.live_postings(term)
+                ]
+
+        # 7. Backend NumPy: bobot dokumen per term disimpan sebagai array.
+        self._numpy_scorer = None
+        if self.backend == "numpy":
+            self._numpy_scorer = NumpyScorer(self.postings, self.index.num_slots)
+
+    def _sync(self):
+        # Menyegarkan bobot yang bergantung pada IDF secara lazy jika koleksi berubah.
+        if self._generation != self.index.generation:
+            self._build()
+
+    def add_documents(self, raw_docs):
+        """
+        Menambahkan dokumen ke index. Bobot TF-IDF disegarkan saat pencarian berikutnya.
+
+        Penyegaran ini O(ukuran korpus): N dan DF berubah sehingga seluruh IDF, bobot, dan
+        norma dokumen dihitung ulang. Untuk banyak perubahan, kelompokkan dalam satu panggilan.
+
+        Args:
+            raw_docs (list): Daftar teks dokumen baru.
+
+        Returns:
+            list: Indeks dokumen yang diberikan untuk dokumen-dokumen baru.
+        """
+        return self.index.add_documents(raw_docs)
+
+    def delete_documents(self, doc_indices):
+        """
+        Menghapus dokumen dari index dengan tombstone. Bobot TF-IDF disegarkan saat pencarian berikutnya
+        dengan biaya O(ukuran korpus), sama seperti `add_documents`.
+
+        Args:
+            doc_indices (list): Indeks dokumen yang akan dihapus.
+
+        Returns:
+            int: Jumlah dokumen yang dihapus.
+        """
+        return self.index.delete_documents(doc_indices)
+
+    @property
+    def params(self):
+        # Parameter yang memengaruhi hasil pencarian (dipakai sebagai bagian kunci cache).
+        return {"backend": self.backend}
+
+    # --- Statistik korpus (diambil dari CorpusIndex) ---
+    @property
+    def doc_count(self):
+        return self.index.N
+
+    @property
+    def tf_list(self):
+        return self.index.term_freqs
+
+    @property
+    def df(self):
+        return self.index.doc_freqs
 
     def _compute_vector(self, tf_counter):
         """
-        Menghitung dan menormalisasi vektor TF-IDF untuk sebuah dokumen atau kueri.
+        Menghitung dan menormalisasi vektor TF-IDF sparse untuk sebuah dokumen atau kueri.
         
         Args:
             tf_counter (Counter): Counter yang berisi frekuensi term (TF).
             
         Returns:
-            list: Vektor TF-IDF yang sudah dinormalisasi (unit vector).
+            dict: Vektor TF-IDF sparse {term_idx: bobot} yang sudah dinormalisasi (unit vector),
+                terurut berdasarkan term_idx.
         """
-        # Inisialisasi vektor dengan nol sebanyak ukuran vocabulary.
-        vec = [0.0] * len(self.vocab)
-        # Iterasi melalui setiap term dan frekuensinya di dalam input.
-        for term, tf in tf_counter.items():
-            # Hanya proses term yang ada di dalam vocabulary.
-            if term in self.term_index:
-                idx = self.term_index[term]
-                # Pembobotan TF sublinear: mengurangi dampak dari frekuensi term yang sangat tinggi.
-                # (1 + log(tf)) untuk tf > 0, dan 0 jika tf = 0.
-                tf_weight = 1 + math.log(tf) if tf > 0 else 0  # sublinear tf
-                # Hitung bobot TF-IDF dan tempatkan di posisi yang benar dalam vektor.
-                vec[idx] = tf_weight * self.idf[term]
-        
         # Normalisasi vektor agar menjadi unit vector (panjangnya 1).
-        return self._normalize(vec)
+        return self._normalize(self._weights(tf_counter))
+
+    def _weights(self, tf_counter):
+        """
+        Menghitung bobot TF-IDF (belum dinormalisasi) untuk sebuah dokumen atau kueri.
+
+        Args:
+            tf_counter (dict): Pemetaan term -> frekuensi term (TF).
+
+        Returns:
+            dict: Vektor TF-IDF sparse {term_idx: bobot}, terurut berdasarkan term_idx.
+        """
+        vec = {}
+        # Iterasi melalui setiap term dan frekuensinya di dalam input.
+        # Term diurutkan berdasarkan posisinya di vocabulary agar urutan dimensi sama dengan vektor dense.
+        entries = sorted((self.term_index[term], term, tf) for term, tf in tf_counter.items() if term in self.term_index)
+        for idx, term, tf in entries:
+            # Pembobotan TF sublinear: mengurangi dampak dari frekuensi term yang sangat tinggi.
+            # (1 + log(tf)) untuk tf > 0, dan 0 jika tf = 0.
+            tf_weight = 1 + math.log(tf) if tf > 0 else 0  # sublinear tf
+            # Hitung bobot TF-IDF dan simpan hanya dimensi yang tidak nol.
+            weight = tf_weight * self.idf[term]
+            if weight:
+                vec[idx] = weight
+        return vec
+
+    def _norm(self, vec):
+        """
+        Menghitung panjang Euclidean (L2 norm) dari vektor sparse.
+
+        Args:
+            vec (dict): Vektor sparse {term_idx: bobot}.
+
+        Returns:
+            float: Norma vektor. Dimensi bernilai nol tidak berkontribusi.
+        """
+        return math.sqrt(sum(x ** 2 for x in vec.values()))
 
     def _normalize(self, vec):
         """
-        Menormalisasi sebuah vektor (L2 Normalization).
+        Menormalisasi sebuah vektor sparse (L2 Normalization).
         
         Args:
-            vec (list): Vektor yang akan dinormalisasi.
+            vec (dict): Vektor sparse {term_idx: bobot} yang akan dinormalisasi.
             
         Returns:
-            list: Vektor yang sudah dinormalisasi.
+            dict: Vektor yang sudah dinormalisasi.
         """
         # Hitung panjang Euclidean (L2 norm) dari vektor.
-        norm = math.sqrt(sum(x ** 2 for x in vec))
+        norm = self._norm(vec)
         # Bagi setiap elemen vektor dengan normanya untuk mendapatkan unit vektor.
         # Menghindari pembagian dengan nol jika vektornya adalah vektor nol.
-        return [x / norm for x in vec] if norm != 0 else vec
+        return {idx: x / norm for idx, x in vec.items()} if norm != 0 else vec
 
     def _cosine_similarity(self, vec1, vec2):
         """
-        Menghitung Cosine Similarity antara dua vektor.
-        Karena kedua vektor sudah dinormalisasi, ini sama dengan dot product.
+        Menghitung Cosine Similarity antara dua vektor sparse.
+        Karena kedua vektor sudah dinormalisasi, ini sama dengan dot product
+        pada dimensi yang dimiliki keduanya.
         
         Args:
-            vec1 (list): Vektor pertama (unit vector).
-            vec2 (list): Vektor kedua (unit vector).
+            vec1 (dict): Vektor sparse pertama (unit vector).
+            vec2 (dict): Vektor sparse kedua (unit vector).
             
         Returns:
             float: Skor Cosine Similarity (antara 0 dan 1).
         """
-        return sum(a * b for a, b in zip(vec1, vec2))
+        return sum(vec1[idx] * vec2[idx] for idx in sorted(vec1.keys() & vec2.keys()))
+
+    def accumulate(self, query_vec):
+        """
+        Menghitung Cosine Similarity vektor kueri melalui postings.
+        Hanya dokumen yang memiliki term yang sama dengan kueri yang disentuh.
+
+        Args:
+            query_vec (dict): Vektor kueri sparse yang sudah dinormalisasi.
+
+        Returns:
+            dict: Pemetaan doc_idx -> skor Cosine Similarity.
+        """
+        scores = {}
+        # Term kueri diproses sesuai urutan vocabulary, sehingga urutan penjumlahan
+        # per dokumen sama dengan dot product pada vektor dense.
+        for idx in sorted(query_vec):
+            weight = query_vec[idx]
+            for doc_idx, doc_weight in self.postings.get(idx, ()):
+                scores[doc_idx] = scores.get(doc_idx, 0.0) + weight * doc_weight
+        return scores
 
-    def search(self, query, top_k=5):
+    def score_all(self, query_vec):
+        """
+        Menghitung Cosine Similarity vektor kueri terhadap seluruh koleksi (dokumen lain bernilai 0).
+
+        Args:
+            query_vec (dict): Vektor kueri sparse yang sudah dinormalisasi.
+
+        Returns:
+            list: Skor Cosine Similarity untuk setiap dokumen.
+        """
+        scores = [0.0] * self.index.num_slots
+        for doc_idx, score in self.accumulate(query_vec).items():
+            scores[doc_idx] = score
+        return scores
+
+    def search(self, query, top_k=5, full_scores=False, proximity_boost=0.0, trace=None):
         """
         Mencari dan memeringkat dokumen berdasarkan kueri yang diberikan.
+        Kueri boleh memuat frasa dalam tanda kutip ("boundary layer") dan operator
+        kedekatan `a NEAR/k b` (lihat `search_engine.query`).
         
         Args:
             query (str): String kueri dari pengguna.
             top_k (int): Jumlah dokumen teratas yang akan dikembalikan.
+            full_scores (bool): Jika True, sertakan skor untuk seluruh dokumen di hasil.
+            proximity_boost (float): 0 (default) berarti frasa/NEAR menyaring dokumen. Jika > 0,
+                dokumen yang memenuhi operator mendapat boost skor alih-alih disaring.
+            trace (Trace, optional): Jika diisi, waktu per tahap dan penghitung dicatat ke trace ini.
             
         Returns:
-            tuple: Berisi daftar ID dokumen yang diperingkat dan daftar skor mentah.
+            SearchResult: Pasangan (doc_idx, skor) top-k. Bisa di-unpack menjadi
+                `ranked_ids, scores` seperti sebelumnya.
         """
-        # 1. Preprocess dan ubah kueri menjadi vektor TF-IDF.
-        query_tokens = preprocess(query)
-        query_tf = Counter(query_tokens)
+        if trace is not None:
+            trace.resume()
+        self._sync()
+        # 1. Preprocess, pisahkan operator frasa/NEAR, dan ubah kueri menjadi vektor TF-IDF sparse.
+        parsed = parse_query(query)
+        query_tf = Counter(parsed.tokens)
         query_vec = self._compute_vector(query_tf)
+        if trace is not None:
+            trace.mark("parse")
+            trace.record_lookup(self.postings, query_vec)
+        satisfied = None
+        if parsed.num_constraints:
+            satisfied = match_constraints(self.index, parsed)
+            if trace is not None:
+                trace.mark("match")
+        if self._numpy_scorer is not None:
+            # Backend NumPy: akumulasi bobot kueri x bobot dokumen per term dengan np.add.at.
+            scores = self._numpy_scorer.score([(idx, query_vec[idx]) for idx in sorted(query_vec)])
+            if trace is not None:
+                trace.mark("score")
+                trace.count("docs_scored", int((scores != 0).sum()))
+            if satisfied is None or proximity_boost:
+                if satisfied is not None:
+                    apply_constraints(scores, satisfied, parsed.num_constraints, proximity_boost)
+                hits = self._numpy_scorer.top_k(scores, top_k, self.index.deleted)
+                if trace is not None:
+                    trace.mark("select")
+                return SearchResult(hits, scores.tolist() if full_scores else None)
+            doc_scores = {doc_idx: float(scores[doc_idx]) for doc_idx in satisfied}
+        else:
+            # 2. Hitung Cosine Similarity antara vektor kueri dan dokumen yang berbagi term dengannya.
+            doc_scores = self.accumulate(query_vec)
+            if trace is not None:
+                trace.mark("score")
+                trace.count("docs_scored", len(doc_scores))
+            if satisfied is None:
+                # 3. Peringkat dokumen: seleksi top-k dengan heap, tanpa mengurutkan seluruh koleksi.
+                hits = select_top_k(doc_scores, self.index.num_slots, top_k, self.index.deleted)
+                if trace is not None:
+                    trace.mark("select")
+                # 4. Mengembalikan `top_k` dokumen teratas (dan skor lengkap jika diminta).
+                return SearchResult(hits, self.score_all(query_vec) if full_scores else None)
+
+        # Operator frasa/NEAR: saring dokumen (atau beri boost jika `proximity_boost` diisi).
+        # Saat menyaring, hasil tidak dilengkapi dokumen berskor 0 yang tidak memenuhi operator.
+        doc_scores = apply_constraints(doc_scores, satisfied, parsed.num_constraints, proximity_boost)
+        n_docs = self.index.num_slots if proximity_boost else 0
+        hits = select_top_k(doc_scores, n_docs, top_k, self.index.deleted)
+        if trace is not None:
+            trace.mark("select")
+        all_scores = None
+        if full_scores:
+            all_scores = [0.0] * self.index.num_slots
+            for doc_idx, score in doc_scores.items():
+                all_scores[doc_idx] = score
+        return SearchResult(hits, all_scores)
+
+    def search_many(self, queries, top_k=5):
+        """
+        Mencari sekumpulan kueri sekaligus sebagai perkalian matriks kueri x dokumen yang sparse.
+        Batch dikelompokkan per term: postings setiap term unik dibaca sekali, lalu bobotnya
+        diakumulasikan ke setiap kueri yang memuat term tersebut. Karena term diproses sesuai
+        urutan vocabulary, hasil setiap kueri identik dengan `search`.
+
+        Args:
+            queries (list): Daftar string kueri.
+            top_k (int): Jumlah dokumen teratas yang dikembalikan per kueri.
+
+        Returns:
+            list: SearchResult untuk setiap kueri, sesuai urutan input.
+        """
+        # Kueri dengan operator frasa/NEAR dievaluasi satu per satu dengan `search`.
+        parsed = [parse_query(query) for query in queries]
+        results = [self.search(query, top_k) if p.num_constraints else None for query, p in zip(queries, parsed)]
+        plain = [i for i, p in enumerate(parsed) if not p.num_constraints]
+        for i, result in zip(plain, self._search_batch([parsed[i].tokens for i in plain], top_k)):
+            results[i] = result
+        return results
+
+    def _search_batch(self, token_lists, top_k):
+        # Inti `search_many` untuk kueri tanpa operator posisional (daftar token per kueri).
+        self._sync()
+        query_vecs = [self._compute_vector(Counter(tokens)) for tokens in token_lists]
+        deleted, num_slots = self.index.deleted, self.index.num_slots
+        if self._numpy_scorer is not None:
+            scorer = self._numpy_scorer
+            blocks = scorer.score_many([[(idx, vec[idx]) for idx in sorted(vec)] for vec in query_vecs])
+            return [SearchResult(hits) for scores in blocks for hits in scorer.top_k_many(scores, top_k, deleted)]
 
-        # 2. Hitung Cosine Similarity antara vektor kueri dan setiap vektor dokumen.
-        scores = [self._cosine_similarity(query_vec, doc_vec) for doc_vec in self.doc_vectors]
-        # 3. Peringkat dokumen: Mengurutkan indeks dokumen berdasarkan skornya (dari tertinggi ke terendah).
-        ranked_ids = sorted(range(len(scores)), key=lambda i: scores[i], reverse=True)
-        # 4. Mengembalikan `top_k` dokumen teratas beserta skor mentahnya.
-        return ranked_ids[:top_k], scores
+        # Backend 'python': perkalian sparse kueri x dokumen secara term-at-a-time, per blok
+        # BATCH_QUERIES kueri (akumulator satu blok tetap kecil). Postings setiap term unik di blok
+        # dibaca sekali (dimaterialisasi menjadi list jika berupa tampilan mmap/terkompresi), lalu
+        # bobotnya ditambahkan ke akumulator setiap kueri yang memuat term tersebut. Term diproses
+        # sesuai urutan vocabulary, sehingga urutan penjumlahan per dokumen sama dengan `accumulate`
+        # dan hasil setiap kueri identik dengan `search`.
+        results = []
+        for start in range(0, len(query_vecs), BATCH_QUERIES):
+            block = query_vecs[start:start + BATCH_QUERIES]
+            accumulators = [{} for _ in block]
+            term_queries = defaultdict(list)
+            for query_vec, doc_scores in zip(block, accumulators):
+                for idx, weight in query_vec.items():
+                    term_queries[idx].append((doc_scores, weight))
+            for idx in sorted(term_queries):
+                postings = self.postings.get(idx, ())
+                readers = term_queries[idx]
+                if len(readers) > 1 and not isinstance(postings, list):
+                    postings = list(postings)
+                for doc_scores, weight in readers:
+                    get = doc_scores.get
+                    for doc_idx, doc_weight in postings:
+                        doc_scores[doc_idx] = get(doc_idx, 0.0) + weight * doc_weight
+            results.extend(SearchResult(select_top_k(doc_scores, num_slots, top_k, deleted))
+                           for doc_scores in accumulators)
+        return results
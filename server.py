@@ -0,0 +1,67 @@
+# --- Penjelasan Umum ---
+# Skrip ini menjalankan mini search engine sebagai layanan HTTP/JSON lokal (asyncio, hanya
+# pustaka standar), sehingga banyak klien bisa mencari secara bersamaan. Berbeda dengan
+# search.py yang memakai loop input() yang memblokir, layanan ini:
+# 1. Menjalankan penilaian VSM/BM25 di executor agar event loop tetap melayani koneksi lain.
+# 2. Menggabungkan permintaan /search yang datang bersamaan menjadi satu micro-batch.
+# 3. Menolak permintaan dengan 503 jika antrean penuh (backpressure) dan 504 jika melewati batas waktu.
+#
+# Penggunaan: python server.py [file dokumen] [--host 127.0.0.1] [--port 8000] [--shards N]
+# Contoh kueri:
+#   curl "http://127.0.0.1:8000/search?q=boundary+layer&engine=bm25&top_k=5"
+#   curl -X POST -d '{"queries": ["shock wave", "heat transfer"]}' http://127.0.0.1:8000/search_many
+#   curl http://127.0.0.1:8000/health
+
+# --- Impor Pustaka ---
+import asyncio
+import argparse
+from search_engine.vsm import VSMEngine
+from search_engine.bm25 import BM25Engine
+from search_engine.sharding import ShardedBM25Engine
+from search_engine.storage import load_or_build_index
+from search_engine.documents import open_documents
+from search_engine.service import SearchService, MAX_BATCH_SIZE, MAX_PENDING, REQUEST_TIMEOUT
+
+# Blok utama dijaga `if __name__ == "__main__"` karena mode sharded menjalankan proses worker
+# (dengan start method 'spawn', proses baru mengimpor ulang skrip ini).
+if __name__ == "__main__":
+    # --- Argumen ---
+    parser = argparse.ArgumentParser(description="Layanan HTTP/JSON untuk mini search engine.")
+    parser.add_argument("documents", nargs="?", default="data/documentsLibrary.json",
+                        help="File dokumen JSON atau JSONL (default: data/documentsLibrary.json).")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=2, help="Jumlah thread executor untuk penilaian.")
+    parser.add_argument("--shards", type=int, default=0,
+                        help="Jika > 0, BM25 dijalankan sebagai ShardedBM25Engine dengan N proses worker.")
+    parser.add_argument("--max-batch", type=int, default=MAX_BATCH_SIZE)
+    parser.add_argument("--max-pending", type=int, default=MAX_PENDING)
+    parser.add_argument("--timeout", type=float, default=REQUEST_TIMEOUT)
+    args = parser.parse_args()
+
+    # --- Persiapan Data dan Engine ---
+    # Index dibuka dari disk (mmap) atau dibangun ulang secara streaming jika usang.
+    documents = open_documents(args.documents)
+    corpus_index = load_or_build_index(args.documents, documents.iter_texts())
+    engines = {"vsm": VSMEngine(corpus_index)}
+    if args.shards > 0:
+        # Mode sharded: koleksi dibagi ke beberapa proses; skor identik dengan BM25 biasa.
+        engines["bm25"] = ShardedBM25Engine(documents.iter_texts(), num_shards=args.shards)
+    else:
+        engines["bm25"] = BM25Engine(corpus_index)
+
+    service = SearchService(engines, documents, workers=args.workers, max_batch=args.max_batch,
+                            max_pending=args.max_pending, timeout=args.timeout)
+
+    # --- Menjalankan Server ---
+    print(f"> {len(documents)} dokumen dimuat dari {args.documents}")
+    print(f"> Layanan berjalan di http://{args.host}:{args.port} (Ctrl+C untuk berhenti)")
+    try:
+        asyncio.run(service.serve_forever(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
+        if args.shards > 0:
+            engines["bm25"].close()
+        print("Layanan dihentikan.")
@@ -0,0 +1,56 @@
+# --- Penjelasan Umum ---
+# Skrip ini mencari parameter BM25 (k dan b) terbaik terhadap ground truth dengan grid search.
+# Index korpus dibuka/dibangun sekali; setiap titik grid hanya menilai ulang query dengan k dan b
+# yang berbeda (tervektorisasi dengan NumPy jika terinstal), tanpa membangun ulang index.
+# Hasilnya berupa tabel metrik (misalnya MAP) untuk setiap pasangan (k, b) dan pasangan terbaik.
+#
+# Penggunaan: python tune_bm25.py [documents.json ground_truth.json] [--metric MAP]
+#             [--k 0.6,0.9,1.2,1.5,1.8,2.1] [--b 0.3,0.45,0.6,0.75,0.9] [--depth 100]
+
+# --- Impor Pustaka ---
+import json
+import time
+import argparse
+from search_engine.storage import load_or_build_index
+from search_engine.documents import open_documents
+from search_engine.tuning import grid_search, DEFAULT_K_VALUES, DEFAULT_B_VALUES
+
+
+def parse_values(text):
+    # Mengubah "0.9,1.2,1.5" menjadi tuple float.
+    return tuple(float(value) for value in text.split(","))
+
+
+# --- Argumen ---
+parser = argparse.ArgumentParser(description="Grid search parameter k dan b BM25.")
+parser.add_argument("documents", nargs="?", default="data/documentsLibrary.json")
+parser.add_argument("ground_truth", nargs="?", default="data/ground_truthLibrary.json")
+parser.add_argument("--metric", default="MAP", help="Metrik yang dimaksimalkan (MAP, MRR, nDCG@10, P@5, ...).")
+parser.add_argument("--k", type=parse_values, default=DEFAULT_K_VALUES, help="Nilai k, dipisah koma.")
+parser.add_argument("--b", type=parse_values, default=DEFAULT_B_VALUES, help="Nilai b, dipisah koma.")
+parser.add_argument("--depth", type=int, default=100, help="Kedalaman peringkat per query.")
+args = parser.parse_args()
+
+# --- Load Data ---
+documents = open_documents(args.documents)
+with open(args.ground_truth) as f:
+    ground_truth = json.load(f)
+corpus_index = load_or_build_index(args.documents, documents.iter_texts())
+
+# --- Grid Search ---
+started = time.perf_counter()
+best, rows = grid_search(corpus_index, ground_truth, documents.doc_ids, args.k, args.b,
+                         metric=args.metric, depth=args.depth)
+elapsed = time.perf_counter() - started
+
+# --- Menampilkan Hasil ---
+# Tabel metrik: baris = k, kolom = b.
+print(f"{args.metric} per (k, b) — {len(ground_truth)} query, kedalaman {args.depth}:\n")
+print(f"{'k / b':>7} | "+ " | ".join(f"{b:>7.2f}" for b in args.b))
+for k in args.k:
+    values = [row[args.metric] for row in rows if row["k"] == k]
+    print(f"{k:>7.2f} | " + " | ".join(f"{value:>7.4f}" for value in values))
+
+print(f"\nTerbaik: k={best['k']}, b={best['b']} → {args.metric} {best[args.metric]:.4f}")
+print("  " + ", ".join(f"{name} {value:.4f}" for name, value in best.items() if name in ("MAP", "MRR", "P@5", "nDCG@10")))
+print(f"> {len(rows)} titik grid dinilai dalam {elapsed:.2f} s tanpa membangun ulang index.")